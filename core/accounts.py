@@ -0,0 +1,40 @@
+# ===============================================================
+# 📘 core/accounts.py — Lookup akun (Admin / Guru / Murid) dalam 1 query
+# ===============================================================
+
+# Urutan prioritas sama dengan login lama: Admin → Guru → Murid
+ACCOUNT_LOOKUP_QUERY = """
+SELECT role, id, nama, email, password, is_verified
+FROM (
+    SELECT 'Admin' AS role, id, nama, email, password, TRUE AS is_verified, 1 AS prioritas
+    FROM admin WHERE email = $1
+    UNION ALL
+    SELECT 'Guru', id, nama, email, password, TRUE, 2
+    FROM guru WHERE email = $1
+    UNION ALL
+    SELECT 'Murid', id, nama, email, password, COALESCE(is_verified, FALSE), 3
+    FROM murid WHERE email = $1
+) akun
+ORDER BY prioritas
+LIMIT 1
+"""
+
+EMAIL_EXISTS_QUERY = """
+SELECT EXISTS (SELECT 1 FROM admin WHERE email = $1)
+    OR EXISTS (SELECT 1 FROM guru WHERE email = $1)
+    OR EXISTS (SELECT 1 FROM murid WHERE email = $1) AS ada
+"""
+
+
+async def find_account(db, email: str) -> dict | None:
+    """
+    Cari akun berdasarkan email di tabel admin, guru, dan murid sekaligus.
+    Return: {"role", "id", "nama", "email", "password", "is_verified"} atau None.
+    """
+    rows = await db.query_raw(ACCOUNT_LOOKUP_QUERY, email)
+    return rows[0] if rows else None
+
+
+async def account_email_exists(db, email: str) -> bool:
+    rows = await db.query_raw(EMAIL_EXISTS_QUERY, email)
+    return bool(rows and rows[0]["ada"])
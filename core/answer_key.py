@@ -0,0 +1,85 @@
+# ===============================================================
+# 📘 core/answer_key.py — Kunci jawaban ringkas per quiz untuk penilaian
+# ===============================================================
+import os
+from array import array
+from core.cache import TTLCache
+
+# Submit hanya butuh (soal_id, jawaban_benar, bobot) — bukan teks soal & pilihan.
+# Disimpan in-process per quiz_id; route yang mengubah soal_quiz / quiz
+# wajib memanggil invalidate_answer_key(quiz_id).
+ANSWER_KEY_CACHE_SIZE = int(os.getenv("ANSWER_KEY_CACHE_SIZE", "2048"))
+ANSWER_KEY_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_KEY_CACHE_TTL_SECONDS", "3600"))
+
+_keys = TTLCache(max_size=ANSWER_KEY_CACHE_SIZE, ttl=ANSWER_KEY_CACHE_TTL_SECONDS)
+
+# Naik setiap invalidasi; hasil load yang mulai sebelum invalidasi tidak disimpan
+_generation: dict = {}
+
+ANSWER_KEY_QUERY = """
+SELECT q.mata_pelajaran_id, s.id AS soal_id, s.jawaban_benar, COALESCE(s.bobot, 1) AS bobot
+FROM quiz q
+LEFT JOIN soal_quiz s ON s.quiz_id = q.id
+WHERE q.id = $1
+ORDER BY s.id
+"""
+
+
+class AnswerKey:
+    """
+    soal_ids[i] / kunci[i] / bobot[i] = satu soal.
+    kunci: satu byte per soal ('A'..'D', lihat CHECK di soal_quiz).
+    """
+
+    __slots__ = ("mata_pelajaran_id", "soal_ids", "kunci", "bobot")
+
+    def __init__(self, mata_pelajaran_id: int, rows: list):
+        self.mata_pelajaran_id = mata_pelajaran_id
+        self.soal_ids = array("q", (row["soal_id"] for row in rows))
+        self.kunci = bytes(ord(row["jawaban_benar"]) for row in rows)
+        self.bobot = array("l", (row["bobot"] for row in rows))
+
+    @property
+    def total_soal(self) -> int:
+        return len(self.soal_ids)
+
+    def grade(self, jawaban: dict) -> tuple[int, int]:
+        """(skor, jumlah benar) untuk jawaban { "soal_id": "A" }."""
+        skor = 0
+        benar = 0
+
+        for soal_id, kunci, bobot in zip(self.soal_ids, self.kunci, self.bobot):
+            pilihan = jawaban.get(str(soal_id))
+            if isinstance(pilihan, str) and len(pilihan) == 1 and ord(pilihan) == kunci:
+                skor += bobot
+                benar += 1
+
+        return skor, benar
+
+
+async def get_answer_key(db, quiz_id: int):
+    """Kunci jawaban quiz (dari cache, atau satu query), atau None bila quiz tidak ada."""
+    key = _keys.get(quiz_id)
+    if key is not None:
+        return key
+
+    generation = _generation.get(quiz_id, 0)
+    rows = await db.query_raw(ANSWER_KEY_QUERY, quiz_id)
+    if not rows:
+        return None
+
+    # LEFT JOIN: quiz tanpa soal → satu baris dengan soal_id NULL
+    key = AnswerKey(rows[0]["mata_pelajaran_id"], [row for row in rows if row["soal_id"] is not None])
+    if _generation.get(quiz_id, 0) == generation:
+        _keys.set(quiz_id, key)
+    return key
+
+
+def invalidate_answer_key(*quiz_ids: int):
+    for quiz_id in quiz_ids:
+        _generation[quiz_id] = _generation.get(quiz_id, 0) + 1
+        _keys.delete(quiz_id)
+
+
+def answer_key_stats() -> dict:
+    return _keys.stats()
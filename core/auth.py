@@ -1,5 +1,7 @@
 # core/auth.py
+import asyncio
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from passlib.context import CryptContext
@@ -15,12 +17,54 @@ SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey123")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# Pool khusus argon2: hashing berat dijalankan di thread (argon2 melepas GIL),
+# dibatasi agar lonjakan login tidak menumpuk tanpa batas → 429 bila penuh.
+PASSWORD_POOL_SIZE = int(os.getenv("PASSWORD_POOL_SIZE", "4"))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", "64"))
+
+_password_pool = ThreadPoolExecutor(max_workers=PASSWORD_POOL_SIZE, thread_name_prefix="argon2")
+_password_pool_stats = {"in_flight": 0, "peak_in_flight": 0, "completed": 0, "rejected": 0}
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
+async def _run_in_password_pool(fn, *args):
+    stats = _password_pool_stats
+
+    if stats["in_flight"] >= PASSWORD_QUEUE_LIMIT:
+        stats["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Server sedang sibuk, silakan coba lagi",
+            headers={"Retry-After": "1"},
+        )
+
+    stats["in_flight"] += 1
+    stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_pool, fn, *args)
+    finally:
+        stats["in_flight"] -= 1
+        stats["completed"] += 1
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_password_pool(hash_password, password)
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run_in_password_pool(verify_password, password, hashed)
+
+def password_pool_stats() -> dict:
+    stats = dict(_password_pool_stats)
+    stats.update(
+        pool_size=PASSWORD_POOL_SIZE,
+        queue_limit=PASSWORD_QUEUE_LIMIT,
+        queued=max(0, stats["in_flight"] - PASSWORD_POOL_SIZE),
+    )
+    return stats
+
 def create_access_token(data: dict, expires_minutes: int | None = None):
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=expires_minutes or ACCESS_TOKEN_EXPIRE_MINUTES
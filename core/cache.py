@@ -0,0 +1,76 @@
+# core/cache.py — Cache in-memory per proses (LRU + TTL per entri)
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Cache LRU berkapasitas tetap dengan masa berlaku per entri.
+    Tidak thread-safe — dipakai dari event loop (satu thread).
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# ===============================================================
+# Versi data per tabel (per proses): handler tulis memanggil touch(),
+# cache turunan membandingkan table_versions() untuk tahu datanya basi.
+# ===============================================================
+_table_versions: dict = {}
+
+
+def touch(*tables: str):
+    for table in tables:
+        _table_versions[table] = _table_versions.get(table, 0) + 1
+
+
+def table_versions(*tables: str) -> tuple:
+    return tuple(_table_versions.get(table, 0) for table in tables)
@@ -0,0 +1,42 @@
+# ===============================================================
+# 📘 core/etag.py — Conditional GET (ETag / If-None-Match) untuk list read-mostly
+# ===============================================================
+import hashlib
+from fastapi import Request, Response
+
+# versi_data diisi trigger bump_versi_data() (lihat Database.sql): setiap
+# INSERT/UPDATE/DELETE pada tabel terdaftar menaikkan versi tabel tersebut,
+# apa pun route / worker yang menulis.
+VERSION_QUERY = "SELECT tabel, versi FROM versi_data WHERE tabel = ANY($1::text[])"
+
+
+async def collection_versions(db, tables: tuple) -> tuple:
+    rows = await db.query_raw(VERSION_QUERY, list(tables))
+    versions = {row["tabel"]: int(row["versi"]) for row in rows}
+    return tuple(versions.get(table, 0) for table in tables)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def conditional_get(request: Request, response: Response, db, tables: tuple, *scope) -> Response | None:
+    """
+    ETag = hash(versi tabel + relasi yang di-include, query string, scope user).
+    Cocok dengan If-None-Match → Response 304 (find_many dilewati),
+    tidak cocok → header ETag dipasang di response dan None dikembalikan.
+    """
+    versions = await collection_versions(db, tables)
+    raw = f"{request.url.path}?{request.url.query}|{versions}|{scope!r}"
+    etag = f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,95 @@
+# ===============================================================
+# 📘 core/export.py — Export tabel besar sebagai stream NDJSON / CSV
+# ===============================================================
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+# Baris per query; memori konstan ≈ satu batch berapapun jumlah baris tabel
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def export_filters(alias: str, date_field: str | None = None, dari: date | None = None,
+                   sampai: date | None = None, **equals) -> tuple[str, list]:
+    """
+    Potongan SQL "AND ..." + argumen untuk filter opsional (None diabaikan).
+    Placeholder mulai dari $2 karena $1 dipakai cursor.
+    """
+    clauses, args = [], []
+
+    for column, value in equals.items():
+        if value is not None:
+            args.append(value)
+            clauses.append(f"{alias}.{column} = ${len(args) + 1}")
+
+    if date_field and dari:
+        args.append(datetime.combine(dari, time.min).isoformat())
+        clauses.append(f"{alias}.{date_field} >= ${len(args) + 1}::timestamp")
+    if date_field and sampai:
+        args.append(datetime.combine(sampai + timedelta(days=1), time.min).isoformat())
+        clauses.append(f"{alias}.{date_field} < ${len(args) + 1}::timestamp")
+
+    return "".join(f" AND {c}" for c in clauses), args
+
+
+async def iter_batches(db, sql: str, args: list, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Keyset scan: sql berbentuk "... WHERE x.id > $1 ... ORDER BY x.id LIMIT <batch_size>".
+    Tiap batch dibuang setelah di-yield → tidak pernah memuat seluruh tabel.
+    """
+    cursor = 0
+
+    while True:
+        rows = await db.query_raw(sql, cursor, *args)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        cursor = rows[-1]["id"]
+
+
+async def ndjson_chunks(batches):
+    async for rows in batches:
+        yield "".join(json.dumps(row, default=str, ensure_ascii=False) + "\n" for row in rows)
+
+
+async def csv_chunks(batches, columns: list):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    # tabel kosong → tetap kirim header
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(db, query: str, filters: str, args: list, columns: list, fmt: str, filename: str,
+                    batch_size: int = EXPORT_BATCH_SIZE) -> StreamingResponse:
+    """query: template dengan slot {filters} dan {batch_size} (lihat EXPORT_QUERY di route)."""
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Format export harus 'ndjson' atau 'csv'")
+
+    sql = query.format(filters=filters, batch_size=int(batch_size))
+    batches = iter_batches(db, sql, args, batch_size)
+    body = csv_chunks(batches, columns) if fmt == "csv" else ndjson_chunks(batches)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
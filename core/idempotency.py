@@ -0,0 +1,46 @@
+# ===============================================================
+# 📘 core/idempotency.py — Header Idempotency-Key untuk request tulis
+# ===============================================================
+import asyncio
+import os
+from core.cache import TTLCache
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+
+_responses = TTLCache(max_size=10_000, ttl=IDEMPOTENCY_TTL_SECONDS)
+_inflight: dict = {}
+
+
+async def run_once(key, handler):
+    """
+    Jalankan handler() sekali per key:
+    - key sudah selesai → respons yang sama dikembalikan tanpa menyentuh DB
+    - key sedang diproses (klik ganda / retry paralel) → menunggu hasil yang sama
+    Exception tidak di-cache, sehingga retry setelah gagal tetap diproses.
+    key None → handler() langsung dijalankan.
+    """
+    if key is None:
+        return await handler()
+
+    cached = _responses.get(key)
+    if cached is not None:
+        return cached
+
+    if key in _inflight:
+        return await asyncio.shield(_inflight[key])
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+
+    try:
+        result = await handler()
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # ditandai sudah diambil bila tidak ada yang menunggu
+        raise
+    else:
+        _responses.set(key, result)
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
@@ -0,0 +1,92 @@
+# ===============================================================
+# 📘 core/pagination.py — Keyset pagination, proyeksi kolom & filter list
+# ===============================================================
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from fastapi import Query
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+class PageParams:
+    """
+    Dependency query string untuk endpoint list:
+    ?cursor=<id terakhir>&limit=100&fields=id,judul,kelas
+    Urutan selalu id DESC (terbaru dulu); halaman berikutnya = id < cursor.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[int] = Query(None, description="next_cursor dari halaman sebelumnya"),
+        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+        fields: Optional[str] = Query(None, description="Kolom yang dikembalikan, dipisah koma"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+
+def filter_where(
+    scope: dict | None = None,
+    date_field: str = "created_at",
+    dari: date | None = None,
+    sampai: date | None = None,
+    **equals,
+) -> dict:
+    """
+    Gabungkan filter opsional (nilai None diabaikan) dengan batasan role.
+    Batasan role (scope) selalu menang atas filter dari query string.
+    """
+    where = {field: value for field, value in equals.items() if value is not None}
+
+    if dari or sampai:
+        rentang = {}
+        if dari:
+            rentang["gte"] = datetime.combine(dari, time.min)
+        if sampai:
+            rentang["lt"] = datetime.combine(sampai + timedelta(days=1), time.min)
+        where[date_field] = rentang
+
+    where.update(scope or {})
+    return where
+
+
+def project(rows: list, fields: list | None) -> list:
+    if not fields:
+        return rows
+    # relasi yang diminta (mis. "guru") ikut membawa foreign key-nya ("guru_id")
+    keep = set(fields) | {f"{field}_id" for field in fields} | {"id"}
+    return [row.model_dump(include=keep) for row in rows]
+
+
+def page_response(rows: list, page: PageParams, has_more: bool = False) -> dict:
+    return {
+        "total": len(rows),
+        "limit": page.limit,
+        "next_cursor": rows[-1].id if has_more and rows else None,
+        "data": project(rows, page.fields),
+    }
+
+
+async def paginate(model, page: PageParams, where: dict | None = None, include: dict | None = None) -> dict:
+    """
+    Satu halaman find_many (take = limit + 1 untuk tahu ada halaman berikutnya).
+    Relasi di include hanya di-join bila diminta lewat fields (atau fields kosong).
+    """
+    where = dict(where or {})
+    if page.cursor is not None:
+        where["id"] = {"lt": page.cursor}
+
+    if include and page.fields:
+        include = {rel: value for rel, value in include.items() if rel in page.fields} or None
+
+    rows = await model.find_many(
+        where=where,
+        include=include,
+        order={"id": "desc"},
+        take=page.limit + 1,
+    )
+
+    has_more = len(rows) > page.limit
+    return page_response(rows[:page.limit], page, has_more)
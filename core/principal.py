@@ -0,0 +1,49 @@
+# ===============================================================
+# 📘 core/principal.py — Baris guru / murid milik user yang login
+# ===============================================================
+import os
+from core.cache import TTLCache
+
+# Hampir semua handler butuh baris guru/murid dari email di token.
+# Disimpan sebentar in-process; route yang mengubah data guru/murid
+# wajib memanggil invalidate_principal(email).
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+
+_guru_cache = TTLCache(max_size=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+_murid_cache = TTLCache(max_size=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+async def get_guru(db, email: str):
+    """Baris guru berdasarkan email (id, nama, ...), atau None. Hasil kosong tidak di-cache."""
+    guru = _guru_cache.get(email)
+    if guru is None:
+        guru = await db.guru.find_unique(where={"email": email})
+        if guru is not None:
+            _guru_cache.set(email, guru)
+    return guru
+
+
+async def get_murid(db, email: str):
+    """Baris murid berdasarkan email (id, kelas_id, jurusan_id, ...), atau None."""
+    murid = _murid_cache.get(email)
+    if murid is None:
+        murid = await db.murid.find_unique(where={"email": email})
+        if murid is not None:
+            _murid_cache.set(email, murid)
+    return murid
+
+
+def invalidate_principal(email: str | None = None):
+    """Hapus cache untuk satu email (guru & murid), atau semuanya bila email None."""
+    if email is None:
+        _guru_cache.clear()
+        _murid_cache.clear()
+        return
+
+    _guru_cache.delete(email)
+    _murid_cache.delete(email)
+
+
+def principal_cache_stats() -> dict:
+    return {"guru": _guru_cache.stats(), "murid": _murid_cache.stats()}
@@ -0,0 +1,197 @@
+# ===============================================================
+# 📘 core/quiz_session.py — Sesi pengerjaan quiz: deadline & autosave jawaban
+# ===============================================================
+import os
+from array import array
+from datetime import datetime, timedelta, timezone
+from core.cache import TTLCache
+
+# Jawaban yang tiba sedikit setelah deadline (latensi jaringan) masih diterima
+QUIZ_GRACE_SECONDS = int(os.getenv("QUIZ_GRACE_SECONDS", "30"))
+# Quiz tanpa durasi & tanpa tanggal_selesai
+QUIZ_DEFAULT_DURASI_MENIT = int(os.getenv("QUIZ_DEFAULT_DURASI_MENIT", "120"))
+QUIZ_SESSION_MAX = int(os.getenv("QUIZ_SESSION_MAX", "100000"))
+
+# "" = jawaban dikosongkan lagi
+PILIHAN_VALID = ("", "A", "B", "C", "D")
+
+# waktu_mulai & deadline juga dicatat di sesi_quiz: sesi memori yang hilang
+# (TTL/LRU, restart) dibangun ulang dengan deadline lama, bukan timer baru.
+# Satu round trip: catat sesi baru, atau (sudah ada) kembalikan yang tercatat.
+START_SESSION_QUERY = """
+WITH baru AS (
+    INSERT INTO sesi_quiz (quiz_id, murid_id, waktu_mulai, deadline)
+    VALUES ($1, $2, $3::timestamp, $4::timestamp)
+    ON CONFLICT (quiz_id, murid_id) DO NOTHING
+    RETURNING waktu_mulai, deadline
+)
+SELECT * FROM baru
+UNION ALL
+SELECT waktu_mulai, deadline
+FROM sesi_quiz
+WHERE quiz_id = $1 AND murid_id = $2 AND NOT EXISTS (SELECT 1 FROM baru)
+"""
+
+RECORDED_SESSION_QUERY = """
+SELECT waktu_mulai, deadline FROM sesi_quiz WHERE quiz_id = $1 AND murid_id = $2
+"""
+
+
+class QuizSession:
+    """
+    Satu murid mengerjakan satu quiz.
+    jawaban[i] = pilihan untuk soal_ids[i] sebagai satu byte (0 = belum dijawab),
+    sehingga autosave hanya menimpa beberapa byte.
+    """
+
+    __slots__ = ("waktu_mulai", "deadline", "soal_ids", "jawaban", "_posisi")
+
+    def __init__(self, waktu_mulai: datetime, deadline: datetime, soal_ids):
+        self.waktu_mulai = waktu_mulai
+        self.deadline = deadline
+        self.soal_ids = array("q", soal_ids)
+        self.jawaban = bytearray(len(self.soal_ids))
+        self._posisi = {soal_id: i for i, soal_id in enumerate(self.soal_ids)}
+
+    def expired(self, now: datetime | None = None) -> bool:
+        return deadline_passed(self.deadline, now)
+
+    def sisa_detik(self) -> int:
+        return max(0, int((self.deadline - datetime.now(timezone.utc)).total_seconds()))
+
+    def simpan_jawaban(self, jawaban: dict) -> int:
+        """{ "soal_id": "A" } → byte per soal; soal di luar quiz / pilihan selain A-D diabaikan."""
+        disimpan = 0
+        for soal_id, pilihan in jawaban.items():
+            i = self._posisi.get(int(soal_id)) if str(soal_id).isdigit() else None
+            if i is None or pilihan not in PILIHAN_VALID:
+                continue
+            self.jawaban[i] = ord(pilihan) if pilihan else 0
+            disimpan += 1
+        return disimpan
+
+    def jawaban_dict(self) -> dict:
+        """Bentuk yang sama dengan body submit: { "soal_id": "A" }."""
+        return {str(soal_id): chr(b) for soal_id, b in zip(self.soal_ids, self.jawaban) if b}
+
+    def to_dict(self) -> dict:
+        return {
+            "waktu_mulai": self.waktu_mulai,
+            "deadline": self.deadline,
+            "sisa_detik": self.sisa_detik(),
+            "jawaban": self.jawaban_dict(),
+        }
+
+
+class MemorySessionStore:
+    """
+    Backend default: in-process (satu worker). Backend lain (mis. Redis) cukup
+    menyediakan method async yang sama lalu dipasang dengan set_session_store().
+    """
+
+    def __init__(self, max_size: int = QUIZ_SESSION_MAX):
+        self._sessions = TTLCache(max_size=max_size, ttl=24 * 3600)
+
+    async def get(self, key):
+        return self._sessions.get(key)
+
+    async def create(self, key, session: QuizSession) -> QuizSession:
+        """Set-if-absent: sesi yang sudah ada (reload halaman) tidak me-reset timer."""
+        existing = self._sessions.get(key)
+        if existing is not None:
+            return existing
+        self._sessions.set(key, session, ttl=_ttl(session))
+        return session
+
+    async def save_answers(self, key, jawaban: dict):
+        session = self._sessions.get(key)
+        if session is None:
+            return None
+        session.simpan_jawaban(jawaban)
+        return session
+
+    async def delete(self, key):
+        self._sessions.delete(key)
+
+    def stats(self) -> dict:
+        return self._sessions.stats()
+
+
+def _ttl(session: QuizSession) -> float:
+    """Sesi dibuang otomatis setelah deadline + grace (+ cadangan untuk submit terlambat)."""
+    sisa = (session.deadline - datetime.now(timezone.utc)).total_seconds()
+    return max(sisa, 0) + QUIZ_GRACE_SECONDS + 3600
+
+
+_store = MemorySessionStore()
+
+
+def get_session_store():
+    return _store
+
+
+def set_session_store(store):
+    global _store
+    _store = store
+
+
+def session_key(quiz_id: int, murid_id: int) -> tuple:
+    return (quiz_id, murid_id)
+
+
+def _aware(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _timestamp(value) -> datetime:
+    """Kolom TIMESTAMP dari query_raw (string ISO atau datetime) → datetime UTC."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return _aware(value)
+
+
+def deadline_passed(deadline: datetime, now: datetime | None = None) -> bool:
+    now = now or datetime.now(timezone.utc)
+    return now > deadline + timedelta(seconds=QUIZ_GRACE_SECONDS)
+
+
+def quiz_window_error(quiz, now: datetime | None = None) -> str | None:
+    """Pesan error bila quiz tidak bisa dikerjakan saat ini, atau None."""
+    now = now or datetime.now(timezone.utc)
+    if quiz.status != "Active":
+        return "Quiz belum dipublish"
+    if quiz.tanggal_mulai and now < _aware(quiz.tanggal_mulai):
+        return "Quiz belum dimulai"
+    if quiz.tanggal_selesai and now > _aware(quiz.tanggal_selesai):
+        return "Waktu quiz sudah berakhir"
+    return None
+
+
+def new_session(quiz, soal_ids) -> QuizSession:
+    """Deadline = mulai + durasi, dipotong tanggal_selesai quiz bila lebih awal."""
+    mulai = datetime.now(timezone.utc)
+    deadline = mulai + timedelta(minutes=quiz.durasi or QUIZ_DEFAULT_DURASI_MENIT)
+    if quiz.tanggal_selesai:
+        deadline = min(deadline, _aware(quiz.tanggal_selesai))
+    return QuizSession(mulai, deadline, soal_ids)
+
+
+async def start_session(db, quiz, murid_id: int, soal_ids) -> QuizSession:
+    """Sesi baru tercatat di sesi_quiz; bila sudah pernah mulai, waktu yang tercatat dipakai."""
+    sesi = new_session(quiz, soal_ids)
+    args = (quiz.id, murid_id, sesi.waktu_mulai.isoformat(), sesi.deadline.isoformat())
+    rows = await db.query_raw(START_SESSION_QUERY, *args)
+    if not rows:
+        # insert paralel commit setelah snapshot statement ini → ulangi sekali
+        rows = await db.query_raw(START_SESSION_QUERY, *args)
+    return QuizSession(_timestamp(rows[0]["waktu_mulai"]), _timestamp(rows[0]["deadline"]), soal_ids)
+
+
+async def recorded_session(db, quiz_id: int, murid_id: int) -> tuple | None:
+    """(waktu_mulai, deadline) yang tercatat untuk murid & quiz ini, atau None."""
+    rows = await db.query_raw(RECORDED_SESSION_QUERY, quiz_id, murid_id)
+    if not rows:
+        return None
+    return _timestamp(rows[0]["waktu_mulai"]), _timestamp(rows[0]["deadline"])
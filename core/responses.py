@@ -0,0 +1,114 @@
+# ===============================================================
+# 📘 core/responses.py — Serialisasi response langsung dengan orjson
+# ===============================================================
+import functools
+import inspect
+from decimal import Decimal
+import orjson
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.utils import get_typed_return_annotation
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+from fastapi.utils import is_body_allowed_for_status_code
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value):
+    """Tipe yang tidak dikenal orjson; keluaran disamakan dengan jsonable_encoder."""
+    if isinstance(value, BaseModel):
+        # model Prisma (pydantic v2): dump di pydantic-core (nested include ikut),
+        # mode json → format datetime/Decimal sama dengan jsonable_encoder
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"Tipe {type(value).__name__} tidak bisa di-serialize ke JSON")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class aplikasi (lihat main.py)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# Sub-response FastAPI (header & status_code dari parameter `response: Response`
+# milik handler). Handler tanpa parameter itu diberi parameter tersembunyi.
+_SUB_RESPONSE = "_orjson_sub_response"
+
+
+def _to_response(content, sub_response: Response, status_code: int | None) -> Response:
+    if isinstance(content, Response):
+        return content
+
+    response = ORJSONResponse(content, status_code=sub_response.status_code or status_code or 200)
+    if not is_body_allowed_for_status_code(response.status_code):
+        response.body = b""
+    response.headers.raw.extend(sub_response.headers.raw)
+    return response
+
+
+def _response_param(signature: inspect.Signature) -> str | None:
+    for param in signature.parameters.values():
+        if inspect.isclass(param.annotation) and issubclass(param.annotation, Response):
+            return param.name
+    return None
+
+
+def _wrap_endpoint(endpoint, status_code: int | None):
+    if getattr(endpoint, "__orjson_wrapped__", False):
+        return endpoint  # include_router membuat ulang route dengan endpoint yang sama
+
+    signature = inspect.signature(endpoint)
+    # FastAPI hanya menyuntikkan satu parameter bertipe Response per handler
+    name = _response_param(signature)
+    hidden = name is None
+    if hidden:
+        name = _SUB_RESPONSE
+
+    def sub_response(kwargs: dict) -> Response:
+        return kwargs.pop(name) if hidden else kwargs[name]
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            response = sub_response(kwargs)
+            return _to_response(await endpoint(**kwargs), response, status_code)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(**kwargs):
+            response = sub_response(kwargs)
+            return _to_response(endpoint(**kwargs), response, status_code)
+
+    if hidden:
+        extra = inspect.Parameter(_SUB_RESPONSE, inspect.Parameter.KEYWORD_ONLY, annotation=Response)
+        signature = signature.replace(parameters=[*signature.parameters.values(), extra])
+    wrapper.__signature__ = signature
+    wrapper.__orjson_wrapped__ = True
+    return wrapper
+
+
+class ORJSONRoute(APIRoute):
+    """
+    Route tanpa response_model: nilai kembalian handler (dict berisi model Prisma,
+    list, dst.) langsung di-serialize orjson — jsonable_encoder yang menelusuri
+    seluruh pohon include dilewati. Route dengan response_model tetap lewat FastAPI.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        response_model = kwargs.get("response_model", DefaultPlaceholder(None))
+        if isinstance(response_model, DefaultPlaceholder):
+            response_model = get_typed_return_annotation(endpoint)
+
+        if response_model is None:
+            endpoint = _wrap_endpoint(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
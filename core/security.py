@@ -2,16 +2,53 @@
 # 📘 core/security.py — JWT Validation for All Protected Routes
 # ===============================================================
 
-from fastapi import Depends, HTTPException, status
+import hashlib
+import os
+import time
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from core.auth import verify_access_token
+from core.cache import TTLCache
 
 security = HTTPBearer(auto_error=False)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+# Cache payload token yang sudah terverifikasi — key: sha256(token),
+# masa berlaku tidak pernah melewati klaim "exp" token itu sendiri.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+_token_cache = TTLCache(max_size=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+
+def verify_token_cached(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).hexdigest()
+
+    payload = _token_cache.get(key)
+    if payload is None:
+        payload = verify_access_token(token)
+        if payload is None:
+            return None
+
+        ttl = min(TOKEN_CACHE_TTL_SECONDS, payload.get("exp", 0) - time.time())
+        _token_cache.set(key, payload, ttl=ttl)
+
+    # salinan → handler yang mengubah dict tidak mengotori cache
+    return dict(payload)
+
+
+def token_cache_stats() -> dict:
+    return _token_cache.stats()
+
+
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
     Mengambil payload user dari token JWT.
+    Diselesaikan sekali per request (disimpan di request.state.user).
     """
+    cached_user = getattr(request.state, "user", None)
+    if cached_user is not None:
+        return cached_user
+
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -20,7 +57,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
 
     token = credentials.credentials
-    payload = verify_access_token(token)
+    payload = verify_token_cached(token)
 
     if payload is None:
         raise HTTPException(
@@ -29,4 +66,5 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    request.state.user = payload
     return payload  # ✅ Contoh: {"sub": "Hakim@example.com", "role": "Admin"}
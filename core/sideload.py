@@ -0,0 +1,50 @@
+# ===============================================================
+# 📘 core/sideload.py — Relasi list dikirim sekali di "included" (bukan per baris)
+# ===============================================================
+import asyncio
+
+# Kolom relasi yang boleh keluar ke client. Baris relasi diambil dengan
+# proyeksi eksplisit — password, email & relasi balik tidak pernah ikut.
+# Foreign key di baris utama = "<relasi>_id"; nama relasi = nama tabel,
+# kecuali yang terdaftar di RELATION_TABLES.
+INCLUDED_COLUMNS = {
+    "guru": ("id", "nip", "nama", "foto_profil"),
+    "kelas": ("id", "nama_kelas", "tingkat", "jurusan_id", "tahun_ajaran"),
+    "mata_pelajaran": ("id", "kode_mapel", "nama_mapel", "kategori"),
+    "murid": ("id", "nama", "nis"),
+}
+
+RELATION_TABLES = {
+    "murid_terbaik": "murid",
+}
+
+
+def _foreign_key(row, relation: str):
+    fk = f"{relation}_id"
+    return row.get(fk) if isinstance(row, dict) else getattr(row, fk, None)
+
+
+async def _load(db, relation: str, ids: list) -> dict:
+    if not ids:
+        return {}
+    table = RELATION_TABLES.get(relation, relation)
+    columns = ", ".join(INCLUDED_COLUMNS[table])
+    rows = await db.query_raw(f"SELECT {columns} FROM {table} WHERE id = ANY($1::int[])", ids)
+    return {row["id"]: row for row in rows}
+
+
+async def side_load(db, rows: list, relations: tuple, fields: list | None = None) -> dict:
+    """
+    { relasi: { id: {kolom...} } } untuk semua foreign key di rows,
+    satu query per relasi (bukan satu join per baris).
+    fields (?fields=) membatasi relasi yang dimuat, sama seperti include di paginate.
+    """
+    if fields:
+        relations = tuple(rel for rel in relations if rel in fields)
+
+    ids = {
+        rel: sorted({fk for fk in (_foreign_key(row, rel) for row in rows) if fk is not None})
+        for rel in relations
+    }
+    loaded = await asyncio.gather(*[_load(db, rel, ids[rel]) for rel in relations])
+    return dict(zip(relations, loaded))
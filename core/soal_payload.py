@@ -0,0 +1,90 @@
+# ===============================================================
+# 📘 core/soal_payload.py — Payload soal quiz siap kirim (tanpa kunci jawaban)
+# ===============================================================
+import hashlib
+import json
+import os
+import random
+from core.cache import TTLCache
+
+# Dibangun sekali per quiz (saat publish / akses pertama) lalu dipakai semua murid.
+# Route yang mengubah soal_quiz / quiz wajib memanggil invalidate_soal_payload(quiz_id).
+SOAL_PAYLOAD_CACHE_SIZE = int(os.getenv("SOAL_PAYLOAD_CACHE_SIZE", "512"))
+SOAL_PAYLOAD_CACHE_TTL_SECONDS = float(os.getenv("SOAL_PAYLOAD_CACHE_TTL_SECONDS", "3600"))
+
+_payloads = TTLCache(max_size=SOAL_PAYLOAD_CACHE_SIZE, ttl=SOAL_PAYLOAD_CACHE_TTL_SECONDS)
+_generation: dict = {}
+
+# jawaban_benar sengaja tidak diambil
+SOAL_PAYLOAD_QUERY = """
+SELECT id, quiz_id, pertanyaan, pilihan_a, pilihan_b, pilihan_c, pilihan_d, bobot
+FROM soal_quiz
+WHERE quiz_id = $1
+ORDER BY id
+"""
+
+
+def _json_default(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def dumps(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode()
+
+
+class SoalPayload:
+    """
+    fragments[i] = JSON satu soal (bytes) untuk soal_ids[i].
+    Urutan per murid = permutasi fragmen → dokumen tidak perlu di-serialize ulang.
+    """
+
+    __slots__ = ("quiz_id", "soal_ids", "fragments", "etag")
+
+    def __init__(self, quiz_id: int, rows: list):
+        self.quiz_id = quiz_id
+        self.soal_ids = [row["id"] for row in rows]
+        self.fragments = [dumps(row) for row in rows]
+        self.etag = hashlib.sha256(b"\n".join(self.fragments)).hexdigest()[:32]
+
+    @property
+    def total_soal(self) -> int:
+        return len(self.fragments)
+
+    def order(self, murid_id: int) -> list:
+        """Urutan soal deterministik per murid (sama setiap reload, di semua worker)."""
+        indices = list(range(len(self.fragments)))
+        random.Random(f"{self.quiz_id}:{murid_id}:{self.etag}").shuffle(indices)
+        return indices
+
+    def render(self, murid_id: int, head: dict) -> bytes:
+        """{...head, "data": [soal teracak]} — hanya head yang di-serialize per request."""
+        data = b",".join(self.fragments[i] for i in self.order(murid_id))
+        return dumps(head)[:-1] + b',"data":[' + data + b"]}"
+
+    def etag_for(self, murid_id: int, *state) -> str:
+        """ETag per murid: payload + urutan murid + state sesi (deadline, jawaban)."""
+        digest = hashlib.sha256(f"{self.etag}:{murid_id}:{state!r}".encode()).hexdigest()[:32]
+        return f'"{digest}"'
+
+
+async def get_soal_payload(db, quiz_id: int) -> SoalPayload:
+    payload = _payloads.get(quiz_id)
+    if payload is not None:
+        return payload
+
+    generation = _generation.get(quiz_id, 0)
+    rows = await db.query_raw(SOAL_PAYLOAD_QUERY, quiz_id)
+    payload = SoalPayload(quiz_id, rows)
+    if _generation.get(quiz_id, 0) == generation:
+        _payloads.set(quiz_id, payload)
+    return payload
+
+
+def invalidate_soal_payload(*quiz_ids: int):
+    for quiz_id in quiz_ids:
+        _generation[quiz_id] = _generation.get(quiz_id, 0) + 1
+        _payloads.delete(quiz_id)
+
+
+def soal_payload_stats() -> dict:
+    return _payloads.stats()
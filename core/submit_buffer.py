@@ -0,0 +1,336 @@
+# ===============================================================
+# 📘 core/submit_buffer.py — Mode ujian serentak: hasil_quiz ditulis per batch
+# ===============================================================
+import asyncio
+import glob
+import itertools
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa file lock, satu direktori per PID
+    fcntl = None
+
+# Aktif bila QUIZ_SUBMIT_BATCHING=1. Submit langsung dijawab setelah baris
+# tercatat di write-ahead log; insert ke DB dilakukan per batch
+# (tiap SUBMIT_FLUSH_INTERVAL_MS atau SUBMIT_FLUSH_MAX_ROWS baris).
+SUBMIT_BATCHING = os.getenv("QUIZ_SUBMIT_BATCHING") == "1"
+SUBMIT_FLUSH_INTERVAL_MS = int(os.getenv("SUBMIT_FLUSH_INTERVAL_MS", "200"))
+SUBMIT_FLUSH_MAX_ROWS = int(os.getenv("SUBMIT_FLUSH_MAX_ROWS", "500"))
+# Direktori induk; tiap proses worker memakai slot sendiri (<dir>/worker-N)
+SUBMIT_WAL_DIR = os.getenv("SUBMIT_WAL_DIR", os.path.join("data", "wal"))
+# fsync per flush: tahan mati listrik, bukan hanya crash proses
+SUBMIT_WAL_FSYNC = os.getenv("SUBMIT_WAL_FSYNC", "1") == "1"
+# Segmen yang gagal di-insert sebanyak ini di-insert per baris;
+# baris yang tetap gagal (mis. quiz/murid sudah dihapus) dipindah ke dead-letter
+SUBMIT_SEGMENT_MAX_ATTEMPTS = int(os.getenv("SUBMIT_SEGMENT_MAX_ATTEMPTS", "3"))
+
+
+class SubmitBuffer:
+    """
+    Antrian hasil_quiz per proses dengan write-ahead log:
+    - add(): baris di-append ke <wal_dir>/hasil_quiz.wal lalu masuk buffer
+    - flush: file WAL aktif di-rename jadi segmen (<wal>.<time_ns>), isinya
+      di-insert dengan create_many(skip_duplicates=True), segmen dihapus setelah berhasil
+    - start(): segmen / WAL sisa crash sebelumnya di-replay lebih dulu
+    Unique (quiz_id, murid_id) membuat replay ulang aman (submit pertama menang).
+    Tiap proses worker mengunci slot sendiri (<wal_root>/worker-N, flock), jadi
+    beberapa worker uvicorn tidak saling menulis / menghapus segmen. Slot milik
+    proses yang sudah mati (lock lepas) diambil alih saat replay.
+    Tidak thread-safe — dipakai dari event loop (satu thread).
+    """
+
+    def __init__(self, wal_dir: str = SUBMIT_WAL_DIR, interval_ms: int = SUBMIT_FLUSH_INTERVAL_MS,
+                 max_rows: int = SUBMIT_FLUSH_MAX_ROWS, fsync: bool = SUBMIT_WAL_FSYNC):
+        self.wal_root = wal_dir
+        self.wal_dir = None
+        self.wal_path = None
+        self.dead_letter_path = None
+        self.interval = interval_ms / 1000
+        self.max_rows = max_rows
+        self.fsync = fsync
+
+        self._rows: list = []
+        self._pending: dict = {}   # (quiz_id, murid_id) → respons, sampai baris tersimpan di DB
+        self._wal = None
+        self._slot_lock = None
+        self._failures: dict = {}  # segmen → jumlah insert gagal
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = None
+        self._stopping = False
+        self._db = None
+        self._on_flush = None
+        self.flushed = 0
+        self.batches = 0
+        self.dead_letters = 0
+
+    # -----------------------------------------------------------
+    # Siklus hidup (dipanggil dari startup / shutdown di main.py)
+    # -----------------------------------------------------------
+    async def start(self, db, on_flush=None) -> int:
+        """Replay WAL sisa crash, lalu jalankan loop flush. on_flush(murid_ids) dipanggil tiap batch."""
+        self._db = db
+        self._on_flush = on_flush
+        self._stopping = False
+        self._claim_slot()
+
+        try:
+            replayed = await self.replay()
+        except Exception as e:
+            # segmen tetap di disk, dicoba lagi oleh loop flush
+            print("⚠️ ERROR replay WAL hasil_quiz:", e)
+            replayed = 0
+
+        self._wal = open(self.wal_path, "a", encoding="utf-8")
+        self._task = asyncio.create_task(self._run())
+        return replayed
+
+    async def stop(self):
+        # loop dihentikan lewat flag (bukan cancel) agar flush yang sedang jalan selesai dulu
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+        await self.flush()
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        self._release_slot()
+
+    def _use_slot(self, wal_dir: str):
+        self.wal_dir = wal_dir
+        self.wal_path = os.path.join(wal_dir, "hasil_quiz.wal")
+        self.dead_letter_path = os.path.join(wal_dir, "hasil_quiz.dead")
+
+    def _claim_slot(self):
+        """Kunci slot worker-N pertama yang bebas (lock dilepas OS bila proses mati)."""
+        if fcntl is None:
+            wal_dir = os.path.join(self.wal_root, f"worker-{os.getpid()}")
+            os.makedirs(wal_dir, exist_ok=True)
+            self._use_slot(wal_dir)
+            return
+
+        for n in itertools.count():
+            wal_dir = os.path.join(self.wal_root, f"worker-{n}")
+            os.makedirs(wal_dir, exist_ok=True)
+            lock = _try_lock(wal_dir)
+            if lock is not None:
+                self._slot_lock = lock
+                self._use_slot(wal_dir)
+                return
+
+    def _release_slot(self):
+        if self._slot_lock is not None:
+            self._slot_lock.close()
+            self._slot_lock = None
+
+    def _adopt_orphans(self) -> int:
+        """Pindahkan WAL & segmen dari slot tanpa pemilik (proses mati) ke slot ini."""
+        if fcntl is None:
+            return 0
+
+        adopted = 0
+        for wal_dir in glob.glob(os.path.join(glob.escape(self.wal_root), "worker-*")):
+            if wal_dir == self.wal_dir:
+                continue
+            lock = _try_lock(wal_dir)
+            if lock is None:
+                continue  # masih dipakai worker lain
+            try:
+                source = os.path.join(wal_dir, "hasil_quiz.wal")
+                # segmen lama dulu, WAL aktif (baris terbaru) terakhir
+                for path in sorted(glob.glob(f"{glob.escape(source)}*"), key=lambda p: (p == source, p)):
+                    os.replace(path, f"{self.wal_path}.{time.time_ns()}")
+                    adopted += 1
+            finally:
+                lock.close()
+        return adopted
+
+    # -----------------------------------------------------------
+    # Jalur request
+    # -----------------------------------------------------------
+    def pending(self, quiz_id: int, murid_id: int):
+        """Respons submit yang belum tersimpan di DB untuk murid & quiz ini, atau None."""
+        return self._pending.get((quiz_id, murid_id))
+
+    def add(self, row: dict, response: dict) -> dict:
+        """Catat satu baris hasil_quiz (kolom sesuai tabel); kembali setelah tertulis di WAL."""
+        key = (row["quiz_id"], row["murid_id"])
+        if key in self._pending:
+            return self._pending[key]
+
+        row = dict(row, waktu_selesai=datetime.now(timezone.utc))
+        self._wal.write(json.dumps(row, default=datetime.isoformat) + "\n")
+        self._wal.flush()
+
+        self._rows.append(row)
+        self._pending[key] = response
+        if len(self._rows) >= self.max_rows:
+            self._wakeup.set()
+        return response
+
+    # -----------------------------------------------------------
+    # Flush & replay
+    # -----------------------------------------------------------
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                return
+
+            try:
+                await self.flush()
+            except Exception as e:
+                # segmen tetap di disk, dicoba lagi di putaran berikutnya
+                print("⚠️ ERROR flush hasil_quiz:", e)
+
+    def _rotate(self) -> str | None:
+        """WAL aktif → segmen bernomor; request berikutnya menulis ke file WAL baru."""
+        if self._wal is None or not self._rows:
+            return None
+
+        if self.fsync:
+            os.fsync(self._wal.fileno())
+        self._wal.close()
+
+        segment = f"{self.wal_path}.{time.time_ns()}"
+        os.replace(self.wal_path, segment)
+        self._wal = open(self.wal_path, "a", encoding="utf-8")
+        return segment
+
+    async def flush(self) -> int:
+        """Insert semua segmen yang belum tersimpan (termasuk buffer saat ini)."""
+        async with self._lock:
+            self._rotate()
+            self._rows = []
+            return await self._insert_segments()
+
+    async def replay(self) -> int:
+        """Saat startup: WAL aktif & segmen dari proses sebelumnya di-insert ulang."""
+        if os.path.exists(self.wal_path) and os.path.getsize(self.wal_path):
+            os.replace(self.wal_path, f"{self.wal_path}.{time.time_ns()}")
+        self._adopt_orphans()
+
+        async with self._lock:
+            total = await self._insert_segments()
+        if total:
+            print(f"♻️ Replay WAL hasil_quiz: {total} baris")
+        return total
+
+    async def _insert_segments(self) -> int:
+        """Segmen diproses per file: satu segmen yang gagal tidak menahan segmen berikutnya."""
+        total = 0
+        for segment in sorted(glob.glob(f"{glob.escape(self.wal_path)}.*")):
+            try:
+                total += await self._insert_segment(segment)
+            except Exception as e:
+                attempts = self._failures.get(segment, 0) + 1
+                self._failures[segment] = attempts
+                print(f"⚠️ ERROR insert segmen {os.path.basename(segment)} (percobaan {attempts}):", e)
+                if attempts >= SUBMIT_SEGMENT_MAX_ATTEMPTS:
+                    total += await self._insert_rows(segment)
+        return total
+
+    async def _insert_segment(self, segment: str) -> int:
+        rows = read_wal(segment)
+        if rows:
+            await self._db.hasil_quiz.create_many(data=rows, skip_duplicates=True)
+        return self._segment_done(segment, rows, rows)
+
+    async def _insert_rows(self, segment: str) -> int:
+        """Fallback per baris: baris yang tetap gagal dicatat ke dead-letter lalu dilewati."""
+        rows = read_wal(segment)
+        inserted, failed = [], []
+        for row in rows:
+            try:
+                await self._db.hasil_quiz.create_many(data=[row], skip_duplicates=True)
+                inserted.append(row)
+            except Exception as e:
+                failed.append((row, e))
+
+        if failed and not inserted:
+            # semua baris gagal: bisa jadi DB sedang tidak bisa diakses, bukan barisnya yang rusak
+            try:
+                await self._db.query_raw("SELECT 1")
+            except Exception:
+                return 0  # segmen tetap di disk
+
+        self._dead_letter(failed)
+        return self._segment_done(segment, rows, inserted)
+
+    def _dead_letter(self, failed: list):
+        if not failed:
+            return
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            for row, error in failed:
+                print(f"⚠️ hasil_quiz quiz {row['quiz_id']} murid {row['murid_id']} dibuang ke dead-letter:", error)
+                f.write(json.dumps({"row": row, "error": str(error)}, default=datetime.isoformat) + "\n")
+        self.dead_letters += len(failed)
+
+    def _segment_done(self, segment: str, rows: list, inserted: list) -> int:
+        os.remove(segment)
+        self._failures.pop(segment, None)
+
+        for row in rows:
+            self._pending.pop((row["quiz_id"], row["murid_id"]), None)
+
+        self.flushed += len(inserted)
+        self.batches += 1
+        if inserted and self._on_flush is not None:
+            # tidak ditunggu: flush berikutnya tidak tertahan refresh fitur
+            asyncio.create_task(self._on_flush([row["murid_id"] for row in inserted]))
+        return len(inserted)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": SUBMIT_BATCHING,
+            "buffered": len(self._rows),
+            "pending": len(self._pending),
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "dead_letters": self.dead_letters,
+            "wal_dir": self.wal_dir,
+        }
+
+
+WAL_DATETIME_FIELDS = ("waktu_mulai", "waktu_selesai")
+
+
+def _try_lock(wal_dir: str):
+    """File lock eksklusif non-blocking pada <wal_dir>/.lock, atau None bila dipegang proses lain."""
+    lock = open(os.path.join(wal_dir, ".lock"), "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return None
+    return lock
+
+
+def read_wal(path: str) -> list:
+    """Baris WAL → data create_many. Baris terakhir yang terpotong (crash saat menulis) diabaikan."""
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            for field in WAL_DATETIME_FIELDS:
+                if row.get(field):
+                    row[field] = datetime.fromisoformat(row[field])
+            rows.append(row)
+    return rows
+
+
+submit_buffer = SubmitBuffer()
@@ -1,13 +1,17 @@
 # main.py — FastAPI + Prisma + JWT Authentication
+import asyncio
+import os
 from fastapi import FastAPI
 from generated.prisma import Prisma
 from fastapi.middleware.cors import CORSMiddleware 
+from core.responses import ORJSONResponse
 
 # FastAPI Initialization
 app = FastAPI(
     title="Sekolah API - FastAPI + Prisma + Neon + JWT Auth",
     description="Sistem API Sekolah berbasis FastAPI + Prisma ORM dengan PostgreSQL Neon Cloud & JWT Authentication",
-    version="1.1.0"
+    version="1.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -19,6 +23,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  
     allow_headers=["*"],     
+    expose_headers=["ETag"],
 )
 
 # Prisma Database Client (Single Shared Instance)
@@ -29,9 +34,24 @@ async def startup():
         await db.connect()
     print("✅ Connected to Neon Database!")
 
+    # Opsional: muat model cluster di background (tanpa menahan startup)
+    if os.getenv("PRELOAD_ML_MODELS") == "1":
+        from plugin.cluster.model_loader import ensure_artifacts_loaded
+        asyncio.create_task(ensure_artifacts_loaded())
+
+    # Mode ujian serentak: hasil quiz ditulis per batch (replay WAL sisa crash dulu)
+    from core.submit_buffer import SUBMIT_BATCHING, submit_buffer
+    if SUBMIT_BATCHING:
+        from plugin.cluster.feature_store import refresh_feature_store
+        await submit_buffer.start(db, on_flush=lambda murid_ids: refresh_feature_store(db, murid_ids))
+
 
 @app.on_event("shutdown")
 async def shutdown():
+    from core.submit_buffer import SUBMIT_BATCHING, submit_buffer
+    if SUBMIT_BATCHING and db.is_connected():
+        await submit_buffer.stop()
+
     if db.is_connected():
         await db.disconnect()
     print("❌ Disconnected from Database.")
@@ -64,6 +84,8 @@ from routes.beranda_murid_routes import router as beranda_murid_router
 from routes.guru_quiz_routes import router as guru_quiz_router
 from routes.murid_quiz_routes import router as murid_quiz_router
 from routes.murid_materi_routes import router as murid_materi_router
+from routes.rapor_routes import router as rapor_router
+from routes.laporan_routes import router as laporan_router
 # 🔗 Register All Routers
 
 # --- Authentication ---
@@ -95,6 +117,8 @@ app.include_router(materi_router, prefix="/materi", tags=["Materi"])
 app.include_router(quiz_router, prefix="/quiz", tags=["Quiz"])
 app.include_router(soal_quiz_router, prefix="/soal-quiz", tags=["Soal Quiz"])
 app.include_router(hasil_quiz_router, prefix="/hasil-quiz", tags=["Hasil Quiz"])
+app.include_router(rapor_router, prefix="/rapor", tags=["Rapor"])
+app.include_router(laporan_router, prefix="/laporan", tags=["Laporan Performa"])
 app.include_router(beranda_murid_router, prefix="/beranda-murid")
 
 
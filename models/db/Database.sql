@@ -233,6 +233,17 @@ CREATE TABLE IF NOT EXISTS hasil_quiz (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- ------------------------------ 
+-- Tabel Sesi Quiz (waktu mulai & deadline pengerjaan per murid, UTC)
+CREATE TABLE IF NOT EXISTS sesi_quiz (
+    id SERIAL PRIMARY KEY,
+    quiz_id INTEGER NOT NULL REFERENCES quiz(id) ON DELETE CASCADE,
+    murid_id INTEGER NOT NULL REFERENCES murid(id) ON DELETE CASCADE,
+    waktu_mulai TIMESTAMP NOT NULL,
+    deadline TIMESTAMP NOT NULL,
+    UNIQUE (quiz_id, murid_id)
+);
+
 -- ------------------------------ 
 -- Tabel Preferensi Murid
 CREATE TABLE IF NOT EXISTS preferensi_murid (
@@ -373,6 +384,60 @@ CREATE TABLE IF NOT EXISTS aktivitas_belajar (
     tanggal_aktivitas TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- ------------------------------ 
+-- Tabel Fitur Murid (feature store untuk clustering, 1 baris per murid)
+CREATE TABLE IF NOT EXISTS fitur_murid (
+    id SERIAL PRIMARY KEY,
+    murid_id INTEGER UNIQUE NOT NULL REFERENCES murid(id) ON DELETE CASCADE,
+    nilai_akhir DOUBLE PRECISION NOT NULL DEFAULT 0,
+    nilai_tugas DOUBLE PRECISION NOT NULL DEFAULT 0,
+    nilai_quiz DOUBLE PRECISION NOT NULL DEFAULT 0,
+    nilai_uts DOUBLE PRECISION NOT NULL DEFAULT 0,
+    nilai_uas DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_hadir DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_alpha DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_izin DOUBLE PRECISION NOT NULL DEFAULT 0,
+    tingkat_kehadiran DOUBLE PRECISION NOT NULL DEFAULT 0,
+    jumlah_tugas DOUBLE PRECISION NOT NULL DEFAULT 0,
+    persentase_pengumpulan DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_quiz DOUBLE PRECISION NOT NULL DEFAULT 0,
+    rata_nilai_quiz DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_aktivitas DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_durasi_belajar DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ------------------------------ 
+-- Tabel Antrian Job Rekomendasi AI (diproses worker)
+CREATE TABLE IF NOT EXISTS rekomendasi_job (
+    id SERIAL PRIMARY KEY,
+    murid_id INTEGER NOT NULL,
+    fitur_hash VARCHAR(64) NOT NULL,
+    cluster INTEGER,
+    model_version VARCHAR(64),
+    status VARCHAR(20) NOT NULL DEFAULT 'Pending' CHECK (status IN ('Pending', 'Proses', 'Gagal')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (murid_id, fitur_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rekomendasi_job_antrian ON rekomendasi_job(status, next_run_at);
+
+-- ------------------------------ 
+-- Tabel Hasil Rekomendasi AI per Murid
+CREATE TABLE IF NOT EXISTS rekomendasi_murid (
+    id SERIAL PRIMARY KEY,
+    murid_id INTEGER UNIQUE NOT NULL REFERENCES murid(id) ON DELETE CASCADE,
+    fitur_hash VARCHAR(64) NOT NULL,
+    cluster INTEGER,
+    model_version VARCHAR(64), -- versi model cluster yang menghasilkan label
+    rekomendasi TEXT NOT NULL, -- JSON array
+    generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ------------------------------ 
 -- Tabel Laporan Performa Kelas (Summary untuk Dashboard Guru)
 CREATE TABLE IF NOT EXISTS laporan_performa (
@@ -450,6 +515,62 @@ CREATE TRIGGER update_target_pembelajaran_updated_at
     EXECUTE FUNCTION update_updated_at_column();
 
 
+-- ------------------------------ 
+-- Tabel Versi Data (ETag untuk list read-mostly, lihat core/etag.py)
+CREATE TABLE IF NOT EXISTS versi_data (
+    tabel VARCHAR(64) PRIMARY KEY,
+    versi BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Trigger per statement: setiap tulis ke tabel terdaftar menaikkan versinya
+CREATE OR REPLACE FUNCTION bump_versi_data()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO versi_data (tabel, versi, updated_at)
+    VALUES (TG_TABLE_NAME, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (tabel) DO UPDATE
+    SET versi = versi_data.versi + 1, updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER versi_berita
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON berita
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+CREATE TRIGGER versi_jurusan
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON jurusan
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+CREATE TRIGGER versi_kelas
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON kelas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+CREATE TRIGGER versi_video_kegiatan
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON video_kegiatan
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+CREATE TRIGGER versi_mata_pelajaran
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON mata_pelajaran
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+CREATE TRIGGER versi_guru
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON guru
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+CREATE TRIGGER versi_admin
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON admin
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+
 --  optimasi performa pake indeks
 
 CREATE INDEX idx_murid_kelas ON murid(kelas_id);
@@ -460,4 +581,19 @@ CREATE INDEX idx_nilai_ujian_murid ON nilai_ujian(murid_id, semester, tahun_ajar
 CREATE INDEX idx_rapor_murid ON rapor(murid_id, semester, tahun_ajaran);
 CREATE INDEX idx_quiz_kelas ON quiz(kelas_id, status);
 CREATE INDEX idx_tugas_kelas ON tugas(kelas_id, status);
-CREATE INDEX idx_berita_status ON berita(status, tanggal_publish);
\ No newline at end of file
+CREATE INDEX idx_berita_status ON berita(status, tanggal_publish);
+CREATE INDEX idx_laporan_performa_periode ON laporan_performa(tahun_ajaran, periode, bulan, semester);
+CREATE INDEX idx_laporan_performa_guru ON laporan_performa(guru_id);
+CREATE UNIQUE INDEX uq_hasil_quiz_quiz_murid ON hasil_quiz(quiz_id, murid_id);
+CREATE INDEX idx_hasil_quiz_murid ON hasil_quiz(murid_id);
+CREATE INDEX idx_quiz_mapel_kelas ON quiz(mata_pelajaran_id, kelas_id, status);
+CREATE INDEX idx_quiz_guru ON quiz(guru_id);
+CREATE INDEX idx_soal_quiz_quiz ON soal_quiz(quiz_id);
+CREATE INDEX idx_materi_mapel_kelas ON materi(mata_pelajaran_id, kelas_id);
+CREATE INDEX idx_materi_guru ON materi(guru_id);
+CREATE INDEX idx_absensi_guru_status ON absensi(guru_id, status);
+CREATE INDEX idx_tugas_guru ON tugas(guru_id);
+CREATE INDEX idx_pengumpulan_tugas_tugas_murid ON pengumpulan_tugas(tugas_id, murid_id);
+CREATE INDEX idx_pengumpulan_tugas_murid ON pengumpulan_tugas(murid_id);
+CREATE INDEX idx_rapor_guru ON rapor(guru_id);
+CREATE INDEX idx_mata_pelajaran_guru ON mata_pelajaran(guru_id);
\ No newline at end of file
@@ -0,0 +1,43 @@
+-- ===============================================================
+-- 001_index_plan.sql — Indeks untuk predikat query yang paling sering dipakai
+-- Aman dijalankan berulang (IF NOT EXISTS) dan tanpa mengunci tabel
+-- (CONCURRENTLY → jalankan di luar transaksi, mis. psql -f).
+-- ===============================================================
+
+-- hasil_quiz: cek "sudah submit?" (quiz_id, murid_id) & riwayat per murid
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hasil_quiz_quiz_murid ON hasil_quiz(quiz_id, murid_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hasil_quiz_murid ON hasil_quiz(murid_id);
+
+-- quiz: daftar quiz murid per mapel + kelas + status, daftar quiz guru
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_quiz_mapel_kelas ON quiz(mata_pelajaran_id, kelas_id, status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_quiz_kelas ON quiz(kelas_id, status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_quiz_guru ON quiz(guru_id);
+
+-- soal_quiz: semua soal satu quiz
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_soal_quiz_quiz ON soal_quiz(quiz_id);
+
+-- materi: materi murid per mapel + kelas, materi milik guru
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_materi_mapel_kelas ON materi(mata_pelajaran_id, kelas_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_materi_guru ON materi(guru_id);
+
+-- absensi: dashboard guru (guru_id, status) & fitur per murid
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_absensi_guru_status ON absensi(guru_id, status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_absensi_murid_tanggal ON absensi(murid_id, tanggal);
+
+-- tugas: tugas per kelas (murid) & per guru
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tugas_kelas ON tugas(kelas_id, status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tugas_guru ON tugas(guru_id);
+
+-- pengumpulan_tugas: agregat per tugas / per murid
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pengumpulan_tugas_tugas_murid ON pengumpulan_tugas(tugas_id, murid_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pengumpulan_tugas_murid ON pengumpulan_tugas(murid_id);
+
+-- rapor: rata-rata nilai dashboard guru
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rapor_guru ON rapor(guru_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rapor_murid ON rapor(murid_id, semester, tahun_ajaran);
+
+-- murid: murid per kelas (wali kelas, laporan)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_murid_kelas ON murid(kelas_id);
+
+-- mata_pelajaran: mapel yang diampu guru
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mata_pelajaran_guru ON mata_pelajaran(guru_id);
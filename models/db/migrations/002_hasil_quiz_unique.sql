@@ -0,0 +1,16 @@
+-- ===============================================================
+-- 002_hasil_quiz_unique.sql — Satu hasil_quiz per (quiz_id, murid_id)
+-- Submit quiz memakai INSERT ... ON CONFLICT (quiz_id, murid_id) DO NOTHING.
+-- Jalankan di luar transaksi (CONCURRENTLY), mis. psql -f.
+-- ===============================================================
+
+-- 1. Buang duplikat lama: simpan hasil pertama (id terkecil) per murid per quiz
+DELETE FROM hasil_quiz h
+USING hasil_quiz asli
+WHERE h.quiz_id = asli.quiz_id
+  AND h.murid_id = asli.murid_id
+  AND h.id > asli.id;
+
+-- 2. Unique index (menggantikan indeks biasa dari 001_index_plan.sql)
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_hasil_quiz_quiz_murid ON hasil_quiz(quiz_id, murid_id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_hasil_quiz_quiz_murid;
@@ -0,0 +1,75 @@
+-- ===============================================================
+-- 003_versi_data.sql — Versi per tabel untuk ETag / If-None-Match
+-- List berita, jurusan, kelas, video_kegiatan & mata_pelajaran (beserta
+-- relasi guru/admin yang di-include) menjawab 304 tanpa find_many.
+-- ===============================================================
+
+CREATE TABLE IF NOT EXISTS versi_data (
+    tabel VARCHAR(64) PRIMARY KEY,
+    versi BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Trigger per statement: setiap tulis ke tabel terdaftar menaikkan versinya
+CREATE OR REPLACE FUNCTION bump_versi_data()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO versi_data (tabel, versi, updated_at)
+    VALUES (TG_TABLE_NAME, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (tabel) DO UPDATE
+    SET versi = versi_data.versi + 1, updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS versi_berita ON berita;
+CREATE TRIGGER versi_berita
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON berita
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+DROP TRIGGER IF EXISTS versi_jurusan ON jurusan;
+CREATE TRIGGER versi_jurusan
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON jurusan
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+DROP TRIGGER IF EXISTS versi_kelas ON kelas;
+CREATE TRIGGER versi_kelas
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON kelas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+DROP TRIGGER IF EXISTS versi_video_kegiatan ON video_kegiatan;
+CREATE TRIGGER versi_video_kegiatan
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON video_kegiatan
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+DROP TRIGGER IF EXISTS versi_mata_pelajaran ON mata_pelajaran;
+CREATE TRIGGER versi_mata_pelajaran
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON mata_pelajaran
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+DROP TRIGGER IF EXISTS versi_guru ON guru;
+CREATE TRIGGER versi_guru
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON guru
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+DROP TRIGGER IF EXISTS versi_admin ON admin;
+CREATE TRIGGER versi_admin
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON admin
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_versi_data();
+
+INSERT INTO versi_data (tabel) VALUES
+    ('berita'),
+    ('jurusan'),
+    ('kelas'),
+    ('video_kegiatan'),
+    ('mata_pelajaran'),
+    ('guru'),
+    ('admin')
+ON CONFLICT (tabel) DO NOTHING;
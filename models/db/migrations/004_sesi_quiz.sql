@@ -0,0 +1,14 @@
+-- ===============================================================
+-- 004_sesi_quiz.sql — Waktu mulai & deadline sesi quiz disimpan di DB
+-- Sesi in-memory yang hilang (TTL/LRU, restart) tidak lagi memberi
+-- timer baru: sesi dibangun ulang dari baris ini.
+-- ===============================================================
+
+CREATE TABLE IF NOT EXISTS sesi_quiz (
+    id SERIAL PRIMARY KEY,
+    quiz_id INTEGER NOT NULL REFERENCES quiz(id) ON DELETE CASCADE,
+    murid_id INTEGER NOT NULL REFERENCES murid(id) ON DELETE CASCADE,
+    waktu_mulai TIMESTAMP NOT NULL,
+    deadline TIMESTAMP NOT NULL,
+    UNIQUE (quiz_id, murid_id)
+);
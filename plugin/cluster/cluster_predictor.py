@@ -1,29 +1,76 @@
 import numpy as np
-from plugin.cluster.model_loader import load_model, load_scaler
+from plugin.cluster.model_loader import get_active_model
 from plugin.cluster.feature_schema import FEATURES
 
-model = load_model()
-scaler = load_scaler()
-import numpy as np
-
 DEFAULT_VALUE = 0  # atau bisa 50, atau rata-rata dataset
 
+
+def _clean_value(val):
+    if val is None or val == "" or val == "null":
+        return DEFAULT_VALUE
+    return float(val)
+
+
+def build_feature_matrix(rows: list[dict]) -> np.ndarray:
+    """
+    Menyusun matriks fitur (n_murid x len(FEATURES)) sesuai urutan FEATURES.
+    """
+    matrix = np.empty((len(rows), len(FEATURES)), dtype=np.float64)
+    for i, data_dict in enumerate(rows):
+        matrix[i] = [_clean_value(data_dict.get(f)) for f in FEATURES]
+    return matrix
+
+
+def predict_cluster_matrix(matrix: np.ndarray, model_version=None) -> np.ndarray:
+    """
+    Scaling + prediksi untuk seluruh baris sekaligus (satu panggilan vektor).
+    Memakai jalur cepat NumPy bila lolos uji paritas dengan sklearn saat model dimuat.
+    model_version: snapshot dari get_active_model(); default = versi aktif saat ini.
+    """
+    if len(matrix) == 0:
+        return np.empty(0, dtype=np.int64)
+    mv = model_version or get_active_model()
+    return mv.predict(matrix)
+
+
+def predict_cluster_batch(data_by_murid: dict) -> dict:
+    """
+    Prediksi cluster untuk banyak murid sekaligus.
+    Input  : { murid_id: {fitur: nilai, ...}, ... }
+    Output : { murid_id: label | None }
+    """
+    murid_ids = list(data_by_murid.keys())
+
+    try:
+        matrix = build_feature_matrix([data_by_murid[i] for i in murid_ids])
+        labels = predict_cluster_matrix(matrix)
+        return {murid_id: int(label) for murid_id, label in zip(murid_ids, labels)}
+
+    except Exception as e:
+        print("⚠️ ERROR saat memprediksi (batch):", e)
+        return {murid_id: None for murid_id in murid_ids}
+
+
+def predict_cluster_table(table, model_version=None) -> dict:
+    """
+    Prediksi cluster langsung dari FeatureTable (feature_extractor).
+    Output : { murid_id: label | None }
+    """
+    try:
+        labels = predict_cluster_matrix(table.matrix(), model_version)
+        return {murid_id: int(label) for murid_id, label in zip(table.murid_ids, labels)}
+
+    except Exception as e:
+        print("⚠️ ERROR saat memprediksi (table):", e)
+        return {murid_id: None for murid_id in table.murid_ids}
+
+
 def predict_cluster_for_student(data_dict: dict):
     try:
-        cleaned = {}
-        for f in FEATURES:
-            val = data_dict.get(f)
-
-            if val is None or val == "" or val == "null":
-                cleaned[f] = DEFAULT_VALUE
-            else:
-                cleaned[f] = float(val)
-
-        arr = np.array([cleaned[f] for f in FEATURES]).reshape(1, -1)
-        arr_scaled = scaler.transform(arr)
-        label = model.predict(arr_scaled)[0]
+        arr = build_feature_matrix([data_dict])
+        label = predict_cluster_matrix(arr)[0]
         return int(label)
 
     except Exception as e:
         print("⚠️ ERROR saat memprediksi:", e)
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,141 @@
+import asyncio
+import numpy as np
+from plugin.cluster.feature_schema import FEATURES
+
+# ===============================================================
+# Query agregat per tabel (satu query per tabel, bukan per murid)
+# {murid_filter} diganti dengan filter "murid_id IN (...)" bila perlu
+# ===============================================================
+RAPOR_QUERY = """
+SELECT murid_id,
+       AVG(nilai_akhir)::float8 AS nilai_akhir,
+       AVG(nilai_tugas)::float8 AS nilai_tugas,
+       AVG(nilai_quiz)::float8  AS nilai_quiz,
+       AVG(nilai_uts)::float8   AS nilai_uts,
+       AVG(nilai_uas)::float8   AS nilai_uas
+FROM rapor
+WHERE murid_id IS NOT NULL {murid_filter}
+GROUP BY murid_id
+"""
+
+ABSENSI_QUERY = """
+SELECT murid_id,
+       COUNT(*) FILTER (WHERE status = 'Hadir')::int            AS total_hadir,
+       COUNT(*) FILTER (WHERE status IN ('Alpha', 'Alfa'))::int AS total_alpha,
+       COUNT(*) FILTER (WHERE status = 'Izin')::int             AS total_izin,
+       (COUNT(*) FILTER (WHERE status = 'Hadir') * 100.0 / COUNT(*))::float8 AS tingkat_kehadiran
+FROM absensi
+WHERE murid_id IS NOT NULL {murid_filter}
+GROUP BY murid_id
+"""
+
+TUGAS_QUERY = """
+SELECT m.id AS murid_id,
+       COUNT(DISTINCT t.id)::int AS jumlah_tugas,
+       (COUNT(DISTINCT pt.tugas_id) * 100.0 / NULLIF(COUNT(DISTINCT t.id), 0))::float8 AS persentase_pengumpulan
+FROM murid m
+JOIN tugas t ON t.kelas_id = m.kelas_id
+LEFT JOIN pengumpulan_tugas pt ON pt.tugas_id = t.id AND pt.murid_id = m.id
+WHERE TRUE {murid_filter_m}
+GROUP BY m.id
+"""
+
+QUIZ_QUERY = """
+SELECT murid_id,
+       COUNT(*)::int          AS total_quiz,
+       AVG(score)::float8     AS rata_nilai_quiz
+FROM hasil_quiz
+WHERE murid_id IS NOT NULL {murid_filter}
+GROUP BY murid_id
+"""
+
+AKTIVITAS_QUERY = """
+SELECT murid_id,
+       COUNT(*)::int                       AS total_aktivitas,
+       COALESCE(SUM(durasi), 0)::float8    AS total_durasi_belajar
+FROM aktivitas_belajar
+WHERE murid_id IS NOT NULL {murid_filter}
+GROUP BY murid_id
+"""
+
+MURID_QUERY = """
+SELECT id, nama
+FROM murid m
+WHERE TRUE {murid_filter_m}
+ORDER BY id
+"""
+
+
+class FeatureTable:
+    """
+    Tabel fitur kolumnar per murid.
+    - murid_ids : list id murid (urutan baris)
+    - nama      : list nama murid (urutan sama dengan murid_ids)
+    - columns   : { nama_fitur: np.ndarray } untuk setiap fitur di FEATURES
+    """
+
+    def __init__(self, murid_ids: list, nama: list, columns: dict):
+        self.murid_ids = murid_ids
+        self.nama = nama
+        self.columns = columns
+        self._index = {murid_id: i for i, murid_id in enumerate(murid_ids)}
+
+    def __len__(self):
+        return len(self.murid_ids)
+
+    def __contains__(self, murid_id):
+        return murid_id in self._index
+
+    def matrix(self) -> np.ndarray:
+        """Matriks (n_murid x len(FEATURES)) sesuai urutan FEATURES."""
+        if not self.murid_ids:
+            return np.empty((0, len(FEATURES)), dtype=np.float64)
+        return np.column_stack([self.columns[f] for f in FEATURES])
+
+    def row(self, murid_id: int) -> dict:
+        i = self._index[murid_id]
+        return {f: float(self.columns[f][i]) for f in FEATURES}
+
+    def has_data(self) -> np.ndarray:
+        """Mask murid yang memiliki minimal satu fitur bernilai (bukan murid kosong)."""
+        return self.matrix().any(axis=1)
+
+
+def _murid_filter(murid_ids, column: str) -> str:
+    if murid_ids is None:
+        return ""
+    ids = ", ".join(str(int(i)) for i in murid_ids) or "NULL"
+    return f"AND {column} IN ({ids})"
+
+
+async def extract_features(db, murid_ids: list | None = None) -> FeatureTable:
+    """
+    Menghitung seluruh FEATURES untuk semua murid (atau murid_ids tertentu)
+    dengan satu query agregat per tabel, dijalankan bersamaan.
+    """
+    murid_filter = _murid_filter(murid_ids, "murid_id")
+    murid_filter_m = _murid_filter(murid_ids, "m.id")
+
+    murid_rows, *aggregates = await asyncio.gather(
+        db.query_raw(MURID_QUERY.format(murid_filter_m=murid_filter_m)),
+        db.query_raw(RAPOR_QUERY.format(murid_filter=murid_filter)),
+        db.query_raw(ABSENSI_QUERY.format(murid_filter=murid_filter)),
+        db.query_raw(TUGAS_QUERY.format(murid_filter_m=murid_filter_m)),
+        db.query_raw(QUIZ_QUERY.format(murid_filter=murid_filter)),
+        db.query_raw(AKTIVITAS_QUERY.format(murid_filter=murid_filter)),
+    )
+
+    ids = [r["id"] for r in murid_rows]
+    index = {murid_id: i for i, murid_id in enumerate(ids)}
+    columns = {f: np.zeros(len(ids), dtype=np.float64) for f in FEATURES}
+
+    for rows in aggregates:
+        for r in rows:
+            i = index.get(r["murid_id"])
+            if i is None:
+                continue
+            for f, val in r.items():
+                if f in columns and val is not None:
+                    columns[f][i] = float(val)
+
+    return FeatureTable(ids, [r["nama"] for r in murid_rows], columns)
@@ -0,0 +1,114 @@
+import asyncio
+import numpy as np
+from plugin.cluster.feature_schema import FEATURES
+from plugin.cluster.feature_extractor import FeatureTable, extract_features
+
+# Jumlah baris per statement INSERT ... ON CONFLICT saat rebuild
+UPSERT_CHUNK = 1000
+
+UPSERT_QUERY = """
+INSERT INTO fitur_murid (murid_id, {columns}, updated_at)
+VALUES {values}
+ON CONFLICT (murid_id) DO UPDATE SET {updates}, updated_at = NOW()
+"""
+
+LOAD_QUERY = """
+SELECT f.murid_id, m.nama, {columns}
+FROM fitur_murid f
+JOIN murid m ON m.id = f.murid_id
+WHERE TRUE {murid_filter}
+ORDER BY f.murid_id
+"""
+
+KELAS_MURID_QUERY = "SELECT id FROM murid WHERE kelas_id = $1"
+
+
+def _upsert_sql(table: FeatureTable, rows: range) -> str:
+    matrix = table.matrix()
+    values = ",\n".join(
+        "(" + ", ".join([str(int(table.murid_ids[i]))] + [repr(float(v)) for v in matrix[i]]) + ", NOW())"
+        for i in rows
+    )
+    return UPSERT_QUERY.format(
+        columns=", ".join(FEATURES),
+        values=values,
+        updates=", ".join(f"{f} = EXCLUDED.{f}" for f in FEATURES),
+    )
+
+
+async def save_feature_table(db, table: FeatureTable):
+    """Menyimpan (upsert) FeatureTable ke tabel fitur_murid."""
+    for start in range(0, len(table), UPSERT_CHUNK):
+        rows = range(start, min(start + UPSERT_CHUNK, len(table)))
+        await db.execute_raw(_upsert_sql(table, rows))
+
+
+async def refresh_feature_store(db, murid_ids: list):
+    """
+    Refresh inkremental: hitung ulang fitur hanya untuk murid_ids lalu upsert.
+    Dipanggil sebagai background task setelah absensi / hasil quiz / tugas berubah.
+    """
+    murid_ids = [i for i in set(murid_ids) if i is not None]
+    if not murid_ids:
+        return
+
+    try:
+        table = await extract_features(db, murid_ids=murid_ids)
+        await save_feature_table(db, table)
+    except Exception as e:
+        print("⚠️ ERROR refresh fitur murid:", e)
+
+
+async def refresh_feature_store_kelas(db, kelas_id: int | None):
+    """Refresh fitur seluruh murid di satu kelas (mis. saat tugas kelas berubah)."""
+    if kelas_id is None:
+        return
+
+    rows = await db.query_raw(KELAS_MURID_QUERY, kelas_id)
+    await refresh_feature_store(db, [r["id"] for r in rows])
+
+
+async def rebuild_feature_store(db) -> int:
+    """Rebuild penuh: hitung ulang fitur seluruh murid."""
+    table = await extract_features(db)
+    await save_feature_table(db, table)
+    return len(table)
+
+
+async def load_feature_table(db, murid_ids: list | None = None) -> FeatureTable:
+    """Membaca vektor fitur yang sudah dihitung dalam satu query."""
+    murid_filter = ""
+    if murid_ids is not None:
+        ids = ", ".join(str(int(i)) for i in murid_ids) or "NULL"
+        murid_filter = f"AND f.murid_id IN ({ids})"
+
+    rows = await db.query_raw(
+        LOAD_QUERY.format(
+            columns=", ".join(f"f.{f}" for f in FEATURES),
+            murid_filter=murid_filter,
+        )
+    )
+
+    columns = {
+        f: np.fromiter((r[f] or 0 for r in rows), dtype=np.float64, count=len(rows))
+        for f in FEATURES
+    }
+    return FeatureTable([r["murid_id"] for r in rows], [r["nama"] for r in rows], columns)
+
+
+# ===============================================================
+# python -m plugin.cluster.feature_store  → rebuild penuh
+# ===============================================================
+if __name__ == "__main__":
+    from generated.prisma import Prisma
+
+    async def _main():
+        db = Prisma()
+        await db.connect()
+        try:
+            total = await rebuild_feature_store(db)
+            print(f"✅ Feature store dibangun ulang untuk {total} murid")
+        finally:
+            await db.disconnect()
+
+    asyncio.run(_main())
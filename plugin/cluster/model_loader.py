@@ -1,12 +1,277 @@
+import asyncio
+import os
 import pickle
+import re
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+from plugin.cluster.feature_schema import FEATURES
 
-MODEL_PATH = "models/MachineLearning/cluster_model.pkl"
-SCALER_PATH = "models/MachineLearning/scaler.pkl"
+MODEL_DIR = "models/MachineLearning"
+MODEL_PATH = f"{MODEL_DIR}/cluster_model.pkl"
+SCALER_PATH = f"{MODEL_DIR}/scaler.pkl"
 
-def load_model():
-    with open(MODEL_PATH, "rb") as f:
+# Versi tambahan: models/MachineLearning/versions/<versi>/{cluster_model,scaler}.pkl
+# Versi "default" = file lama di MODEL_DIR
+VERSIONS_DIR = f"{MODEL_DIR}/versions"
+DEFAULT_VERSION = "default"
+
+# File penunjuk versi aktif, dibagi oleh semua worker uvicorn
+ACTIVE_VERSION_FILE = f"{MODEL_DIR}/ACTIVE_VERSION"
+POINTER_CHECK_SECONDS = 5
+
+VERSION_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+def load_model(path=MODEL_PATH):
+    with open(path, "rb") as f:
         return pickle.load(f)
 
-def load_scaler():
-    with open(SCALER_PATH, "rb") as f:
-        return pickle.load(f)
\ No newline at end of file
+def load_scaler(path=SCALER_PATH):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ModelVersion:
+    """
+    Snapshot immutable satu versi scaler + KMeans.
+    Centroid disimpan sebagai array contiguous untuk perhitungan jarak cepat.
+    """
+
+    def __init__(self, version: str, model, scaler, load_seconds: float):
+        self.version = version
+        self.model = model
+        self.scaler = scaler
+        self.centroids = np.ascontiguousarray(model.cluster_centers_, dtype=np.float64)
+        self.centroid_sq_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+        self.loaded_at = datetime.now(timezone.utc)
+        self.load_seconds = load_seconds
+
+        # Parameter standardisasi untuk jalur cepat NumPy (tanpa overhead validasi sklearn)
+        n_features = len(FEATURES)
+        mean = getattr(scaler, "mean_", None)
+        scale = getattr(scaler, "scale_", None)
+        self.mean = np.ascontiguousarray(mean if mean is not None else np.zeros(n_features), dtype=np.float64)
+        self.scale = np.ascontiguousarray(scale if scale is not None else np.ones(n_features), dtype=np.float64)
+        self.fast_path = hasattr(scaler, "mean_") and self._check_parity()
+
+    def predict_sklearn(self, matrix: np.ndarray) -> np.ndarray:
+        return self.model.predict(self.scaler.transform(matrix))
+
+    def predict_fast(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Standardisasi + centroid terdekat dengan broadcasting NumPy.
+        ||z - c||² = ||z||² - 2·z·c + ||c||²  (||z||² konstan per baris → cukup argmin sisanya)
+        """
+        z = (np.asarray(matrix, dtype=np.float64) - self.mean) / self.scale
+        distances = self.centroid_sq_norms - 2.0 * (z @ self.centroids.T)
+        return distances.argmin(axis=1)
+
+    def predict(self, matrix: np.ndarray) -> np.ndarray:
+        if self.fast_path:
+            return self.predict_fast(matrix)
+        return self.predict_sklearn(matrix)
+
+    def _check_parity(self) -> bool:
+        """Jalur cepat hanya dipakai bila hasilnya identik dengan sklearn pada data uji."""
+        rng = np.random.default_rng(0)
+        centers_raw = self.centroids * self.scale + self.mean
+        probe = np.vstack([
+            centers_raw,
+            self.mean,
+            self.mean + rng.normal(size=(64, len(self.mean))) * self.scale * 2,
+        ])
+        try:
+            same = np.array_equal(self.predict_fast(probe), self.predict_sklearn(probe))
+        except Exception as e:
+            print(f"⚠️ Jalur cepat model '{self.version}' dinonaktifkan:", e)
+            return False
+
+        if not same:
+            print(f"⚠️ Jalur cepat model '{self.version}' tidak sama dengan sklearn, memakai sklearn")
+        return same
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "n_clusters": int(self.centroids.shape[0]),
+            "fast_path": self.fast_path,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+        }
+
+
+# ===============================================================
+# Registry: versi dimuat lazy (bukan saat import), divalidasi sekali,
+# versi aktif ditukar atomik tanpa restart & tanpa menahan request.
+# ===============================================================
+_lock = threading.Lock()
+_versions = {}
+_active = None
+# failed: (versi, mtime pointer) yang gagal dimuat — tidak dicoba ulang sampai pointer berubah
+_pointer = {"version": None, "checked_at": 0.0, "reloading": False, "failed": None}
+_status = {"error": None}
+
+
+def _version_paths(version: str):
+    if version == DEFAULT_VERSION:
+        return MODEL_PATH, SCALER_PATH
+    base = os.path.join(VERSIONS_DIR, version)
+    return os.path.join(base, "cluster_model.pkl"), os.path.join(base, "scaler.pkl")
+
+
+def _validate(model, scaler):
+    n_features = len(FEATURES)
+
+    if getattr(scaler, "n_features_in_", n_features) != n_features:
+        raise ValueError(f"Scaler mengharapkan {scaler.n_features_in_} fitur, schema punya {n_features}")
+
+    centers = getattr(model, "cluster_centers_", None)
+    if centers is None or centers.shape[1] != n_features:
+        raise ValueError("Model cluster tidak memiliki cluster_centers_ yang sesuai FEATURES")
+
+
+def available_versions() -> list:
+    versions = [DEFAULT_VERSION]
+    if os.path.isdir(VERSIONS_DIR):
+        versions += sorted(
+            v for v in os.listdir(VERSIONS_DIR)
+            if VERSION_PATTERN.match(v) and os.path.isdir(os.path.join(VERSIONS_DIR, v))
+        )
+    return versions
+
+
+def load_version(version: str) -> ModelVersion:
+    """Muat (sekali) satu versi model. Blocking — panggil lewat thread dari kode async."""
+    if not VERSION_PATTERN.match(version) or version not in available_versions():
+        raise ValueError(f"Versi model '{version}' tidak ditemukan")
+
+    if version in _versions:
+        return _versions[version]
+
+    with _lock:
+        if version not in _versions:
+            start = time.perf_counter()
+            model_path, scaler_path = _version_paths(version)
+            try:
+                model = load_model(model_path)
+                scaler = load_scaler(scaler_path)
+                _validate(model, scaler)
+            except Exception as e:
+                _status["error"] = f"{version}: {e}"
+                raise
+
+            _versions[version] = ModelVersion(version, model, scaler, round(time.perf_counter() - start, 4))
+            _status["error"] = None
+            print(f"✅ Model cluster versi '{version}' dimuat dalam {_versions[version].load_seconds} detik")
+
+    return _versions[version]
+
+
+def _read_pointer() -> str:
+    try:
+        with open(ACTIVE_VERSION_FILE) as f:
+            return f.read().strip() or DEFAULT_VERSION
+    except FileNotFoundError:
+        return DEFAULT_VERSION
+
+
+def _pointer_mtime() -> float | None:
+    try:
+        return os.stat(ACTIVE_VERSION_FILE).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _write_pointer(version: str):
+    tmp = f"{ACTIVE_VERSION_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(version)
+    os.replace(tmp, ACTIVE_VERSION_FILE)
+
+
+def _reload_in_background(version: str, pointer: tuple):
+    """Worker lain menukar versi → muat di thread, request tetap pakai versi lama sampai siap."""
+
+    def run():
+        global _active
+        try:
+            _active = load_version(version)
+        except Exception as e:
+            print(f"⚠️ Gagal memuat model versi '{version}':", e)
+            _pointer["failed"] = pointer
+        finally:
+            _pointer["reloading"] = False
+
+    _pointer["reloading"] = True
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _check_pointer():
+    now = time.monotonic()
+    if now - _pointer["checked_at"] < POINTER_CHECK_SECONDS:
+        return
+    _pointer["checked_at"] = now
+
+    version = _read_pointer()
+    _pointer["version"] = version
+    pointer = (version, _pointer_mtime())
+    if pointer == _pointer["failed"]:
+        return  # sudah gagal dimuat; tunggu isi / mtime ACTIVE_VERSION berubah
+    if _active is not None and version != _active.version and not _pointer["reloading"]:
+        _reload_in_background(version, pointer)
+
+
+def _load_initial() -> ModelVersion:
+    """Load pertama: versi di ACTIVE_VERSION, atau versi default bila versi itu rusak / hilang."""
+    version = _read_pointer()
+    try:
+        return load_version(version)
+    except Exception as e:
+        if version == DEFAULT_VERSION:
+            raise
+        print(f"⚠️ Gagal memuat model versi '{version}', memakai versi '{DEFAULT_VERSION}':", e)
+        # sama seperti swap yang gagal: tidak dicoba ulang sampai pointer berubah
+        _pointer["failed"] = (version, _pointer_mtime())
+        fallback = load_version(DEFAULT_VERSION)
+        _status["error"] = f"{version}: {e} (memakai versi {DEFAULT_VERSION})"
+        return fallback
+
+
+def get_active_model() -> ModelVersion:
+    """Snapshot versi aktif. Dipakai utuh per panggilan prediksi (konsisten walau ada swap)."""
+    global _active
+
+    if _active is None:
+        _active = _load_initial()
+    else:
+        _check_pointer()
+
+    return _active
+
+
+def activate_version(version: str) -> ModelVersion:
+    """Muat versi lalu jadikan aktif (atomik). Blocking — panggil lewat thread."""
+    global _active
+
+    loaded = load_version(version)
+    _write_pointer(version)
+    _pointer["version"] = version
+    _active = loaded
+    return loaded
+
+
+async def ensure_artifacts_loaded():
+    """Muat versi aktif di thread terpisah agar event loop tidak terblokir saat load pertama."""
+    if _active is None:
+        await asyncio.to_thread(get_active_model)
+
+
+def model_status() -> dict:
+    return {
+        "loaded": _active is not None,
+        "active": _active.info() if _active else None,
+        "loaded_versions": sorted(_versions),
+        "available_versions": available_versions(),
+        "error": _status["error"],
+    }
@@ -1,16 +1,26 @@
 import os
 from dotenv import load_dotenv
-from google import genai
 
 # Load env
 load_dotenv()
-GEMINI_KEY = os.getenv("GEMINI_API_KEY")
 
-if not GEMINI_KEY:
-    raise ValueError("❗ GEMINI_API_KEY tidak ditemukan di .env")
+# Client Gemini dibuat saat pertama kali dipakai (SDK tidak di-import saat startup)
+_client = None
+
+
+def get_client():
+    global _client
+
+    if _client is None:
+        gemini_key = os.getenv("GEMINI_API_KEY")
+        if not gemini_key:
+            raise ValueError("❗ GEMINI_API_KEY tidak ditemukan di .env")
+
+        from google import genai  # SDK BARU
+        _client = genai.Client(api_key=gemini_key)
+
+    return _client
 
-# Client Gemini (SDK BARU)
-client = genai.Client(api_key=GEMINI_KEY)
 
 cluster_desc = {
     0: "Low Performer",
@@ -18,10 +28,10 @@ cluster_desc = {
     2: "High Performer"
 }
 
-def generate_recommendation_ai(student_name, cluster_label, data):
+def build_prompt(student_name, cluster_label, data):
     kategori = cluster_desc.get(cluster_label, "Unknown")
 
-    prompt = f"""
+    return f"""
 Konteks sistem:
 Anda adalah AI asisten untuk guru dalam ekosistem e-learning sekolah.
 Anda bertugas memberikan rekomendasi strategis berdasarkan performa siswa.
@@ -47,12 +57,22 @@ Format jawaban:
 Bahasa: Indonesia.
 """
 
-    response = client.models.generate_content(
+
+def parse_recommendation(text):
+    lines = [x.strip("-• ") for x in text.strip().split("\n") if x.strip()]
+    return lines[:3]
+
+
+def generate_recommendation_ai(student_name, cluster_label, data, llm_client=None):
+    """
+    Panggilan blocking ke LLM. llm_client bisa diganti (mis. client palsu untuk testing)
+    selama punya method models.generate_content(model=..., contents=...).
+    """
+    prompt = build_prompt(student_name, cluster_label, data)
+
+    response = (llm_client or get_client()).models.generate_content(
         model="gemini-2.0-flash",
         contents=prompt,
     )
 
-    text = response.text.strip()
-    lines = [x.strip("-• ") for x in text.split("\n") if x.strip()]
-
-    return lines[:3]
+    return parse_recommendation(response.text)
@@ -0,0 +1,126 @@
+import json
+import os
+from plugin.cluster.model_loader import VERSION_PATTERN
+
+# Retry dengan exponential backoff: BACKOFF_BASE * 2^(attempts-1) detik
+MAX_ATTEMPTS = int(os.getenv("AI_JOB_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE_SECONDS = int(os.getenv("AI_JOB_BACKOFF_SECONDS", "30"))
+
+# Job "Proses" yang tidak selesai dalam waktu ini dianggap worker-nya mati
+STALE_PROCESSING_MINUTES = 10
+
+# Job "Gagal" boleh diantrikan ulang (attempts di-reset) setelah jeda ini,
+# agar murid/profil yang sama tidak terkunci selamanya oleh UNIQUE (murid_id, fitur_hash)
+FAILED_COOLDOWN_MINUTES = int(os.getenv("AI_JOB_FAILED_COOLDOWN_MINUTES", "60"))
+
+ENQUEUE_QUERY = f"""
+INSERT INTO rekomendasi_job (murid_id, fitur_hash, cluster, model_version)
+VALUES {{values}}
+ON CONFLICT (murid_id, fitur_hash) DO UPDATE
+SET status = 'Pending',
+    attempts = 0,
+    cluster = EXCLUDED.cluster,
+    model_version = EXCLUDED.model_version,
+    next_run_at = NOW(),
+    updated_at = NOW()
+WHERE rekomendasi_job.status = 'Gagal'
+  AND rekomendasi_job.updated_at < NOW() - INTERVAL '{FAILED_COOLDOWN_MINUTES} minutes'
+"""
+
+CLAIM_QUERY = f"""
+UPDATE rekomendasi_job
+SET status = 'Proses', attempts = attempts + 1, updated_at = NOW()
+WHERE id IN (
+    SELECT id FROM rekomendasi_job
+    WHERE (status = 'Pending' AND next_run_at <= NOW())
+       OR (status = 'Proses' AND updated_at < NOW() - INTERVAL '{STALE_PROCESSING_MINUTES} minutes')
+    ORDER BY next_run_at
+    LIMIT $1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id, murid_id, fitur_hash, cluster, model_version, attempts
+"""
+
+SAVE_RESULT_QUERY = """
+INSERT INTO rekomendasi_murid (murid_id, fitur_hash, cluster, model_version, rekomendasi, generated_at)
+VALUES ($1, $2, $3, $4, $5, NOW())
+ON CONFLICT (murid_id) DO UPDATE
+SET fitur_hash = EXCLUDED.fitur_hash,
+    cluster = EXCLUDED.cluster,
+    model_version = EXCLUDED.model_version,
+    rekomendasi = EXCLUDED.rekomendasi,
+    generated_at = NOW()
+"""
+
+RETRY_QUERY = """
+UPDATE rekomendasi_job
+SET status = $2,
+    last_error = $3,
+    next_run_at = NOW() + ($4::int * INTERVAL '1 second'),
+    updated_at = NOW()
+WHERE id = $1
+"""
+
+
+async def enqueue_jobs(db, jobs: list) -> int:
+    """
+    jobs: list of (murid_id, fitur_hash, cluster, model_version)
+    Satu INSERT untuk semua job; job yang sudah ada di antrian diabaikan,
+    kecuali job Gagal yang sudah melewati FAILED_COOLDOWN_MINUTES (diantrikan ulang).
+    """
+    if not jobs:
+        return 0
+
+    values = ", ".join(
+        f"({int(murid_id)}, '{fitur_hash}', {'NULL' if cluster is None else int(cluster)}, '{model_version}')"
+        for murid_id, fitur_hash, cluster, model_version in jobs
+        if str(fitur_hash).isalnum() and VERSION_PATTERN.match(str(model_version))
+    )
+    if not values:
+        return 0
+    return await db.execute_raw(ENQUEUE_QUERY.format(values=values))
+
+
+async def claim_jobs(db, batch_size: int) -> list:
+    """Ambil & kunci sejumlah job siap proses (aman untuk banyak worker)."""
+    return await db.query_raw(CLAIM_QUERY, batch_size)
+
+
+async def save_recommendation(db, murid_id: int, fitur_hash: str, cluster, model_version: str, recommendation: list):
+    await db.execute_raw(
+        SAVE_RESULT_QUERY, murid_id, fitur_hash, cluster, model_version, json.dumps(recommendation)
+    )
+
+
+async def complete_job(db, job: dict, recommendation: list):
+    await save_recommendation(
+        db, job["murid_id"], job["fitur_hash"], job["cluster"], job["model_version"], recommendation
+    )
+    await db.rekomendasi_job.delete(where={"id": job["id"]})
+
+
+async def fail_job(db, job: dict, error: str):
+    """Jadwalkan ulang dengan backoff, atau tandai Gagal setelah MAX_ATTEMPTS."""
+    if job["attempts"] >= MAX_ATTEMPTS:
+        await db.execute_raw(RETRY_QUERY, job["id"], "Gagal", error[:500], 0)
+        return
+
+    delay = BACKOFF_BASE_SECONDS * 2 ** (job["attempts"] - 1)
+    await db.execute_raw(RETRY_QUERY, job["id"], "Pending", error[:500], delay)
+
+
+async def load_recommendations(db, murid_ids: list | None = None) -> dict:
+    """{ murid_id: {"fitur_hash", "cluster", "model_version", "recommendation", "generated_at"} } dalam satu query."""
+    where = {"murid_id": {"in": murid_ids}} if murid_ids is not None else {}
+    rows = await db.rekomendasi_murid.find_many(where=where)
+
+    return {
+        r.murid_id: {
+            "fitur_hash": r.fitur_hash,
+            "cluster": r.cluster,
+            "model_version": r.model_version,
+            "recommendation": json.loads(r.rekomendasi),
+            "generated_at": r.generated_at,
+        }
+        for r in rows
+    }
@@ -0,0 +1,135 @@
+import asyncio
+import functools
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from plugin.cluster.feature_schema import FEATURES
+from plugin.recommendation.ai_recommendation import generate_recommendation_ai
+
+# Batas panggilan LLM yang berjalan bersamaan & timeout per panggilan
+MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4"))
+CALL_TIMEOUT = float(os.getenv("AI_TIMEOUT_SECONDS", "20"))
+
+# Cache rekomendasi (LRU) — key: (cluster, vektor fitur dibulatkan)
+CACHE_MAX_SIZE = 2048
+FEATURE_PRECISION = 1
+
+_cache: OrderedDict = OrderedDict()
+_inflight: dict = {}
+_semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+
+def recommendation_key(cluster_label, data: dict) -> str:
+    """Hash konten (cluster + fitur dibulatkan): profil identik → key sama."""
+    vector = [round(float(data.get(f) or 0), FEATURE_PRECISION) for f in FEATURES]
+    raw = json.dumps([cluster_label, vector], separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _cache_get(key):
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    return None
+
+
+def _cache_set(key, value):
+    _cache[key] = value
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_MAX_SIZE:
+        _cache.popitem(last=False)
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def _release_slot(call: asyncio.Future):
+    _semaphore.release()
+    if not call.cancelled():
+        call.exception()  # hasil thread yang sudah timeout tidak memicu warning
+
+
+async def _call_llm(student_name, cluster_label, data, llm_client, timeout):
+    await _semaphore.acquire()
+    try:
+        call = asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(generate_recommendation_ai, student_name, cluster_label, data, llm_client)
+        )
+    except BaseException:
+        _semaphore.release()
+        raise
+
+    # Slot dilepas saat thread benar-benar selesai, bukan saat timeout: thread
+    # yang masih jalan tetap dihitung, jadi panggilan Gemini nyata ≤ MAX_CONCURRENCY
+    call.add_done_callback(_release_slot)
+    return await asyncio.wait_for(asyncio.shield(call), timeout=timeout)
+
+
+async def get_recommendation(
+    student_name,
+    cluster_label,
+    data: dict,
+    llm_client=None,
+    timeout: float = CALL_TIMEOUT,
+    raise_errors: bool = False,
+):
+    """
+    Rekomendasi AI tanpa memblokir event loop:
+    - cache hit → langsung dikembalikan
+    - profil identik yang sedang diproses → menunggu hasil yang sama
+    - selain itu → panggilan LLM di thread, dibatasi semaphore & timeout
+    Gagal / timeout → list kosong (tidak di-cache), atau exception jika raise_errors.
+    Kegagalan juga diteruskan ke semua pemanggil yang menunggu key yang sama.
+    """
+    key = recommendation_key(cluster_label, data)
+
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    if key in _inflight:
+        try:
+            return await asyncio.shield(_inflight[key])
+        except Exception:
+            if raise_errors:
+                raise
+            return []
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+
+    try:
+        result = await _call_llm(student_name, cluster_label, data, llm_client, timeout)
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError):
+            print(f"⚠️ Rekomendasi AI timeout ({timeout}s) untuk cluster {cluster_label}")
+        else:
+            print("⚠️ ERROR saat membuat rekomendasi AI:", e)
+        future.set_exception(e)
+        if raise_errors:
+            raise
+        future.exception()  # tandai sudah diambil (tidak ada warning bila tanpa penunggu)
+        return []
+    except BaseException:
+        future.cancel()  # pemanggil pertama dibatalkan → penunggu ikut dibatalkan
+        raise
+    else:
+        if result:
+            _cache_set(key, result)
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+async def get_recommendations(items: list, llm_client=None, timeout: float = CALL_TIMEOUT) -> list:
+    """
+    items: list of (student_name, cluster_label, data)
+    Dijalankan bersamaan (concurrency dibatasi MAX_CONCURRENCY), urutan hasil = urutan items.
+    """
+    return await asyncio.gather(*[
+        get_recommendation(name, cluster, data, llm_client=llm_client, timeout=timeout)
+        for name, cluster, data in items
+    ])
@@ -0,0 +1,74 @@
+import asyncio
+import os
+from plugin.cluster.feature_store import load_feature_table
+from plugin.recommendation.job_queue import claim_jobs, complete_job, fail_job
+from plugin.recommendation.recommendation_service import get_recommendation
+
+# Jumlah job per batch & jeda saat antrian kosong
+BATCH_SIZE = int(os.getenv("AI_JOB_BATCH_SIZE", "20"))
+IDLE_SLEEP_SECONDS = float(os.getenv("AI_JOB_IDLE_SECONDS", "5"))
+
+
+async def process_batch(db, llm_client=None) -> int:
+    """Ambil satu batch job, buat rekomendasi secara paralel, simpan hasil / jadwalkan retry."""
+    jobs = await claim_jobs(db, BATCH_SIZE)
+    if not jobs:
+        return 0
+
+    table = await load_feature_table(db, murid_ids=[job["murid_id"] for job in jobs])
+    index = {murid_id: i for i, murid_id in enumerate(table.murid_ids)}
+
+    async def run(job):
+        if job["murid_id"] not in index:
+            raise ValueError("Fitur murid tidak ditemukan di feature store")
+        return await get_recommendation(
+            table.nama[index[job["murid_id"]]],
+            job["cluster"],
+            table.row(job["murid_id"]),
+            llm_client=llm_client,
+            raise_errors=True,
+        )
+
+    results = await asyncio.gather(*[run(job) for job in jobs], return_exceptions=True)
+
+    for job, result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            await fail_job(db, job, repr(result))
+        elif not result:
+            # rekomendasi kosong tidak disimpan: hash fitur sama → tidak akan dibuat ulang
+            await fail_job(db, job, "Rekomendasi AI kosong")
+        else:
+            await complete_job(db, job, result)
+
+    return len(jobs)
+
+
+async def run_worker(db, llm_client=None):
+    """Loop worker: kuras antrian terus-menerus, tidur sebentar bila kosong."""
+    print("🤖 Worker rekomendasi AI berjalan")
+    while True:
+        try:
+            processed = await process_batch(db, llm_client=llm_client)
+        except Exception as e:
+            print("⚠️ ERROR worker rekomendasi:", e)
+            processed = 0
+
+        if not processed:
+            await asyncio.sleep(IDLE_SLEEP_SECONDS)
+
+
+# ===============================================================
+# python -m plugin.recommendation.worker
+# ===============================================================
+if __name__ == "__main__":
+    from generated.prisma import Prisma
+
+    async def _main():
+        db = Prisma()
+        await db.connect()
+        try:
+            await run_worker(db)
+        finally:
+            await db.disconnect()
+
+    asyncio.run(_main())
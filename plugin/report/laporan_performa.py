@@ -0,0 +1,219 @@
+import asyncio
+import re
+from datetime import datetime, timedelta
+
+PERIODE = ("Bulanan", "Semester", "Tahunan")
+SEMESTER = ("Ganjil", "Genap")
+TAHUN_AJARAN_PATTERN = re.compile(r"^(\d{4})/(\d{4})$")
+
+# Rata-rata nilai murid di bawah ini → masuk murid_perlu_bimbingan
+KKM = 70
+
+# Generate periode yang sama diserialkan: tanpa lock, dua generate serentak
+# masing-masing hanya menghapus baris di snapshot-nya lalu sama-sama insert
+# (baris ganda). Lock diambil di statement terpisah dalam transaksi yang sama,
+# sehingga GENERATE_QUERY mendapat snapshot baru setelah generate lain commit.
+LOCK_QUERY = "SELECT pg_advisory_xact_lock(hashtext($1))::text AS lock"
+GENERATE_TIMEOUT = timedelta(minutes=5)
+
+# ===============================================================
+# Satu statement: hapus laporan periode yang sama lalu isi ulang
+# dari agregat set-based (atomik, bisa dijalankan berulang; lihat LOCK_QUERY).
+# $1 mulai, $2 selesai, $3 periode, $4 bulan, $5 semester, $6 tahun_ajaran, $7 KKM
+# ===============================================================
+GENERATE_QUERY = """
+WITH hapus AS (
+    DELETE FROM laporan_performa
+    WHERE periode = $3
+      AND tahun_ajaran = $6
+      AND bulan IS NOT DISTINCT FROM $4::int
+      AND semester IS NOT DISTINCT FROM $5::varchar
+),
+tugas_p AS (
+    SELECT id, kelas_id, mata_pelajaran_id FROM tugas
+    WHERE created_at >= $1::timestamp AND created_at < $2::timestamp
+      AND kelas_id IS NOT NULL AND mata_pelajaran_id IS NOT NULL
+),
+quiz_p AS (
+    SELECT id, kelas_id, mata_pelajaran_id FROM quiz
+    WHERE COALESCE(tanggal_mulai, created_at) >= $1::timestamp
+      AND COALESCE(tanggal_mulai, created_at) < $2::timestamp
+      AND kelas_id IS NOT NULL AND mata_pelajaran_id IS NOT NULL
+),
+absensi_p AS (
+    SELECT kelas_id, mata_pelajaran_id, status FROM absensi
+    WHERE tanggal >= $1::timestamp AND tanggal < $2::timestamp
+      AND kelas_id IS NOT NULL AND mata_pelajaran_id IS NOT NULL
+),
+grup AS (
+    SELECT kelas_id, mata_pelajaran_id FROM tugas_p
+    UNION
+    SELECT kelas_id, mata_pelajaran_id FROM quiz_p
+    UNION
+    SELECT kelas_id, mata_pelajaran_id FROM absensi_p
+),
+murid_kelas AS (
+    SELECT kelas_id, COUNT(*) AS total_murid FROM murid
+    WHERE kelas_id IS NOT NULL
+    GROUP BY kelas_id
+),
+kehadiran AS (
+    SELECT kelas_id, mata_pelajaran_id,
+           COUNT(*) FILTER (WHERE status = 'Hadir') * 100.0 / COUNT(*) AS persen
+    FROM absensi_p
+    GROUP BY kelas_id, mata_pelajaran_id
+),
+tugas_agg AS (
+    SELECT t.kelas_id, t.mata_pelajaran_id,
+           COUNT(DISTINCT t.id) AS total_tugas,
+           AVG(p.nilai) AS rata_nilai
+    FROM tugas_p t
+    LEFT JOIN pengumpulan_tugas p ON p.tugas_id = t.id
+    GROUP BY t.kelas_id, t.mata_pelajaran_id
+),
+pengumpulan_agg AS (
+    -- satu murid dihitung sekali per tugas walau mengumpulkan ulang
+    SELECT t.kelas_id, t.mata_pelajaran_id, COUNT(DISTINCT (p.tugas_id, p.murid_id)) AS total_kumpul
+    FROM tugas_p t
+    JOIN pengumpulan_tugas p ON p.tugas_id = t.id
+    WHERE p.murid_id IS NOT NULL
+    GROUP BY t.kelas_id, t.mata_pelajaran_id
+),
+quiz_agg AS (
+    SELECT q.kelas_id, q.mata_pelajaran_id,
+           COUNT(DISTINCT q.id) AS total_quiz,
+           AVG(h.score) AS rata_quiz
+    FROM quiz_p q
+    LEFT JOIN hasil_quiz h ON h.quiz_id = q.id
+    GROUP BY q.kelas_id, q.mata_pelajaran_id
+),
+skor_murid AS (
+    SELECT kelas_id, mata_pelajaran_id, murid_id, AVG(nilai) AS skor
+    FROM (
+        SELECT q.kelas_id, q.mata_pelajaran_id, h.murid_id, h.score AS nilai
+        FROM quiz_p q JOIN hasil_quiz h ON h.quiz_id = q.id
+        UNION ALL
+        SELECT t.kelas_id, t.mata_pelajaran_id, p.murid_id, p.nilai
+        FROM tugas_p t JOIN pengumpulan_tugas p ON p.tugas_id = t.id
+    ) nilai_murid
+    WHERE murid_id IS NOT NULL AND nilai IS NOT NULL
+    GROUP BY kelas_id, mata_pelajaran_id, murid_id
+),
+terbaik AS (
+    SELECT DISTINCT ON (kelas_id, mata_pelajaran_id) kelas_id, mata_pelajaran_id, murid_id
+    FROM skor_murid
+    ORDER BY kelas_id, mata_pelajaran_id, skor DESC, murid_id
+),
+bimbingan AS (
+    SELECT kelas_id, mata_pelajaran_id, json_agg(murid_id ORDER BY murid_id)::text AS murid_ids
+    FROM skor_murid
+    WHERE skor < $7::float8
+    GROUP BY kelas_id, mata_pelajaran_id
+)
+INSERT INTO laporan_performa (
+    kelas_id, mata_pelajaran_id, guru_id, periode, bulan, semester, tahun_ajaran,
+    total_murid, rata_rata_nilai, rata_rata_kehadiran, total_tugas_diberikan,
+    persentase_pengumpulan, total_quiz_diberikan, rata_rata_quiz,
+    murid_terbaik_id, murid_perlu_bimbingan, generated_at
+)
+SELECT
+    g.kelas_id, g.mata_pelajaran_id, mp.guru_id, $3, $4::int, $5::varchar, $6,
+    COALESCE(mk.total_murid, 0),
+    ROUND(ta.rata_nilai::numeric, 2),
+    ROUND(kh.persen::numeric, 2),
+    COALESCE(ta.total_tugas, 0),
+    ROUND(LEAST(COALESCE(pa.total_kumpul, 0) * 100.0 / NULLIF(ta.total_tugas * mk.total_murid, 0), 100), 2),
+    COALESCE(qa.total_quiz, 0),
+    ROUND(qa.rata_quiz::numeric, 2),
+    tb.murid_id,
+    COALESCE(bb.murid_ids, '[]'),
+    NOW()
+FROM grup g
+LEFT JOIN mata_pelajaran mp ON mp.id = g.mata_pelajaran_id
+LEFT JOIN murid_kelas mk ON mk.kelas_id = g.kelas_id
+LEFT JOIN kehadiran kh ON kh.kelas_id = g.kelas_id AND kh.mata_pelajaran_id = g.mata_pelajaran_id
+LEFT JOIN tugas_agg ta ON ta.kelas_id = g.kelas_id AND ta.mata_pelajaran_id = g.mata_pelajaran_id
+LEFT JOIN pengumpulan_agg pa ON pa.kelas_id = g.kelas_id AND pa.mata_pelajaran_id = g.mata_pelajaran_id
+LEFT JOIN quiz_agg qa ON qa.kelas_id = g.kelas_id AND qa.mata_pelajaran_id = g.mata_pelajaran_id
+LEFT JOIN terbaik tb ON tb.kelas_id = g.kelas_id AND tb.mata_pelajaran_id = g.mata_pelajaran_id
+LEFT JOIN bimbingan bb ON bb.kelas_id = g.kelas_id AND bb.mata_pelajaran_id = g.mata_pelajaran_id
+"""
+
+
+def period_range(periode: str, tahun_ajaran: str, bulan: int | None = None, semester: str | None = None):
+    """
+    Rentang [mulai, selesai) suatu periode dalam tahun ajaran "2025/2026":
+    Ganjil = Juli–Desember tahun pertama, Genap = Januari–Juni tahun kedua.
+    """
+    match = TAHUN_AJARAN_PATTERN.match(tahun_ajaran or "")
+    if not match:
+        raise ValueError("tahun_ajaran harus berformat YYYY/YYYY, misal 2025/2026")
+    tahun_awal, tahun_akhir = int(match.group(1)), int(match.group(2))
+
+    if periode not in PERIODE:
+        raise ValueError(f"periode harus salah satu dari {', '.join(PERIODE)}")
+
+    if periode == "Bulanan":
+        if not bulan or not 1 <= bulan <= 12:
+            raise ValueError("bulan (1-12) wajib untuk periode Bulanan")
+        tahun = tahun_awal if bulan >= 7 else tahun_akhir
+        mulai = datetime(tahun, bulan, 1)
+        selesai = datetime(tahun + 1, 1, 1) if bulan == 12 else datetime(tahun, bulan + 1, 1)
+        return mulai, selesai
+
+    if periode == "Semester":
+        if semester not in SEMESTER:
+            raise ValueError("semester (Ganjil/Genap) wajib untuk periode Semester")
+        if semester == "Ganjil":
+            return datetime(tahun_awal, 7, 1), datetime(tahun_akhir, 1, 1)
+        return datetime(tahun_akhir, 1, 1), datetime(tahun_akhir, 7, 1)
+
+    return datetime(tahun_awal, 7, 1), datetime(tahun_akhir, 7, 1)
+
+
+async def generate_laporan(db, periode: str, tahun_ajaran: str, bulan: int | None = None,
+                           semester: str | None = None) -> int:
+    """
+    Hitung ulang laporan_performa untuk satu periode (per kelas × mata pelajaran)
+    dan simpan; laporan lama periode yang sama diganti. Return: jumlah baris.
+    """
+    mulai, selesai = period_range(periode, tahun_ajaran, bulan, semester)
+
+    # field yang tidak relevan dengan periode disimpan NULL agar kunci periode konsisten
+    if periode != "Bulanan":
+        bulan = None
+    if periode != "Semester":
+        semester = None
+
+    lock_key = f"laporan_performa:{periode}:{tahun_ajaran}:{bulan}:{semester}"
+    async with db.tx(timeout=GENERATE_TIMEOUT) as tx:
+        await tx.query_raw(LOCK_QUERY, lock_key)
+        return await tx.execute_raw(
+            GENERATE_QUERY,
+            mulai.isoformat(), selesai.isoformat(), periode, bulan, semester, tahun_ajaran, KKM,
+        )
+
+
+# ===============================================================
+# python -m plugin.report.laporan_performa Bulanan 2025/2026 9
+# python -m plugin.report.laporan_performa Semester 2025/2026 Ganjil
+# ===============================================================
+if __name__ == "__main__":
+    import sys
+    from generated.prisma import Prisma
+
+    async def _main(args):
+        periode, tahun_ajaran = args[0], args[1]
+        extra = args[2] if len(args) > 2 else None
+        bulan = int(extra) if periode == "Bulanan" and extra else None
+        semester = extra if periode == "Semester" else None
+
+        db = Prisma()
+        await db.connect()
+        try:
+            total = await generate_laporan(db, periode, tahun_ajaran, bulan, semester)
+            print(f"✅ {total} baris laporan_performa dibuat untuk {periode} {tahun_ajaran} {extra or ''}")
+        finally:
+            await db.disconnect()
+
+    asyncio.run(_main(sys.argv[1:]))
@@ -2,15 +2,23 @@
 # 📘 routes/absensi_routes.py — Manajemen Absensi (RBAC Protected)
 # ===============================================================
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
 from core.permissions import authorize_access
+from plugin.cluster.feature_store import refresh_feature_store
 from main import db
+from core.cache import touch
+from core.principal import get_guru, get_murid
+from core.pagination import PageParams, filter_where, paginate
+from core.export import export_filters, export_response
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Absensi"],
-    dependencies=[Depends(authorize_access)]  # ✅ Semua endpoint butuh JWT
+    dependencies=[Depends(authorize_access)],  # ✅ Semua endpoint butuh JWT
+    route_class=ORJSONRoute,
 )
 
 
@@ -30,20 +38,22 @@ class AbsensiCreate(BaseModel):
 # 🧩 CREATE — Tambah Data Absensi (Hanya Guru)
 # ===============================================================
 @router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_absensi(data: AbsensiCreate, user=Depends(authorize_access)):
+async def create_absensi(data: AbsensiCreate, background_tasks: BackgroundTasks, user=Depends(authorize_access)):
     role = user.get("role")
 
     if role != "Guru":
         raise HTTPException(status_code=403, detail="❌ Hanya Guru yang dapat membuat absensi")
 
     # Isi guru_id otomatis dari akun guru login
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
     data.guru_id = guru.id
 
     try:
         created = await db.absensi.create(data=data.dict())
+        touch("absensi")
+        background_tasks.add_task(refresh_feature_store, db, [created.murid_id])
         return {"message": "✅ Absensi berhasil dibuat", "data": created}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal membuat absensi: {str(e)}")
@@ -52,14 +62,27 @@ async def create_absensi(data: AbsensiCreate, user=Depends(authorize_access)):
 # 📜 READ — Ambil Semua Data Absensi
 # ===============================================================
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_absensi(user=Depends(authorize_access)):
+async def get_all_absensi(
+    page: PageParams = Depends(),
+    kelas_id: Optional[int] = None,
+    mata_pelajaran_id: Optional[int] = None,
+    murid_id: Optional[int] = None,
+    dari: Optional[date] = None,
+    sampai: Optional[date] = None,
+    user=Depends(authorize_access),
+):
     role = user.get("role")
 
     try:
         # Guru dan Admin boleh melihat semua absensi
         if role in ["Guru", "Admin"]:
-            absensi_list = await db.absensi.find_many(
-                include={"murid": True, "kelas": True, "mata_pelajaran": True, "guru": True}
+            where = filter_where(
+                date_field="tanggal", dari=dari, sampai=sampai,
+                kelas_id=kelas_id, mata_pelajaran_id=mata_pelajaran_id, murid_id=murid_id,
+            )
+            return await paginate(
+                db.absensi, page, where=where,
+                include={"murid": True, "kelas": True, "mata_pelajaran": True, "guru": True},
             )
 
         # Murid tidak boleh akses semua data absensi
@@ -69,11 +92,52 @@ async def get_all_absensi(user=Depends(authorize_access)):
         else:
             raise HTTPException(status_code=403, detail="❌ Akses ditolak")
 
-        return {"total": len(absensi_list), "data": absensi_list}
-
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal mengambil data absensi: {str(e)}")
 
+# ===============================================================
+# 📤 EXPORT — Seluruh Absensi sebagai stream NDJSON / CSV (Guru & Admin)
+# ===============================================================
+EXPORT_QUERY = """
+SELECT a.id, a.tanggal, a.status, a.keterangan,
+       a.murid_id, m.nama AS murid,
+       a.kelas_id, k.nama_kelas AS kelas,
+       a.mata_pelajaran_id, mp.nama_mapel AS mata_pelajaran,
+       a.guru_id, g.nama AS guru
+FROM absensi a
+LEFT JOIN murid m ON m.id = a.murid_id
+LEFT JOIN kelas k ON k.id = a.kelas_id
+LEFT JOIN mata_pelajaran mp ON mp.id = a.mata_pelajaran_id
+LEFT JOIN guru g ON g.id = a.guru_id
+WHERE a.id > $1{filters}
+ORDER BY a.id
+LIMIT {batch_size}
+"""
+
+EXPORT_COLUMNS = [
+    "id", "tanggal", "status", "keterangan", "murid_id", "murid", "kelas_id", "kelas",
+    "mata_pelajaran_id", "mata_pelajaran", "guru_id", "guru",
+]
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_absensi(
+    format: str = "ndjson",
+    kelas_id: Optional[int] = None,
+    mata_pelajaran_id: Optional[int] = None,
+    dari: Optional[date] = None,
+    sampai: Optional[date] = None,
+    user=Depends(authorize_access),
+):
+    if user.get("role") not in ["Guru", "Admin"]:
+        raise HTTPException(status_code=403, detail="❌ Hanya Guru dan Admin yang dapat export absensi")
+
+    filters, args = export_filters(
+        "a", date_field="tanggal", dari=dari, sampai=sampai,
+        kelas_id=kelas_id, mata_pelajaran_id=mata_pelajaran_id,
+    )
+    return export_response(db, EXPORT_QUERY, filters, args, EXPORT_COLUMNS, format, "absensi")
+
 # ===============================================================
 # 🔍 READ — Ambil Absensi Berdasarkan ID
 # ===============================================================
@@ -91,7 +155,7 @@ async def get_absensi_by_id(id: int, user=Depends(authorize_access)):
 
     # Murid hanya boleh melihat absensinya sendiri
     if role == "Murid":
-        murid = await db.murid.find_unique(where={"email": user["sub"]})
+        murid = await get_murid(db, user["sub"])
         if not murid or absensi.murid_id != murid.id:
             raise HTTPException(status_code=403, detail="❌ Tidak boleh melihat absensi milik orang lain")
 
@@ -102,7 +166,7 @@ async def get_absensi_by_id(id: int, user=Depends(authorize_access)):
 # ✏️ UPDATE — Ubah Data Absensi (Hanya Guru)
 # ===============================================================
 @router.put("/{id}", status_code=status.HTTP_200_OK)
-async def update_absensi(id: int, data: AbsensiCreate, user=Depends(authorize_access)):
+async def update_absensi(id: int, data: AbsensiCreate, background_tasks: BackgroundTasks, user=Depends(authorize_access)):
     role = user.get("role")
 
     if role != "Guru":
@@ -114,6 +178,8 @@ async def update_absensi(id: int, data: AbsensiCreate, user=Depends(authorize_ac
 
     try:
         updated = await db.absensi.update(where={"id": id}, data=data.dict())
+        touch("absensi")
+        background_tasks.add_task(refresh_feature_store, db, [existing.murid_id, updated.murid_id])
         return {"message": "✅ Absensi berhasil diperbarui", "data": updated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal memperbarui absensi: {str(e)}")
@@ -122,7 +188,7 @@ async def update_absensi(id: int, data: AbsensiCreate, user=Depends(authorize_ac
 # 🗑️ DELETE — Hapus Data Absensi (Hanya Guru)
 # ===============================================================
 @router.delete("/{id}", status_code=status.HTTP_200_OK)
-async def delete_absensi(id: int, user=Depends(authorize_access)):
+async def delete_absensi(id: int, background_tasks: BackgroundTasks, user=Depends(authorize_access)):
     role = user.get("role")
 
     if role != "Guru":
@@ -134,6 +200,8 @@ async def delete_absensi(id: int, user=Depends(authorize_access)):
 
     try:
         await db.absensi.delete(where={"id": id})
+        touch("absensi")
+        background_tasks.add_task(refresh_feature_store, db, [existing.murid_id])
         return {"message": "🗑️ Absensi berhasil dihapus"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal menghapus absensi: {str(e)}")
\ No newline at end of file
@@ -2,11 +2,13 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel, EmailStr, Field
 from core.permissions import authorize_access, check_permission
+from core.responses import ORJSONRoute
 from main import db
 
 router = APIRouter(
     tags=["Admin"],
-    dependencies=[Depends(authorize_access)]  
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 # SCHEMA: Data Admin
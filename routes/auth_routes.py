@@ -1,12 +1,17 @@
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel, EmailStr
 from main import db
-from core.auth import hash_password, verify_password, create_access_token
+from core.cache import touch
+from core.auth import hash_password_async, verify_password_async, create_access_token, password_pool_stats
 from core.security import get_current_user
+from core.accounts import find_account, account_email_exists
+from core.principal import invalidate_principal
+from core.responses import ORJSONRoute
+from plugin.cluster.feature_store import refresh_feature_store
 from datetime import date, datetime
 
-router = APIRouter(tags=["Authentication"])
+router = APIRouter(tags=["Authentication"], route_class=ORJSONRoute)
 
 # ======================================================
 # 🧩 SCHEMAS
@@ -55,19 +60,7 @@ class CompleteMuridProfile(BaseModel):
 
 async def email_exists(email: str) -> bool:
     try:
-        admin = await db.admin.find_unique(where={"email": email})
-        if admin:
-            return True
-
-        guru = await db.guru.find_unique(where={"email": email})
-        if guru:
-            return True
-
-        murid = await db.murid.find_unique(where={"email": email})
-        if murid:
-            return True
-
-        return False
+        return await account_email_exists(db, email)
 
     except Exception as e:
         print("❌ email_exists error:", e)
@@ -91,7 +84,7 @@ async def register_admin(data: RegisterBase):
         data={
             "nama": data.nama,
             "email": data.email,
-            "password": hash_password(data.password),
+            "password": await hash_password_async(data.password),
             "role": "Admin",
             "status": "Aktif",
         }
@@ -121,7 +114,7 @@ async def register_guru(data: RegisterBase):
         data={
             "nama": data.nama,
             "email": data.email,
-            "password": hash_password(data.password),
+            "password": await hash_password_async(data.password),
             "role": "Guru",
             "status": "Aktif",
         }
@@ -151,12 +144,13 @@ async def register_murid(data: RegisterBase):
         data={
             "nama": data.nama,
             "email": data.email,
-            "password": hash_password(data.password),
+            "password": await hash_password_async(data.password),
             "role": "Murid",
             "is_verified": False,
             "status": "Aktif",
         }
     )
+    touch("murid")
 
     registration_token = create_access_token({
         "sub": murid.email,
@@ -178,6 +172,7 @@ async def register_murid(data: RegisterBase):
 @router.put("/murid/complete-profile")
 async def complete_murid_profile(
     data: CompleteMuridProfile,
+    background_tasks: BackgroundTasks,
     current_user=Depends(get_current_user),
 ):
     if current_user["role"] != "Murid-Registration":
@@ -214,6 +209,11 @@ async def complete_murid_profile(
             "no_telepon_ortu": data.no_telepon_ortu,
         },
     )
+    touch("murid")
+    invalidate_principal(murid.email)
+    if data.kelas_id != murid.kelas_id:
+        # fitur tugas mengikuti kelas murid
+        background_tasks.add_task(refresh_feature_store, db, [murid.id])
 
     return {
         "message": "Data lengkap ✅ Menunggu verifikasi guru ⏳"
@@ -224,30 +224,35 @@ async def complete_murid_profile(
 # ======================================================
 @router.post("/login")
 async def login_user(data: LoginUser):
-    admin = await db.admin.find_unique(where={"email": data.email})
-    guru = await db.guru.find_unique(where={"email": data.email})
-    murid = await db.murid.find_unique(where={"email": data.email})
-
-    if admin:
-        user, role = admin, "Admin"
-    elif guru:
-        user, role = guru, "Guru"
-    elif murid:
-        user, role = murid, "Murid"
-        if not user.is_verified:
-            raise HTTPException(403, "Akun belum diverifikasi oleh guru")
-    else:
+    account = await find_account(db, data.email)
+
+    if not account:
         raise HTTPException(404, "Email tidak ditemukan")
 
-    if not verify_password(data.password, user.password):
+    role = account["role"]
+    if role == "Murid" and not account["is_verified"]:
+        raise HTTPException(403, "Akun belum diverifikasi oleh guru")
+
+    if not await verify_password_async(data.password, account["password"]):
         raise HTTPException(401, "Password salah")
 
-    token = create_access_token({"sub": user.email, "role": role})
+    token = create_access_token({"sub": account["email"], "role": role})
 
     return {
         "message": "Login berhasil",
         "access_token": token,
         "token_type": "bearer",
         "role": role,
-        "user": {"nama": user.nama, "email": user.email},
+        "user": {"nama": account["nama"], "email": account["email"]},
     }
+
+
+# ======================================================
+# 📊 STATUS POOL HASHING PASSWORD (ADMIN)
+# ======================================================
+@router.get("/password-pool")
+async def get_password_pool_stats(current_user=Depends(get_current_user)):
+    if current_user["role"] != "Admin":
+        raise HTTPException(status_code=403, detail="Akses khusus Admin")
+
+    return password_pool_stats()
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from main import db
+from core.principal import get_murid
 from core.permissions import authorize_access
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     prefix="/murid",
     tags=["Beranda Murid"],
-    dependencies=[Depends(authorize_access)]
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 @router.get("/beranda")
@@ -14,9 +17,7 @@ async def beranda_murid(user=Depends(authorize_access)):
     if user["role"] != "Murid":
         raise HTTPException(status_code=403, detail="Akses ditolak")
 
-    murid = await db.murid.find_unique(
-        where={"email": user["sub"]}
-    )
+    murid = await get_murid(db, user["sub"])
 
     if not murid:
         raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
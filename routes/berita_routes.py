@@ -1,13 +1,18 @@
 # routes/berita_routes.py — Manajemen Berita (RBAC Protected)
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
 from core.permissions import authorize_access
 from main import db
+from core.pagination import PageParams, filter_where, paginate
+from core.etag import conditional_get
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Berita"],
-    dependencies=[Depends(authorize_access)]  
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 # SCHEMA: Data Berita
@@ -33,13 +38,23 @@ async def create_berita(berita: BeritaCreate):
 
 # READ — Ambil Semua Berita
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_berita():
+async def get_all_berita(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    kategori: Optional[str] = None,
+    dari: Optional[date] = None,
+    sampai: Optional[date] = None,
+):
     try:
-        berita_list = await db.berita.find_many(
-            include={"admin": True},
-            order={"created_at": "desc"}
-        )
-        return {"total": len(berita_list), "data": berita_list}
+        # tidak ada perubahan sejak ETag klien → 304 tanpa find_many
+        not_modified = await conditional_get(request, response, db, ("berita", "admin"))
+        if not_modified:
+            return not_modified
+
+        # id naik seiring created_at → urutan id DESC = terbaru dulu
+        where = filter_where(dari=dari, sampai=sampai, kategori=kategori)
+        return await paginate(db.berita, page, where=where, include={"admin": True})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal mengambil berita: {str(e)}")
 
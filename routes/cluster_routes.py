@@ -1,11 +1,19 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from datetime import datetime
 from core.permissions import authorize_access, check_permission
-from plugin.cluster.cluster_predictor import predict_cluster_for_student
-from plugin.recommendation.ai_recommendation import generate_recommendation_ai
+from core.responses import ORJSONRoute
+from plugin.cluster.cluster_predictor import predict_cluster_table
+from plugin.cluster.model_loader import activate_version, ensure_artifacts_loaded, get_active_model, model_status
+from plugin.cluster.feature_store import load_feature_table, rebuild_feature_store, refresh_feature_store
+from plugin.recommendation.recommendation_service import get_recommendation, recommendation_key
+from plugin.recommendation.job_queue import enqueue_jobs, load_recommendations, save_recommendation
 from main import db
 
 router = APIRouter(
-    tags=["Cluster"]
+    tags=["Cluster"],
+    route_class=ORJSONRoute,
 )
 
 # =============================
@@ -19,48 +27,56 @@ async def get_cluster(user=Depends(authorize_access)):
     if user["role"] != "Guru":
         raise HTTPException(status_code=403, detail="❌ Akses khusus Guru")
 
-    murid = await db.murid.find_many(include={"rapor": True})
+    # 1️⃣ baca vektor fitur yang sudah dihitung (feature store)
+    table = await load_feature_table(db)
+    if len(table) == 0:
+        # feature store belum pernah diisi → bangun sekali
+        await rebuild_feature_store(db)
+        table = await load_feature_table(db)
+
+    # 2️⃣ prediksi cluster sekali jalan untuk seluruh murid
+    await ensure_artifacts_loaded()
+    model = get_active_model()
+    clusters = predict_cluster_table(table, model)
+    has_data = table.has_data()
+
+    # lewati murid yang belum punya data sama sekali
+    rows = [
+        (i, murid_id, table.row(murid_id))
+        for i, murid_id in enumerate(table.murid_ids)
+        if has_data[i]
+    ]
+
+    # 3️⃣ rekomendasi tersimpan (dibuat worker), yang basi masuk antrian
+    stored = await load_recommendations(db)
 
     output = []
-    for m in murid:
-        rapor = m.rapor[0] if m.rapor else None
-        if not rapor:
-            continue
-
-        data = {
-            "nilai_akhir": rapor.nilai_akhir or 0,
-            "nilai_tugas": rapor.nilai_tugas or 0,
-            "nilai_quiz": rapor.nilai_quiz or 0,
-            "nilai_uts": rapor.nilai_uts or 0,
-            "nilai_uas": rapor.nilai_uas or 0,
-            "total_hadir": 110,
-            "total_alpha": 3,
-            "total_izin": 2,
-            "tingkat_kehadiran": 93.5,
-            "jumlah_tugas": 12,
-            "persentase_pengumpulan": 90,
-            "total_quiz": 6,
-            "rata_nilai_quiz": rapor.nilai_quiz or 0,
-            "total_aktivitas": 20,
-            "total_durasi_belajar": 300
-        }
-
-        cluster = predict_cluster_for_student(data)
-        recommendation = generate_recommendation_ai(
-            student_name=m.nama,
-            cluster_label=cluster,
-            data=data
-        )
+    stale_jobs = []
+    for i, murid_id, data in rows:
+        cluster = clusters[murid_id]
+        fitur_hash = recommendation_key(cluster, data)
+        rec = stored.get(murid_id)
+        fresh = rec is not None and rec["fitur_hash"] == fitur_hash
+
+        if not fresh:
+            stale_jobs.append((murid_id, fitur_hash, cluster, model.version))
 
         output.append({
-            "murid_id": m.id,
-            "nama": m.nama,
+            "murid_id": murid_id,
+            "nama": table.nama[i],
             "cluster": cluster,
-            "recommendation": recommendation  # <-- list of 3 items
+            "model_version": model.version,
+            "recommendation": rec["recommendation"] if rec else [],  # <-- list of 3 items
+            "generated_at": rec["generated_at"] if rec else None,
+            "fresh": fresh
         })
 
+    await enqueue_jobs(db, stale_jobs)
+
     return {
         "count": len(output),
+        "queued": len(stale_jobs),
+        "model_version": model.version,
         "data": output
     }
 
@@ -76,46 +92,83 @@ async def get_cluster_by_id(id: int, user=Depends(authorize_access)):
     if user["role"] != "Guru":
         raise HTTPException(status_code=403, detail="❌ Akses khusus Guru")
 
-    murid = await db.murid.find_unique(
-        where={"id": id},
-        include={"rapor": True}
-    )
+    table = await load_feature_table(db, murid_ids=[id])
+    if id not in table:
+        # belum ada di feature store → hitung sekarang
+        await refresh_feature_store(db, [id])
+        table = await load_feature_table(db, murid_ids=[id])
 
-    if not murid:
+    if id not in table:
         raise HTTPException(status_code=404, detail="❌ Murid tidak ditemukan")
 
-    rapor = murid.rapor[0] if murid.rapor else None
-    if not rapor:
-        raise HTTPException(status_code=404, detail="❌ Murid ini belum memiliki data rapor")
-
-    data = {
-        "nilai_akhir": rapor.nilai_akhir or 0,
-        "nilai_tugas": rapor.nilai_tugas or 0,
-        "nilai_quiz": rapor.nilai_quiz or 0,
-        "nilai_uts": rapor.nilai_uts or 0,
-        "nilai_uas": rapor.nilai_uas or 0,
-        "total_hadir": 110,
-        "total_alpha": 3,
-        "total_izin": 2,
-        "tingkat_kehadiran": 93.5,
-        "jumlah_tugas": 12,
-        "persentase_pengumpulan": 90,
-        "total_quiz": 6,
-        "rata_nilai_quiz": rapor.nilai_quiz or 0,
-        "total_aktivitas": 20,
-        "total_durasi_belajar": 300
+    if not table.has_data()[0]:
+        raise HTTPException(status_code=404, detail="❌ Murid ini belum memiliki data belajar")
+
+    await ensure_artifacts_loaded()
+    model = get_active_model()
+    data = table.row(id)
+    cluster = predict_cluster_table(table, model)[id]
+    fitur_hash = recommendation_key(cluster, data)
+
+    # pakai rekomendasi tersimpan bila masih sesuai dengan fitur terkini
+    rec = (await load_recommendations(db, murid_ids=[id])).get(id)
+    if rec and rec["fitur_hash"] == fitur_hash:
+        recommendation = rec["recommendation"]
+        generated_at = rec["generated_at"]
+    else:
+        recommendation = await get_recommendation(
+            student_name=table.nama[0],
+            cluster_label=cluster,
+            data=data
+        )
+        generated_at = None
+        if recommendation:
+            await save_recommendation(db, id, fitur_hash, cluster, model.version, recommendation)
+            generated_at = datetime.utcnow()
+
+    return {
+        "murid_id": id,
+        "nama": table.nama[0],
+        "cluster": cluster,
+        "model_version": model.version,
+        "recommendation": recommendation,
+        "generated_at": generated_at
     }
 
-    cluster = predict_cluster_for_student(data)
-    recommendation = generate_recommendation_ai(
-        student_name=murid.nama,
-        cluster_label=cluster,
-        data=data
-    )
+
+# =============================
+# 🔥 STATUS MODEL (READINESS)
+# =============================
+@router.get("/model")
+async def get_model_status(user=Depends(authorize_access)):
+
+    check_permission(user, "cluster")
+
+    return model_status()
+
+
+# =============================
+# 🔁 GANTI VERSI MODEL AKTIF (ADMIN)
+# =============================
+class ActivateModel(BaseModel):
+    version: str
+
+
+@router.put("/model/active")
+async def set_active_model(data: ActivateModel, user=Depends(authorize_access)):
+
+    if user["role"] != "Admin":
+        raise HTTPException(status_code=403, detail="❌ Hanya Admin yang boleh mengganti versi model")
+
+    try:
+        # load di thread → request lain tetap dilayani versi lama sampai swap
+        loaded = await asyncio.to_thread(activate_version, data.version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Gagal memuat model: {str(e)}")
 
     return {
-        "murid_id": murid.id,
-        "nama": murid.nama,
-        "cluster": cluster,
-        "recommendation": recommendation
+        "message": "✅ Versi model aktif diperbarui",
+        "data": loaded.info()
     }
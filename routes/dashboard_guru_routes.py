@@ -1,13 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException
 from main import db
+from core.cache import TTLCache, table_versions
+from core.principal import get_guru
 from core.security import get_current_user
 from core.permissions import authorize_access
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Dashboard Guru"],
-    dependencies=[Depends(authorize_access)]  
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
+# Semua angka dashboard dalam satu query (agregat dihitung di database)
+DASHBOARD_QUERY = """
+SELECT
+    (SELECT COUNT(*)::int FROM murid m JOIN kelas k ON k.id = m.kelas_id
+      WHERE k.wali_kelas_id = $1)                                   AS jumlah_murid,
+    (SELECT COUNT(*)::int FROM materi WHERE guru_id = $1)           AS jumlah_materi,
+    (SELECT COUNT(*)::int FROM tugas WHERE guru_id = $1)            AS jumlah_tugas,
+    (SELECT COUNT(*)::int FROM murid WHERE is_verified = FALSE)     AS murid_pending,
+    (SELECT AVG(nilai_akhir)::float8 FROM rapor WHERE guru_id = $1) AS rata_nilai,
+    (SELECT (COUNT(*) FILTER (WHERE status = 'Hadir') * 100.0
+             / NULLIF(COUNT(*), 0))::float8
+       FROM absensi WHERE guru_id = $1)                             AS kehadiran
+"""
+
+# Cache per guru: basi bila TTL habis atau salah satu tabel sumber berubah
+# (touch() di proses ini). rapor tidak ditulis oleh route aplikasi (tidak ada
+# touch("rapor")), jadi rata_nilai hanya segar per TTL — maksimal 30 detik basi.
+DASHBOARD_TTL_SECONDS = 30
+DASHBOARD_TABLES = ("murid", "kelas", "materi", "tugas", "absensi")
+
+_dashboard_cache = TTLCache(max_size=1024, ttl=DASHBOARD_TTL_SECONDS)
+
 # Middleware untuk memastikan login adalah guru
 async def guru_only(user=Depends(get_current_user)):
     if user["role"] != "Guru":
@@ -18,57 +44,29 @@ async def guru_only(user=Depends(get_current_user)):
 async def get_dashboard_guru(user=Depends(guru_only)):
 
     guru_email = user["sub"]
-    guru = await db.guru.find_unique(where={"email": guru_email})
+    guru = await get_guru(db, guru_email)
 
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
     guru_id = guru.id   # sekarang aman
 
-    jumlah_murid = await db.murid.count(
-        where={"kelas": {"wali_kelas_id": guru_id}}
-    )
-
-    jumlah_materi = await db.materi.count(
-        where={"guru_id": guru_id}
-    )
-
-    jumlah_tugas = await db.tugas.count(
-        where={"guru_id": guru_id}
-    )
-
-    murid_pending = await db.murid.count(
-        where={"is_verified": False}
-    )
-
-    rapor_records = await db.rapor.find_many(
-        where={"guru_id": guru_id}
-    )
+    versions = table_versions(*DASHBOARD_TABLES)
+    cached = _dashboard_cache.get(guru_id)
+    if cached is not None and cached[0] == versions:
+        return cached[1]
 
-    nilai_akhir_list = [r.nilai_akhir for r in rapor_records if r.nilai_akhir is not None]
+    stats = (await db.query_raw(DASHBOARD_QUERY, guru_id))[0]
 
-    rata_rata_nilai = (
-        sum(nilai_akhir_list)/len(nilai_akhir_list) if nilai_akhir_list else None
-    )
-
-    hadir = await db.absensi.count(
-        where={"guru_id": guru_id, "status": "Hadir"}
-    )
-
-    total_absensi = await db.absensi.count(
-        where={"guru_id": guru_id}
-    )
-
-    persentase_kehadiran = (
-        (hadir / total_absensi) * 100 if total_absensi > 0 else None
-    )
-
-    return {
+    dashboard = {
         "guru": guru.nama,
-        "jumlah_murid": jumlah_murid,
-        "jumlah_materi": jumlah_materi,
-        "jumlah_tugas": jumlah_tugas,
-        "murid_pending": murid_pending,
-        "rata_nilai": rata_rata_nilai,
-        "kehadiran": persentase_kehadiran
+        "jumlah_murid": stats["jumlah_murid"],
+        "jumlah_materi": stats["jumlah_materi"],
+        "jumlah_tugas": stats["jumlah_tugas"],
+        "murid_pending": stats["murid_pending"],
+        "rata_nilai": stats["rata_nilai"],
+        "kehadiran": stats["kehadiran"]
     }
+
+    _dashboard_cache.set(guru_id, (versions, dashboard))
+    return dashboard
@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from main import db
+from core.cache import touch
+from core.principal import get_guru
 from core.permissions import authorize_access
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Guru - Materi"],
-    dependencies=[Depends(authorize_access)]
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 class MateriCreate(BaseModel):
@@ -25,7 +29,7 @@ async def create_materi(data: MateriCreate, user=Depends(authorize_access)):
     if user["role"] != "Guru":
         raise HTTPException(status_code=403, detail="Akses ditolak")
 
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
@@ -40,6 +44,7 @@ async def create_materi(data: MateriCreate, user=Depends(authorize_access)):
             "guru_id": guru.id
         }
     )
+    touch("materi")
 
     return {
         "message": "Materi berhasil dibuat",
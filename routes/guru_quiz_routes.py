@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from main import db
+from core.principal import get_guru
 from core.permissions import authorize_access
+from core.answer_key import get_answer_key, invalidate_answer_key
+from core.soal_payload import get_soal_payload, invalidate_soal_payload
+from core.responses import ORJSONRoute
 from datetime import datetime
 
 router = APIRouter(
     tags=["Guru - Quiz"],
-    dependencies=[Depends(authorize_access)]
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 class QuizCreate(BaseModel):
@@ -31,7 +36,7 @@ async def create_quiz(data: QuizCreate, user=Depends(authorize_access)):
     if user["role"] != "Guru":
         raise HTTPException(403, "Akses ditolak")
 
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
 
     quiz = await db.quiz.create(
         data={
@@ -53,6 +58,8 @@ async def add_soal(data: SoalCreate, user=Depends(authorize_access)):
         raise HTTPException(403, "Akses ditolak")
 
     soal = await db.soal_quiz.create(data=data.dict())
+    invalidate_answer_key(data.quiz_id)
+    invalidate_soal_payload(data.quiz_id)
     return {"message": "Soal berhasil ditambahkan", "data": soal}
 
 @router.get("")
@@ -63,7 +70,7 @@ async def get_quiz_by_mapel(
     if user["role"] != "Guru":
         raise HTTPException(403, "Akses ditolak")
 
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
 
     quiz = await db.quiz.find_many(
         where={
@@ -83,9 +90,7 @@ async def get_soal_by_quiz_guru(
     if user["role"] != "Guru":
         raise HTTPException(status_code=403, detail="Akses ditolak")
 
-    guru = await db.guru.find_unique(
-        where={"email": user["sub"]}
-    )
+    guru = await get_guru(db, user["sub"])
 
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
@@ -130,7 +135,7 @@ async def publish_quiz(
     if user["role"] != "Guru":
         raise HTTPException(403, "Akses ditolak")
 
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
 
     quiz = await db.quiz.find_unique(where={"id": quiz_id})
     if not quiz or quiz.guru_id != guru.id:
@@ -145,6 +150,12 @@ async def publish_quiz(
         }
     )
 
+    # siapkan kunci jawaban & payload soal sebelum murid mulai membuka quiz
+    invalidate_answer_key(quiz_id)
+    invalidate_soal_payload(quiz_id)
+    await get_answer_key(db, quiz_id)
+    await get_soal_payload(db, quiz_id)
+
     return {
         "message": "Quiz berhasil dipublish",
         "data": updated
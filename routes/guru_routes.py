@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from main import db
+from core.cache import touch
+from core.principal import get_guru, invalidate_principal
 from core.permissions import authorize_access
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Guru"],
-    dependencies=[Depends(authorize_access)]
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 @router.get("/murid/pending")
@@ -46,7 +50,7 @@ async def verify_murid(murid_id: int, user=Depends(authorize_access)):
         raise HTTPException(status_code=400, detail="Murid sudah diverifikasi")
 
     # ambil guru yang login
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
@@ -57,6 +61,8 @@ async def verify_murid(murid_id: int, user=Depends(authorize_access)):
             "verified_by": guru.id
         }
     )
+    touch("murid")
+    invalidate_principal(murid.email)
 
     return {
         "message": "✅ Murid berhasil diverifikasi",
@@ -1,14 +1,22 @@
 # routes/hasil_quiz_routes.py — Manajemen Hasil Quiz (RBAC Protected)
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks
 from pydantic import BaseModel, Field
 from core.permissions import authorize_access
 from core.security import get_current_user
+from plugin.cluster.feature_store import refresh_feature_store
 from main import db
+from core.principal import get_murid
+from core.pagination import PageParams, filter_where, paginate
+from core.export import export_filters, export_response
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Hasil Quiz"],
-    dependencies=[Depends(authorize_access)]  # ✅ RBAC otomatis
+    dependencies=[Depends(authorize_access)],  # ✅ RBAC otomatis
+    route_class=ORJSONRoute,
 )
 
 # SCHEMA: Model Input untuk Hasil Quiz
@@ -24,19 +32,20 @@ class HasilQuizCreate(BaseModel):
 
 # CREATE — Tambah Data Hasil Quiz
 @router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_hasil_quiz(data: HasilQuizCreate, current_user: dict = Depends(get_current_user)):
+async def create_hasil_quiz(data: HasilQuizCreate, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     try:
         role = current_user["role"]
         email = current_user["sub"]
 
         # Cegah murid menambahkan hasil untuk murid lain
         if role == "Murid":
-            murid = await db.murid.find_unique(where={"email": email})
+            murid = await get_murid(db, email)
             if not murid:
                 raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
             data.murid_id = murid.id
 
         created = await db.hasil_quiz.create(data=data.dict())
+        background_tasks.add_task(refresh_feature_store, db, [created.murid_id])
         return {"message": "✅ Hasil quiz berhasil ditambahkan", "data": created}
 
     except Exception as e:
@@ -44,28 +53,76 @@ async def create_hasil_quiz(data: HasilQuizCreate, current_user: dict = Depends(
 
 # READ — Ambil Semua Data Hasil Quiz
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_hasil_quiz(current_user: dict = Depends(get_current_user)):
+async def get_all_hasil_quiz(
+    page: PageParams = Depends(),
+    quiz_id: Optional[int] = None,
+    mata_pelajaran_id: Optional[int] = None,
+    dari: Optional[date] = None,
+    sampai: Optional[date] = None,
+    current_user: dict = Depends(get_current_user),
+):
     try:
         role = current_user["role"]
         email = current_user["sub"]
 
         if role == "Admin" or role == "Guru":
-            hasil = await db.hasil_quiz.find_many(
-                include={"murid": True, "mata_pelajaran": True}
-            )
+            scope = {}
+            include = {"murid": True, "mata_pelajaran": True}
         else:
-            murid = await db.murid.find_unique(where={"email": email})
+            murid = await get_murid(db, email)
             if not murid:
                 raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
-            hasil = await db.hasil_quiz.find_many(
-                where={"murid_id": murid.id},
-                include={"mata_pelajaran": True}
-            )
+            scope = {"murid_id": murid.id}
+            include = {"mata_pelajaran": True}
 
-        return {"total": len(hasil), "data": hasil}
+        where = filter_where(
+            scope, dari=dari, sampai=sampai,
+            quiz_id=quiz_id, mata_pelajaran_id=mata_pelajaran_id,
+        )
+        return await paginate(db.hasil_quiz, page, where=where, include=include)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal mengambil data hasil quiz: {str(e)}")
 
+# EXPORT — Seluruh Hasil Quiz sebagai stream NDJSON / CSV (Guru & Admin)
+EXPORT_QUERY = """
+SELECT h.id, h.murid_id, m.nama AS murid,
+       h.quiz_id, q.judul AS quiz,
+       h.mata_pelajaran_id, mp.nama_mapel AS mata_pelajaran,
+       h.score, h.total_soal, h.jawaban_benar,
+       h.waktu_mulai, h.waktu_selesai, h.created_at
+FROM hasil_quiz h
+LEFT JOIN murid m ON m.id = h.murid_id
+LEFT JOIN quiz q ON q.id = h.quiz_id
+LEFT JOIN mata_pelajaran mp ON mp.id = h.mata_pelajaran_id
+WHERE h.id > $1{filters}
+ORDER BY h.id
+LIMIT {batch_size}
+"""
+
+EXPORT_COLUMNS = [
+    "id", "murid_id", "murid", "quiz_id", "quiz", "mata_pelajaran_id", "mata_pelajaran",
+    "score", "total_soal", "jawaban_benar", "waktu_mulai", "waktu_selesai", "created_at",
+]
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_hasil_quiz(
+    format: str = "ndjson",
+    quiz_id: Optional[int] = None,
+    mata_pelajaran_id: Optional[int] = None,
+    dari: Optional[date] = None,
+    sampai: Optional[date] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    if current_user["role"] not in ["Guru", "Admin"]:
+        raise HTTPException(status_code=403, detail="❌ Hanya Guru dan Admin yang dapat export hasil quiz")
+
+    filters, args = export_filters(
+        "h", date_field="created_at", dari=dari, sampai=sampai,
+        quiz_id=quiz_id, mata_pelajaran_id=mata_pelajaran_id,
+    )
+    return export_response(db, EXPORT_QUERY, filters, args, EXPORT_COLUMNS, format, "hasil_quiz")
+
 # READ — Ambil Berdasarkan ID
 @router.get("/{id}", status_code=status.HTTP_200_OK)
 async def get_hasil_quiz_by_id(id: int, current_user: dict = Depends(get_current_user)):
@@ -82,7 +139,7 @@ async def get_hasil_quiz_by_id(id: int, current_user: dict = Depends(get_current
             raise HTTPException(status_code=404, detail="❌ Hasil quiz tidak ditemukan")
 
         if role == "Murid":
-            murid = await db.murid.find_unique(where={"email": email})
+            murid = await get_murid(db, email)
             if hasil.murid_id != murid.id:
                 raise HTTPException(status_code=403, detail="Kamu tidak boleh melihat hasil quiz milik murid lain")
 
@@ -92,7 +149,7 @@ async def get_hasil_quiz_by_id(id: int, current_user: dict = Depends(get_current
 
 # UPDATE — Ubah Data Hasil Quiz (Admin & Guru Only)
 @router.put("/{id}", status_code=status.HTTP_200_OK)
-async def update_hasil_quiz(id: int, data: HasilQuizCreate, current_user: dict = Depends(get_current_user)):
+async def update_hasil_quiz(id: int, data: HasilQuizCreate, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     role = current_user["role"]
     if role == "Murid":
         raise HTTPException(status_code=403, detail="Murid tidak boleh mengedit hasil quiz")
@@ -103,13 +160,14 @@ async def update_hasil_quiz(id: int, data: HasilQuizCreate, current_user: dict =
 
     try:
         updated = await db.hasil_quiz.update(where={"id": id}, data=data.dict())
+        background_tasks.add_task(refresh_feature_store, db, [existing.murid_id, updated.murid_id])
         return {"message": "✅ Hasil quiz berhasil diperbarui", "data": updated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal memperbarui hasil quiz: {str(e)}")
 
 # DELETE — Hapus Data (Admin Only)
 @router.delete("/{id}", status_code=status.HTTP_200_OK)
-async def delete_hasil_quiz(id: int, current_user: dict = Depends(get_current_user)):
+async def delete_hasil_quiz(id: int, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     role = current_user["role"]
     if role != "Admin":
         raise HTTPException(status_code=403, detail="Hanya Admin yang boleh menghapus hasil quiz")
@@ -120,6 +178,7 @@ async def delete_hasil_quiz(id: int, current_user: dict = Depends(get_current_us
             raise HTTPException(status_code=404, detail="Hasil quiz tidak ditemukan")
 
         await db.hasil_quiz.delete(where={"id": id})
+        background_tasks.add_task(refresh_feature_store, db, [existing.murid_id])
         return {"message": "🗑️ Hasil quiz berhasil dihapus"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal menghapus hasil quiz: {str(e)}")
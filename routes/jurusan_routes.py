@@ -1,12 +1,15 @@
 # routes/jurusan_routes.py — Manajemen Jurusan (RBAC Protected)
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
 from pydantic import BaseModel, Field
 from core.permissions import authorize_access, check_permission
 from main import db
+from core.etag import conditional_get
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Jurusan"],
-    dependencies=[Depends(authorize_access)]  
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 # SCHEMA: Data Jurusan
@@ -40,10 +43,14 @@ async def create_jurusan(data: JurusanCreate, user=Depends(authorize_access)):
 
 # 📜 READ — Ambil Semua Jurusan (Admin, Guru, Murid)
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_jurusan(user=Depends(authorize_access)):
+async def get_all_jurusan(request: Request, response: Response, user=Depends(authorize_access)):
     check_permission(user, "jurusan")
 
     try:
+        not_modified = await conditional_get(request, response, db, ("jurusan",))
+        if not_modified:
+            return not_modified
+
         jurusan_list = await db.jurusan.find_many()
         return {"total": len(jurusan_list), "data": jurusan_list}
     except Exception as e:
@@ -1,12 +1,16 @@
 # routes/kelas_routes.py — Manajemen Kelas (RBAC Protected)
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
 from pydantic import BaseModel, Field
 from core.permissions import authorize_access, check_permission
 from main import db
+from core.cache import touch
+from core.etag import conditional_get
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Kelas"],
-    dependencies=[Depends(authorize_access)]  # ✅ Semua endpoint butuh JWT
+    dependencies=[Depends(authorize_access)],  # ✅ Semua endpoint butuh JWT
+    route_class=ORJSONRoute,
 )
 
 # SCHEMA: Data Kelas
@@ -32,16 +36,22 @@ async def create_kelas(data: KelasCreate, user=Depends(authorize_access)):
 
     try:
         created = await db.kelas.create(data=data.dict())
+        touch("kelas")
         return {"message": "✅ Kelas berhasil dibuat", "data": created}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal membuat kelas: {str(e)}")
 
 # READ — Ambil Semua Kelas (Admin, Guru, Murid)
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_kelas(user=Depends(authorize_access)):
+async def get_all_kelas(request: Request, response: Response, user=Depends(authorize_access)):
     check_permission(user, "kelas")
 
     try:
+        # wali_kelas = guru → versi guru ikut menentukan ETag
+        not_modified = await conditional_get(request, response, db, ("kelas", "jurusan", "guru"))
+        if not_modified:
+            return not_modified
+
         kelas_list = await db.kelas.find_many(
             include={"jurusan": True, "wali_kelas": True}
         )
@@ -80,6 +90,7 @@ async def update_kelas(id: int, data: KelasCreate, user=Depends(authorize_access
 
     try:
         updated = await db.kelas.update(where={"id": id}, data=data.dict())
+        touch("kelas")
         return {"message": "✅ Kelas berhasil diperbarui", "data": updated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal memperbarui kelas: {str(e)}")
@@ -102,6 +113,7 @@ async def delete_kelas(id: int, user=Depends(authorize_access)):
 
     try:
         await db.kelas.delete(where={"id": id})
+        touch("kelas")
         return {"message": "🗑️ Kelas berhasil dihapus"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal menghapus kelas: {str(e)}")
@@ -0,0 +1,99 @@
+# routes/laporan_routes.py — Laporan Performa Kelas (RBAC Protected)
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, status
+from pydantic import BaseModel, Field
+from core.permissions import authorize_access
+from core.principal import get_guru
+from core.responses import ORJSONRoute
+from core.sideload import side_load
+from plugin.report.laporan_performa import generate_laporan
+from main import db
+
+router = APIRouter(
+    tags=["Laporan Performa"],
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
+)
+
+# SCHEMA: Permintaan generate laporan satu periode
+class LaporanGenerate(BaseModel):
+    periode: str = Field(..., description="Bulanan / Semester / Tahunan")
+    tahun_ajaran: str = Field(..., description="Tahun ajaran, misal: 2025/2026")
+    bulan: int | None = Field(default=None, description="Bulan 1-12 (wajib untuk Bulanan)")
+    semester: str | None = Field(default=None, description="Ganjil / Genap (wajib untuk Semester)")
+
+
+# GENERATE — Hitung & simpan laporan satu periode (Hanya Admin)
+@router.post("/generate", status_code=status.HTTP_201_CREATED)
+async def generate_laporan_performa(data: LaporanGenerate, user=Depends(authorize_access)):
+    if user.get("role") != "Admin":
+        raise HTTPException(status_code=403, detail="❌ Hanya Admin yang dapat membuat laporan")
+
+    try:
+        total = await generate_laporan(db, data.periode, data.tahun_ajaran, data.bulan, data.semester)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Gagal membuat laporan: {str(e)}")
+
+    return {"message": "✅ Laporan performa berhasil dibuat", "total": total}
+
+
+# READ — Daftar laporan tersimpan (Admin: semua, Guru: mapel yang diampu)
+@router.get("/", status_code=status.HTTP_200_OK)
+async def get_all_laporan(
+    tahun_ajaran: Optional[str] = None,
+    periode: Optional[str] = None,
+    bulan: Optional[int] = None,
+    semester: Optional[str] = None,
+    kelas_id: Optional[int] = None,
+    mata_pelajaran_id: Optional[int] = None,
+    user=Depends(authorize_access),
+):
+    role = user.get("role")
+
+    filters = {
+        "tahun_ajaran": tahun_ajaran,
+        "periode": periode,
+        "bulan": bulan,
+        "semester": semester,
+        "kelas_id": kelas_id,
+        "mata_pelajaran_id": mata_pelajaran_id,
+    }
+    where = {field: value for field, value in filters.items() if value is not None}
+
+    if role == "Guru":
+        guru = await get_guru(db, user["sub"])
+        if not guru:
+            raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
+        where["guru_id"] = guru.id
+    elif role != "Admin":
+        raise HTTPException(status_code=403, detail="❌ Akses ditolak")
+
+    laporan = await db.laporan_performa.find_many(
+        where=where,
+        include={"kelas": True, "mata_pelajaran": True},
+        order=[{"tahun_ajaran": "desc"}, {"id": "asc"}],
+    )
+    return {"total": len(laporan), "data": laporan}
+
+
+# READ — Detail laporan
+@router.get("/{id}", status_code=status.HTTP_200_OK)
+async def get_laporan(id: int, user=Depends(authorize_access)):
+    role = user.get("role")
+    if role not in ["Admin", "Guru"]:
+        raise HTTPException(status_code=403, detail="❌ Akses ditolak")
+
+    laporan = await db.laporan_performa.find_unique(where={"id": id})
+    if not laporan:
+        raise HTTPException(status_code=404, detail="❌ Laporan tidak ditemukan")
+
+    if role == "Guru":
+        guru = await get_guru(db, user["sub"])
+        if not guru or laporan.guru_id != guru.id:
+            raise HTTPException(status_code=403, detail="❌ Tidak boleh melihat laporan guru lain")
+
+    # murid_terbaik hanya {id, nama, nis} — tanpa password / data pribadi
+    included = await side_load(db, [laporan], ("kelas", "mata_pelajaran", "murid_terbaik"))
+    return {"data": laporan, "included": included}
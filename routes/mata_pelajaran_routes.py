@@ -1,11 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request, Response, BackgroundTasks
 from typing import Optional
 from core.permissions import authorize_access
+from core.responses import ORJSONRoute
 from main import db
+from core.cache import touch
+from core.principal import get_guru, get_murid
+from core.answer_key import invalidate_answer_key
+from core.soal_payload import invalidate_soal_payload
+from core.etag import conditional_get
+from plugin.cluster.feature_store import refresh_feature_store
+
+# tabel + relasi yang di-include list mata pelajaran (versi → ETag)
+MAPEL_TABLES = ("mata_pelajaran", "kelas", "jurusan", "guru")
 
 router = APIRouter(
     tags=["Guru - Mata Pelajaran"],
-    dependencies=[Depends(authorize_access)]
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 # ===============================
@@ -25,7 +36,7 @@ async def create_mata_pelajaran(
     if user["role"] != "Guru":
         raise HTTPException(status_code=403, detail="Akses ditolak")
 
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
@@ -66,9 +77,7 @@ async def get_mata_pelajaran_murid(user=Depends(authorize_access)):
     if user["role"] != "Murid":
         raise HTTPException(status_code=403, detail="Akses ditolak")
 
-    murid = await db.murid.find_unique(
-        where={"email": user["sub"]}
-    )
+    murid = await get_murid(db, user["sub"])
     if not murid:
         raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
 
@@ -98,9 +107,7 @@ async def get_mata_pelajaran_guru(user=Depends(authorize_access)):
     if user["role"] != "Guru":
         raise HTTPException(status_code=403, detail="Akses ditolak")
 
-    guru = await db.guru.find_unique(
-        where={"email": user["sub"]}
-    )
+    guru = await get_guru(db, user["sub"])
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
@@ -125,7 +132,8 @@ from main import db
 
 router = APIRouter(
     tags=["Guru - Mata Pelajaran"],
-    dependencies=[Depends(authorize_access)]
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 # ===============================
@@ -145,7 +153,7 @@ async def create_mata_pelajaran(
     if user["role"] != "Guru":
         raise HTTPException(status_code=403, detail="Akses ditolak")
 
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
@@ -182,19 +190,21 @@ async def create_mata_pelajaran(
 # GET MATA PELAJARAN MURID
 # ===============================
 @router.get("/murid", status_code=200)
-async def get_mata_pelajaran_murid(user=Depends(authorize_access)):
+async def get_mata_pelajaran_murid(request: Request, response: Response, user=Depends(authorize_access)):
     if user["role"] != "Murid":
         raise HTTPException(status_code=403, detail="Akses ditolak")
 
-    murid = await db.murid.find_unique(
-        where={"email": user["sub"]}
-    )
+    murid = await get_murid(db, user["sub"])
     if not murid:
         raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
 
     if not murid.kelas_id:
         return {"total": 0, "data": []}
 
+    not_modified = await conditional_get(request, response, db, MAPEL_TABLES, "kelas", murid.kelas_id)
+    if not_modified:
+        return not_modified
+
     mapel_list = await db.mata_pelajaran.find_many(
         where={"kelas_id": murid.kelas_id},
         include={
@@ -214,16 +224,18 @@ async def get_mata_pelajaran_murid(user=Depends(authorize_access)):
 # GET MATA PELAJARAN GURU
 # ===============================
 @router.get("", status_code=200)
-async def get_mata_pelajaran_guru(user=Depends(authorize_access)):
+async def get_mata_pelajaran_guru(request: Request, response: Response, user=Depends(authorize_access)):
     if user["role"] != "Guru":
         raise HTTPException(status_code=403, detail="Akses ditolak")
 
-    guru = await db.guru.find_unique(
-        where={"email": user["sub"]}
-    )
+    guru = await get_guru(db, user["sub"])
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
+    not_modified = await conditional_get(request, response, db, MAPEL_TABLES, "guru", guru.id)
+    if not_modified:
+        return not_modified
+
     mapel_list = await db.mata_pelajaran.find_many(
         where={"guru_id": guru.id},
         include={
@@ -244,12 +256,13 @@ async def get_mata_pelajaran_guru(user=Depends(authorize_access)):
 @router.delete("/{mapel_id}", status_code=200)
 async def delete_mata_pelajaran(
     mapel_id: int,
+    background_tasks: BackgroundTasks,
     user=Depends(authorize_access)
 ):
     if user["role"] != "Guru":
         raise HTTPException(403, "Akses ditolak")
 
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
     if not guru:
         raise HTTPException(404, "Guru tidak ditemukan")
 
@@ -260,6 +273,11 @@ async def delete_mata_pelajaran(
     if mapel.guru_id != guru.id:
         raise HTTPException(403, "Tidak berhak menghapus")
 
+    # murid yang hasil quiz-nya ikut terhapus → fiturnya dihitung ulang setelah delete
+    terdampak = await db.query_raw(
+        "SELECT DISTINCT murid_id FROM hasil_quiz WHERE mata_pelajaran_id = $1", mapel_id
+    )
+
     # 1️⃣ hapus hasil quiz
     await db.hasil_quiz.delete_many(
         where={"mata_pelajaran_id": mapel_id}
@@ -281,16 +299,20 @@ async def delete_mata_pelajaran(
     await db.quiz.delete_many(
         where={"mata_pelajaran_id": mapel_id}
     )
+    invalidate_answer_key(*quiz_ids)
+    invalidate_soal_payload(*quiz_ids)
 
     # 5️⃣ hapus materi
     await db.materi.delete_many(
         where={"mata_pelajaran_id": mapel_id}
     )
+    touch("materi")
 
     # 6️⃣ terakhir hapus mapel
     await db.mata_pelajaran.delete(
         where={"id": mapel_id}
     )
+    background_tasks.add_task(refresh_feature_store, db, [r["murid_id"] for r in terdampak])
 
     return {
         "message": "Mata pelajaran & seluruh data terkait berhasil dihapus",
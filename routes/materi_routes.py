@@ -2,14 +2,22 @@
 # 📘 routes/materi_routes.py — Manajemen Materi Belajar (RBAC Protected)
 # ===============================================================
 
+from datetime import date
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel, Field
 from core.permissions import authorize_access, check_permission
 from main import db
+from core.cache import touch
+from core.principal import get_guru
+from core.pagination import PageParams, filter_where, paginate
+from core.sideload import side_load
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Materi"],
-    dependencies=[Depends(authorize_access)]  # ✅ Semua endpoint butuh JWT
+    dependencies=[Depends(authorize_access)],  # ✅ Semua endpoint butuh JWT
+    route_class=ORJSONRoute,
 )
 
 # ===============================================================
@@ -40,13 +48,14 @@ async def create_materi(data: MateriCreate, user=Depends(authorize_access)):
 
     # Jika Guru, isi otomatis guru_id berdasarkan token login
     if role == "Guru" and not data.guru_id:
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru:
             raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
         data.guru_id = guru.id
 
     try:
         created = await db.materi.create(data=data.dict())
+        touch("materi")
         return {"message": "✅ Materi berhasil dibuat", "data": created}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal membuat materi: {str(e)}")
@@ -55,33 +64,36 @@ async def create_materi(data: MateriCreate, user=Depends(authorize_access)):
 # 📜 READ — Ambil Semua Materi (Admin, Guru, Murid)
 # ===============================================================
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_materi(user=Depends(authorize_access)):
+async def get_all_materi(
+    page: PageParams = Depends(),
+    kelas_id: Optional[int] = None,
+    mata_pelajaran_id: Optional[int] = None,
+    dari: Optional[date] = None,
+    sampai: Optional[date] = None,
+    user=Depends(authorize_access),
+):
     role = user.get("role")
+    scope = {}
+    relations = ("mata_pelajaran", "guru", "kelas")
 
     try:
-        # Admin → semua materi
-        if role == "Admin":
-            materi_list = await db.materi.find_many(
-                include={"mata_pelajaran": True, "guru": True, "kelas": True}
-            )
-
         # Guru → semua materi yang diunggahnya sendiri
-        elif role == "Guru":
-            guru = await db.guru.find_unique(where={"email": user["sub"]})
+        if role == "Guru":
+            guru = await get_guru(db, user["sub"])
             if not guru:
                 raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
-            materi_list = await db.materi.find_many(
-                where={"guru_id": guru.id},
-                include={"mata_pelajaran": True, "kelas": True}
-            )
+            scope = {"guru_id": guru.id}
+            relations = ("mata_pelajaran", "kelas")
 
-        # Murid → hanya boleh baca semua (read-only)
-        else:
-            materi_list = await db.materi.find_many(
-                include={"mata_pelajaran": True, "guru": True, "kelas": True}
-            )
-
-        return {"total": len(materi_list), "data": materi_list}
+        # Admin → semua materi, Murid → hanya boleh baca semua (read-only)
+        where = filter_where(
+            scope, dari=dari, sampai=sampai,
+            kelas_id=kelas_id, mata_pelajaran_id=mata_pelajaran_id,
+        )
+        # Relasi tidak di-include per baris: guru/kelas/mapel dikirim sekali di "included"
+        result = await paginate(db.materi, page, where=where)
+        result["included"] = await side_load(db, result["data"], relations, page.fields)
+        return result
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal mengambil data materi: {str(e)}")
@@ -89,13 +101,11 @@ async def get_all_materi(user=Depends(authorize_access)):
 # 🔍 READ — Ambil Materi Berdasarkan ID (Semua Role)
 @router.get("/{id}", status_code=status.HTTP_200_OK)
 async def get_materi(id: int, user=Depends(authorize_access)):
-    materi = await db.materi.find_unique(
-        where={"id": id},
-        include={"guru": True, "mata_pelajaran": True, "kelas": True}
-    )
+    materi = await db.materi.find_unique(where={"id": id})
     if not materi:
         raise HTTPException(status_code=404, detail="❌ Materi tidak ditemukan")
-    return {"data": materi}
+    included = await side_load(db, [materi], ("guru", "mata_pelajaran", "kelas"))
+    return {"data": materi, "included": included}
 
 # UPDATE — Ubah Materi (Admin & Guru)
 @router.put("/{id}", status_code=status.HTTP_200_OK)
@@ -115,7 +125,7 @@ async def update_materi(id: int, data: MateriCreate, user=Depends(authorize_acce
 
     # Guru hanya bisa ubah materi miliknya sendiri
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or existing.guru_id != guru.id:
             raise HTTPException(
                 status_code=403,
@@ -124,6 +134,7 @@ async def update_materi(id: int, data: MateriCreate, user=Depends(authorize_acce
 
     try:
         updated = await db.materi.update(where={"id": id}, data=data.dict())
+        touch("materi")
         return {"message": "✅ Materi berhasil diperbarui", "data": updated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal memperbarui materi: {str(e)}")
@@ -146,7 +157,7 @@ async def delete_materi(id: int, user=Depends(authorize_access)):
 
     # Guru hanya bisa hapus materi miliknya sendiri
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or existing.guru_id != guru.id:
             raise HTTPException(
                 status_code=403,
@@ -155,6 +166,7 @@ async def delete_materi(id: int, user=Depends(authorize_access)):
 
     try:
         await db.materi.delete(where={"id": id})
+        touch("materi")
         return {"message": "🗑️ Materi berhasil dihapus"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal menghapus materi: {str(e)}")
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from core.permissions import authorize_access
 from main import db
+from core.principal import get_murid
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Murid - Materi"],
-    dependencies=[Depends(authorize_access)]
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 @router.get("/{mata_pelajaran_id}")
@@ -15,9 +18,7 @@ async def get_materi_murid(
     if user["role"] != "Murid":
         raise HTTPException(403, "Akses ditolak")
 
-    murid = await db.murid.find_unique(
-        where={"email": user["sub"]}
-    )
+    murid = await get_murid(db, user["sub"])
     if not murid or not murid.kelas_id:
         return {"total": 0, "data": []}
 
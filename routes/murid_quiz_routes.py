@@ -1,12 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Header, Response
 from pydantic import BaseModel
-from datetime import datetime, timezone
+from typing import Optional
 from core.permissions import authorize_access
+from plugin.cluster.feature_store import refresh_feature_store
 from main import db
+from core.principal import get_murid
+from core.idempotency import run_once
+from core.answer_key import get_answer_key
+from core.submit_buffer import SUBMIT_BATCHING, submit_buffer
+from core.quiz_session import (
+    get_session_store, session_key, quiz_window_error,
+    start_session, recorded_session, deadline_passed,
+)
+from core.soal_payload import get_soal_payload
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Murid - Quiz"],
-    dependencies=[Depends(authorize_access)]
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 # ===============================
@@ -20,7 +32,7 @@ async def get_quiz_murid(
     if user["role"] != "Murid":
         raise HTTPException(403, "Akses ditolak")
 
-    murid = await db.murid.find_unique(where={"email": user["sub"]})
+    murid = await get_murid(db, user["sub"])
     if not murid or not murid.kelas_id:
         return {"total": 0, "data": []}
 
@@ -45,6 +57,7 @@ async def get_quiz_murid(
 @router.get("/{quiz_id}/soal")
 async def get_soal_quiz_murid(
     quiz_id: int,
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
     user=Depends(authorize_access)
 ):
     # ===============================
@@ -56,15 +69,26 @@ async def get_soal_quiz_murid(
     # ===============================
     # AMBIL DATA MURID
     # ===============================
-    murid = await db.murid.find_unique(
-        where={"email": user["sub"]}
-    )
+    murid = await get_murid(db, user["sub"])
     if not murid:
         raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
 
     # ===============================
     # CEK APAKAH SUDAH PERNAH SUBMIT
     # ===============================
+    antre = submit_buffer.pending(quiz_id, murid.id)
+    if antre:
+        # sudah submit, baris hasil masih di buffer (mode batching)
+        return {
+            "status": "FINISHED",
+            "message": "Quiz sudah dikerjakan",
+            "nilai": {
+                "score": antre["score"],
+                "jawaban_benar": antre["jawaban_benar"],
+                "total_soal": antre["total_soal"]
+            }
+        }
+
     hasil = await db.hasil_quiz.find_first(
         where={
             "quiz_id": quiz_id,
@@ -85,20 +109,83 @@ async def get_soal_quiz_murid(
         }
 
     # ===============================
-    # BELUM SUBMIT → AMBIL SOAL
+    # SESI: sudah mulai (reload) → timer lanjut, belum → cek jadwal quiz
     # ===============================
-    soal = await db.soal_quiz.find_many(
-        where={"quiz_id": quiz_id},
-        order={"id": "asc"}
-    )
+    store = get_session_store()
+    key = session_key(quiz_id, murid.id)
+    sesi = await store.get(key)
 
-    if not soal:
+    if sesi is None:
+        quiz = await db.quiz.find_unique(where={"id": quiz_id})
+        if not quiz:
+            raise HTTPException(status_code=404, detail="Quiz tidak ditemukan")
+
+        error = quiz_window_error(quiz)
+        if error:
+            raise HTTPException(status_code=403, detail=error)
+
+    # ===============================
+    # BELUM SUBMIT → SOAL DARI PAYLOAD SIAP KIRIM (tanpa jawaban_benar)
+    # ===============================
+    payload = await get_soal_payload(db, quiz_id)
+
+    if not payload.total_soal:
         raise HTTPException(status_code=404, detail="Soal tidak ditemukan")
 
+    if sesi is None:
+        # sudah pernah mulai (sesi memori hilang) → deadline tercatat, bukan timer baru
+        sesi = await store.create(key, await start_session(db, quiz, murid.id, payload.soal_ids))
+
+    # Konten per murid (urutan soal + sesi) → cache private; klien memakai "deadline"
+    # untuk timer, sehingga sisa_detik pada respons 304 boleh basi.
+    etag = payload.etag_for(murid.id, sesi.deadline, bytes(sesi.jawaban))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+
+    body = payload.render(murid.id, {
+        "status": "TIMEOUT" if sesi.expired() else "ONGOING",
+        "total_soal": payload.total_soal,
+        "sesi": sesi.to_dict(),
+    })
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# ===============================
+# AUTOSAVE JAWABAN (SELAMA SESI)
+# ===============================
+class AutosaveJawaban(BaseModel):
+    jawaban: dict  # { soal_id: "A" } — cukup soal yang berubah
+
+@router.put("/{quiz_id}/jawaban")
+async def autosave_jawaban_murid(
+    quiz_id: int,
+    data: AutosaveJawaban,
+    user=Depends(authorize_access)
+):
+    # tanpa query DB: murid dari cache principal, jawaban ke session store
+    if user["role"] != "Murid":
+        raise HTTPException(403, "Akses ditolak")
+
+    murid = await get_murid(db, user["sub"])
+    if not murid:
+        raise HTTPException(404, "Murid tidak ditemukan")
+
+    store = get_session_store()
+    key = session_key(quiz_id, murid.id)
+    sesi = await store.get(key)
+    if sesi is None:
+        raise HTTPException(404, "Sesi quiz tidak ditemukan, buka soal terlebih dahulu")
+    if sesi.expired():
+        raise HTTPException(409, "Waktu pengerjaan habis, jawaban tidak disimpan")
+
+    sesi = await store.save_answers(key, data.jawaban)
+    if sesi is None:
+        raise HTTPException(404, "Sesi quiz tidak ditemukan, buka soal terlebih dahulu")
+
     return {
-        "status": "ONGOING",
-        "total_soal": len(soal),
-        "data": soal
+        "message": "Jawaban tersimpan",
+        "sisa_detik": sesi.sisa_detik()
     }
 
 
@@ -106,55 +193,141 @@ async def get_soal_quiz_murid(
 # SUBMIT QUIZ
 # ===============================
 class SubmitQuiz(BaseModel):
-    jawaban: dict  # { soal_id: "A" }
+    jawaban: dict = {}  # { soal_id: "A" } — kosong = pakai jawaban autosave
+
+# Satu round trip: insert hasil, atau (sudah ada) kembalikan hasil lama.
+# Unique (quiz_id, murid_id) menjamin satu hasil per murid per quiz.
+SUBMIT_QUERY = """
+WITH baru AS (
+    INSERT INTO hasil_quiz (murid_id, quiz_id, mata_pelajaran_id, score, total_soal, jawaban_benar, waktu_mulai, waktu_selesai)
+    VALUES ($1, $2, $3, $4, $5, $6, $7::timestamp, NOW())
+    ON CONFLICT (quiz_id, murid_id) DO NOTHING
+    RETURNING score, jawaban_benar, total_soal, TRUE AS baru
+)
+SELECT * FROM baru
+UNION ALL
+SELECT score, jawaban_benar, total_soal, FALSE AS baru
+FROM hasil_quiz
+WHERE quiz_id = $2 AND murid_id = $1 AND NOT EXISTS (SELECT 1 FROM baru)
+"""
 
 @router.post("/{quiz_id}/submit")
 async def submit_quiz_murid(
     quiz_id: int,
     data: SubmitQuiz,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
     user=Depends(authorize_access)
 ):
     if user["role"] != "Murid":
         raise HTTPException(403, "Akses ditolak")
 
-    murid = await db.murid.find_unique(
-        where={"email": user["sub"]}
-    )
+    murid = await get_murid(db, user["sub"])
     if not murid:
         raise HTTPException(404, "Murid tidak ditemukan")
 
-    quiz = await db.quiz.find_unique(where={"id": quiz_id})
-    if not quiz:
+    # retry dengan Idempotency-Key yang sama → respons pertama, tanpa query
+    key = ("submit_quiz", murid.id, quiz_id, idempotency_key) if idempotency_key else None
+    return await run_once(key, lambda: _submit_quiz(quiz_id, murid, data, background_tasks))
+
+
+async def _submit_quiz(quiz_id: int, murid, data: SubmitQuiz, background_tasks: BackgroundTasks):
+    # kunci jawaban dari cache → penilaian di memori, DB hanya untuk insert hasil
+    kunci = await get_answer_key(db, quiz_id)
+    if kunci is None:
         raise HTTPException(404, "Quiz tidak ditemukan")
 
-    soal_list = await db.soal_quiz.find_many(
-        where={"quiz_id": quiz_id}
-    )
+    # ===============================
+    # FINALISASI DARI SESI: jawaban autosave + jawaban di body (bila belum lewat deadline)
+    # ===============================
+    store = get_session_store()
+    sesi_key = session_key(quiz_id, murid.id)
+    sesi = await store.get(sesi_key)
 
-    skor = 0
-    benar = 0
+    if sesi is not None:
+        if data.jawaban and not sesi.expired():
+            sesi = await store.save_answers(sesi_key, data.jawaban) or sesi
+        jawaban = sesi.jawaban_dict()
+        waktu_mulai = sesi.waktu_mulai
+    else:
+        # sesi memori tidak ada (mis. server restart) → jadwal quiz & deadline tercatat tetap ditegakkan
+        quiz = await db.quiz.find_unique(where={"id": quiz_id})
+        if not quiz:
+            raise HTTPException(404, "Quiz tidak ditemukan")
+        error = quiz_window_error(quiz)
+        if error:
+            raise HTTPException(403, error)
 
-    for soal in soal_list:
-        bobot = soal.bobot or 1
-        if data.jawaban.get(str(soal.id)) == soal.jawaban_benar:
-            skor += bobot
-            benar += 1
+        tercatat = await recorded_session(db, quiz_id, murid.id)
+        waktu_mulai = None
+        if tercatat is not None:
+            waktu_mulai, deadline = tercatat
+            if deadline_passed(deadline):
+                raise HTTPException(403, "Waktu pengerjaan sudah habis")
+        jawaban = data.jawaban
 
-    await db.hasil_quiz.create(
-        data={
-            "murid_id": murid.id,
-            "quiz_id": quiz_id,
-            "mata_pelajaran_id": quiz.mata_pelajaran_id,
-            "score": skor,
-            "total_soal": len(soal_list),
-            "jawaban_benar": benar,
-            "waktu_selesai": datetime.utcnow()
-        }
+    skor, benar = kunci.grade(jawaban)
+
+    if SUBMIT_BATCHING:
+        # mode ujian serentak: dijawab setelah tercatat di WAL, insert hasil_quiz per batch.
+        # Submit ulang yang masih di buffer → respons pertama (lihat add());
+        # yang sudah ter-flush → hasil tersimpan, bukan skor baru yang akan dibuang skip_duplicates.
+        if submit_buffer.pending(quiz_id, murid.id) is None:
+            tersimpan = await db.hasil_quiz.find_first(where={"quiz_id": quiz_id, "murid_id": murid.id})
+            if tersimpan:
+                await store.delete(sesi_key)
+                return {
+                    "message": "Quiz sudah pernah disubmit",
+                    "score": tersimpan.score,
+                    "jawaban_benar": tersimpan.jawaban_benar,
+                    "total_soal": tersimpan.total_soal
+                }
+
+        respons = submit_buffer.add(
+            {
+                "murid_id": murid.id,
+                "quiz_id": quiz_id,
+                "mata_pelajaran_id": kunci.mata_pelajaran_id,
+                "score": skor,
+                "total_soal": kunci.total_soal,
+                "jawaban_benar": benar,
+                "waktu_mulai": waktu_mulai,
+            },
+            {
+                "message": "Quiz berhasil disubmit",
+                "score": skor,
+                "jawaban_benar": benar,
+                "total_soal": kunci.total_soal
+            },
+        )
+        await store.delete(sesi_key)
+        return respons
+
+    args = (
+        murid.id, quiz_id, kunci.mata_pelajaran_id, skor, kunci.total_soal, benar,
+        waktu_mulai.isoformat() if waktu_mulai else None,
     )
+    rows = await db.query_raw(SUBMIT_QUERY, *args)
+    if not rows:
+        # submit paralel commit setelah snapshot statement ini → ulangi sekali (snapshot baru)
+        rows = await db.query_raw(SUBMIT_QUERY, *args)
+    hasil = rows[0]
+    await store.delete(sesi_key)
+
+    if not hasil["baru"]:
+        # sudah pernah submit → no-op, kembalikan nilai yang tersimpan
+        return {
+            "message": "Quiz sudah pernah disubmit",
+            "score": hasil["score"],
+            "jawaban_benar": hasil["jawaban_benar"],
+            "total_soal": hasil["total_soal"]
+        }
+
+    background_tasks.add_task(refresh_feature_store, db, [murid.id])
 
     return {
         "message": "Quiz berhasil disubmit",
         "score": skor,
         "jawaban_benar": benar,
-        "total_soal": len(soal_list)
+        "total_soal": kunci.total_soal
     }
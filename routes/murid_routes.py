@@ -1,13 +1,20 @@
 # routes/murid_routes.py — Manajemen Data Murid (RBAC Protected)
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks
 from pydantic import BaseModel, Field
 from core.permissions import authorize_access, check_permission
 from main import db
+from core.cache import touch
+from core.principal import get_guru, get_murid as get_murid_by_email, invalidate_principal
+from core.pagination import PageParams, filter_where, page_response, paginate
+from core.responses import ORJSONRoute
+from plugin.cluster.feature_store import refresh_feature_store
 
 router = APIRouter(
     tags=["Murid"],
-    dependencies=[Depends(authorize_access)]  # ✅ Semua endpoint butuh JWT
+    dependencies=[Depends(authorize_access)],  # ✅ Semua endpoint butuh JWT
+    route_class=ORJSONRoute,
 )
 
 # SCHEMA: Data Murid
@@ -34,41 +41,45 @@ async def create_murid(data: MuridCreate, user=Depends(authorize_access)):
             raise HTTPException(status_code=400, detail="Email murid sudah terdaftar")
 
         created = await db.murid.create(data=data.dict())
+        touch("murid")
         return {"message": "✅ Murid berhasil ditambahkan", "data": created}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal menambahkan murid: {str(e)}")
 
 # READ — Ambil Semua Murid (Admin & Guru)
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_murid(user=Depends(authorize_access)):
+async def get_all_murid(
+    page: PageParams = Depends(),
+    kelas_id: Optional[int] = None,
+    jurusan_id: Optional[int] = None,
+    user=Depends(authorize_access),
+):
     role = user.get("role")
 
     try:
         # Admin -> semua murid
         if role == "Admin":
-            murid_list = await db.murid.find_many(include={"kelas": True, "jurusan": True})
+            scope = {}
 
         # Guru -> hanya murid di kelas yang dia ajar (kalau ada)
         elif role == "Guru":
-            guru = await db.guru.find_unique(where={"email": user["sub"]})
+            guru = await get_guru(db, user["sub"])
             if not guru:
                 raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
-            murid_list = await db.murid.find_many(
-                where={"kelas": {"wali_kelas_id": guru.id}},
-                include={"kelas": True, "jurusan": True},
-            )
+            scope = {"kelas": {"wali_kelas_id": guru.id}}
 
         # Murid -> hanya dirinya sendiri
         elif role == "Murid":
-            murid = await db.murid.find_unique(where={"email": user["sub"]})
+            murid = await get_murid_by_email(db, user["sub"])
             if not murid:
                 raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
-            murid_list = [murid]
+            return page_response([murid], page)
         else:
             raise HTTPException(status_code=403, detail="Akses ditolak")
 
-        return {"total": len(murid_list), "data": murid_list}
+        where = filter_where(scope, kelas_id=kelas_id, jurusan_id=jurusan_id)
+        return await paginate(db.murid, page, where=where, include={"kelas": True, "jurusan": True})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal mengambil data murid: {str(e)}")
 
@@ -89,7 +100,7 @@ async def get_murid(id: int, user=Depends(authorize_access)):
 
 # UPDATE — Ubah Data Murid (Admin & Murid Sendiri)
 @router.put("/{id}", status_code=status.HTTP_200_OK)
-async def update_murid(id: int, data: MuridCreate, user=Depends(authorize_access)):
+async def update_murid(id: int, data: MuridCreate, background_tasks: BackgroundTasks, user=Depends(authorize_access)):
     role = user.get("role")
     existing = await db.murid.find_unique(where={"id": id})
 
@@ -106,6 +117,12 @@ async def update_murid(id: int, data: MuridCreate, user=Depends(authorize_access
 
     try:
         updated = await db.murid.update(where={"id": id}, data=data.dict())
+        touch("murid")
+        invalidate_principal(existing.email)
+        invalidate_principal(updated.email)
+        if updated.kelas_id != existing.kelas_id:
+            # fitur tugas dihitung dari tugas kelas → pindah kelas = fitur berubah
+            background_tasks.add_task(refresh_feature_store, db, [id])
         return {"message": "✅ Data murid berhasil diperbarui", "data": updated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal memperbarui data murid: {str(e)}")
@@ -121,6 +138,8 @@ async def delete_murid(id: int, user=Depends(authorize_access)):
 
     try:
         await db.murid.delete(where={"id": id})
+        touch("murid")
+        invalidate_principal(existing.email)
         return {"message": "🗑️ Murid berhasil dihapus"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal menghapus murid: {str(e)}")
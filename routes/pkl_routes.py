@@ -1,13 +1,18 @@
 # routes/pkl_routes.py — Manajemen PKL (RBAC Protected)
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
 from core.permissions import authorize_access, check_permission
 from main import db
+from core.principal import get_guru, get_murid
+from core.pagination import PageParams, filter_where, paginate
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["PKL"],
-    dependencies=[Depends(authorize_access)] 
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
 )
 
 #  SCHEMA: Data PKL
@@ -38,39 +43,47 @@ async def create_pkl(pkl: PKLCreate, user=Depends(authorize_access)):
 
 # READ — Ambil Semua Data PKL (Admin, Guru, Murid)
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_pkl(user=Depends(authorize_access)):
+async def get_all_pkl(
+    page: PageParams = Depends(),
+    jurusan_id: Optional[int] = None,
+    status_pkl: Optional[str] = Query(None, alias="status"),
+    dari: Optional[date] = None,
+    sampai: Optional[date] = None,
+    user=Depends(authorize_access),
+):
     role = user.get("role")
 
     try:
         # Admin → semua data
         if role == "Admin":
-            pkl_list = await db.pkl.find_many(include={"murid": True, "partner": True, "jurusan": True, "pembimbing_sekolah": True})
+            scope = {}
+            include = {"murid": True, "partner": True, "jurusan": True, "pembimbing_sekolah": True}
 
         # Guru → hanya PKL yang dibimbing olehnya
         elif role == "Guru":
-            guru = await db.guru.find_unique(where={"email": user["sub"]})
+            guru = await get_guru(db, user["sub"])
             if not guru:
                 raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
-            pkl_list = await db.pkl.find_many(
-                where={"pembimbing_sekolah_id": guru.id},
-                include={"murid": True, "partner": True, "jurusan": True}
-            )
+            scope = {"pembimbing_sekolah_id": guru.id}
+            include = {"murid": True, "partner": True, "jurusan": True}
 
         # Murid → hanya PKL dirinya sendiri
         elif role == "Murid":
-            murid = await db.murid.find_unique(where={"email": user["sub"]})
+            murid = await get_murid(db, user["sub"])
             if not murid:
                 raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
 
-            pkl_list = await db.pkl.find_many(
-                where={"murid_id": murid.id},
-                include={"partner": True, "jurusan": True, "pembimbing_sekolah": True}
-            )
+            scope = {"murid_id": murid.id}
+            include = {"partner": True, "jurusan": True, "pembimbing_sekolah": True}
         else:
             raise HTTPException(status_code=403, detail="Akses ditolak")
 
-        return {"total": len(pkl_list), "data": pkl_list}
+        where = filter_where(
+            scope, date_field="tanggal_mulai", dari=dari, sampai=sampai,
+            jurusan_id=jurusan_id, status=status_pkl,
+        )
+        return await paginate(db.pkl, page, where=where, include=include)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal mengambil data PKL: {str(e)}")
 
@@ -107,12 +120,12 @@ async def update_pkl(id: int, data: PKLCreate, user=Depends(authorize_access)):
         raise HTTPException(status_code=404, detail="❌ PKL tidak ditemukan")
 
     if role == "Murid":
-        murid = await db.murid.find_unique(where={"email": user["sub"]})
+        murid = await get_murid(db, user["sub"])
         if not murid or existing.murid_id != murid.id:
             raise HTTPException(status_code=403, detail="❌ Tidak boleh mengedit PKL murid lain")
 
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or existing.pembimbing_sekolah_id != guru.id:
             raise HTTPException(status_code=403, detail="❌ Tidak boleh mengedit PKL bimbingan guru lain")
 
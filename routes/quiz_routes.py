@@ -5,10 +5,16 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from core.permissions import authorize_access
 from main import db
+from core.principal import get_guru, get_murid
+from core.answer_key import invalidate_answer_key
+from core.soal_payload import invalidate_soal_payload
+from core.sideload import side_load
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Quiz"],
-    dependencies=[Depends(authorize_access)]  # ✅ Semua endpoint butuh JWT
+    dependencies=[Depends(authorize_access)],  # ✅ Semua endpoint butuh JWT
+    route_class=ORJSONRoute,
 )
 
 # SCHEMA: Data Quiz
@@ -35,7 +41,7 @@ async def create_quiz(data: QuizCreate, user=Depends(authorize_access)):
 
     # Jika Guru → otomatis isi guru_id berdasarkan akun login
     if role == "Guru" and not data.guru_id:
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru:
             raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
         data.guru_id = guru.id
@@ -53,35 +59,31 @@ async def get_all_quiz(user=Depends(authorize_access)):
     role = user.get("role")
 
     try:
+        # Relasi tidak di-include per baris: dikirim sekali di "included" (dikunci id)
         if role == "Admin":
-            quiz_list = await db.quiz.find_many(include={"mata_pelajaran": True, "kelas": True, "guru": True})
+            quiz_list = await db.quiz.find_many()
+            relations = ("mata_pelajaran", "kelas", "guru")
 
         elif role == "Guru":
-            guru = await db.guru.find_unique(where={"email": user["sub"]})
+            guru = await get_guru(db, user["sub"])
             if not guru:
                 raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
-            quiz_list = await db.quiz.find_many(
-                where={"guru_id": guru.id},
-                include={"mata_pelajaran": True, "kelas": True}
-            )
+            quiz_list = await db.quiz.find_many(where={"guru_id": guru.id})
+            relations = ("mata_pelajaran", "kelas")
 
         elif role == "Murid":
-            murid = await db.murid.find_unique(
-                where={"email": user["sub"]},
-                include={"kelas": True}
-            )
+            murid = await get_murid(db, user["sub"])
             if not murid:
                 raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
 
-            quiz_list = await db.quiz.find_many(
-                where={"kelas_id": murid.kelas_id},
-                include={"mata_pelajaran": True, "guru": True}
-            )
+            quiz_list = await db.quiz.find_many(where={"kelas_id": murid.kelas_id})
+            relations = ("mata_pelajaran", "guru")
 
         else:
             raise HTTPException(status_code=403, detail="Akses ditolak")
 
-        return {"total": len(quiz_list), "data": quiz_list}
+        included = await side_load(db, quiz_list, relations)
+        return {"total": len(quiz_list), "data": quiz_list, "included": included}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal mengambil quiz: {str(e)}")
 
@@ -89,13 +91,11 @@ async def get_all_quiz(user=Depends(authorize_access)):
 # READ — Ambil Quiz Berdasarkan ID (Semua Role)
 @router.get("/{id}", status_code=status.HTTP_200_OK)
 async def get_quiz(id: int, user=Depends(authorize_access)):
-    quiz = await db.quiz.find_unique(
-        where={"id": id},
-        include={"guru": True, "mata_pelajaran": True, "kelas": True}
-    )
+    quiz = await db.quiz.find_unique(where={"id": id})
     if not quiz:
         raise HTTPException(status_code=404, detail="❌ Quiz tidak ditemukan")
-    return {"data": quiz}
+    included = await side_load(db, [quiz], ("guru", "mata_pelajaran", "kelas"))
+    return {"data": quiz, "included": included}
 
 
 # UPDATE — Ubah Quiz (Admin & Guru Pemilik)
@@ -109,7 +109,7 @@ async def update_quiz(id: int, data: QuizCreate, user=Depends(authorize_access))
 
     # Guru hanya boleh ubah quiz miliknya
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or existing.guru_id != guru.id:
             raise HTTPException(status_code=403, detail="❌ Tidak bisa mengubah quiz milik guru lain")
 
@@ -118,6 +118,8 @@ async def update_quiz(id: int, data: QuizCreate, user=Depends(authorize_access))
 
     try:
         updated = await db.quiz.update(where={"id": id}, data=data.dict())
+        invalidate_answer_key(id)
+        invalidate_soal_payload(id)
         return {"message": "✅ Quiz berhasil diperbarui", "data": updated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal memperbarui quiz: {str(e)}")
@@ -134,7 +136,7 @@ async def delete_quiz(id: int, user=Depends(authorize_access)):
 
     # Guru hanya boleh hapus quiz miliknya
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or existing.guru_id != guru.id:
             raise HTTPException(status_code=403, detail="❌ Tidak bisa menghapus quiz milik guru lain")
 
@@ -143,6 +145,8 @@ async def delete_quiz(id: int, user=Depends(authorize_access)):
 
     try:
         await db.quiz.delete(where={"id": id})
+        invalidate_answer_key(id)
+        invalidate_soal_payload(id)
         return {"message": "🗑️ Quiz berhasil dihapus"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal menghapus quiz: {str(e)}")
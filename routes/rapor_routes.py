@@ -0,0 +1,62 @@
+# routes/rapor_routes.py — Export Data Rapor (RBAC Protected)
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, status
+from core.permissions import authorize_access
+from core.export import export_filters, export_response
+from core.responses import ORJSONRoute
+from main import db
+
+router = APIRouter(
+    tags=["Rapor"],
+    dependencies=[Depends(authorize_access)],
+    route_class=ORJSONRoute,
+)
+
+EXPORT_QUERY = """
+SELECT r.id, r.murid_id, m.nama AS murid,
+       r.kelas_id, k.nama_kelas AS kelas,
+       r.mata_pelajaran_id, mp.nama_mapel AS mata_pelajaran,
+       r.semester, r.tahun_ajaran,
+       r.nilai_tugas, r.nilai_quiz, r.nilai_uts, r.nilai_uas, r.nilai_praktik,
+       r.nilai_akhir, r.predikat, r.catatan,
+       r.guru_id, g.nama AS guru, r.created_at, r.updated_at
+FROM rapor r
+LEFT JOIN murid m ON m.id = r.murid_id
+LEFT JOIN kelas k ON k.id = r.kelas_id
+LEFT JOIN mata_pelajaran mp ON mp.id = r.mata_pelajaran_id
+LEFT JOIN guru g ON g.id = r.guru_id
+WHERE r.id > $1{filters}
+ORDER BY r.id
+LIMIT {batch_size}
+"""
+
+EXPORT_COLUMNS = [
+    "id", "murid_id", "murid", "kelas_id", "kelas", "mata_pelajaran_id", "mata_pelajaran",
+    "semester", "tahun_ajaran", "nilai_tugas", "nilai_quiz", "nilai_uts", "nilai_uas",
+    "nilai_praktik", "nilai_akhir", "predikat", "catatan", "guru_id", "guru",
+    "created_at", "updated_at",
+]
+
+
+# EXPORT — Seluruh Rapor sebagai stream NDJSON / CSV (Guru & Admin)
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_rapor(
+    format: str = "ndjson",
+    kelas_id: Optional[int] = None,
+    mata_pelajaran_id: Optional[int] = None,
+    semester: Optional[str] = None,
+    tahun_ajaran: Optional[str] = None,
+    dari: Optional[date] = None,
+    sampai: Optional[date] = None,
+    user=Depends(authorize_access),
+):
+    if user.get("role") not in ["Guru", "Admin"]:
+        raise HTTPException(status_code=403, detail="❌ Hanya Guru dan Admin yang dapat export rapor")
+
+    filters, args = export_filters(
+        "r", date_field="created_at", dari=dari, sampai=sampai,
+        kelas_id=kelas_id, mata_pelajaran_id=mata_pelajaran_id,
+        semester=semester, tahun_ajaran=tahun_ajaran,
+    )
+    return export_response(db, EXPORT_QUERY, filters, args, EXPORT_COLUMNS, format, "rapor")
@@ -1,12 +1,19 @@
 # routes/soal_quiz_routes.py — Manajemen Soal Quiz (RBAC Protected)
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel, Field
 from core.permissions import authorize_access
 from main import db
+from core.principal import get_guru
+from core.pagination import PageParams, filter_where, paginate
+from core.answer_key import invalidate_answer_key
+from core.soal_payload import invalidate_soal_payload
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Soal Quiz"],
-    dependencies=[Depends(authorize_access)]  # ✅ Semua endpoint butuh JWT
+    dependencies=[Depends(authorize_access)],  # ✅ Semua endpoint butuh JWT
+    route_class=ORJSONRoute,
 )
 
 # SCHEMA: Data Soal Quiz
@@ -37,12 +44,14 @@ async def create_soal_quiz(data: SoalQuizCreate, user=Depends(authorize_access))
 
     # 🔒 Jika Guru → pastikan quiz miliknya
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or quiz.guru_id != guru.id:
             raise HTTPException(status_code=403, detail="❌ Tidak bisa menambah soal pada quiz milik guru lain")
 
     try:
         created = await db.soal_quiz.create(data=data.dict())
+        invalidate_answer_key(data.quiz_id)
+        invalidate_soal_payload(data.quiz_id)
         return {"message": "✅ Soal quiz berhasil dibuat", "data": created}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal membuat soal quiz: {str(e)}")
@@ -50,33 +59,32 @@ async def create_soal_quiz(data: SoalQuizCreate, user=Depends(authorize_access))
 
 # READ — Ambil Semua Soal (Admin & Guru Pemilik)
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_soal(user=Depends(authorize_access)):
+async def get_all_soal(
+    page: PageParams = Depends(),
+    quiz_id: Optional[int] = None,
+    user=Depends(authorize_access),
+):
     role = user.get("role")
 
     try:
         if role == "Admin":
-            soal_list = await db.soal_quiz.find_many(include={"quiz": True})
+            scope = {}
 
         elif role == "Guru":
-            guru = await db.guru.find_unique(where={"email": user["sub"]})
+            guru = await get_guru(db, user["sub"])
             if not guru:
                 raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
-            soal_list = await db.soal_quiz.find_many(
-                where={"quiz": {"guru_id": guru.id}},
-                include={"quiz": True}
-            )
+            scope = {"quiz": {"guru_id": guru.id}}
 
         elif role == "Murid":
             # Murid hanya bisa lihat soal dari quiz yang aktif (status != Draft)
-            soal_list = await db.soal_quiz.find_many(
-                where={"quiz": {"status": {"not": "Draft"}}},
-                include={"quiz": True}
-            )
+            scope = {"quiz": {"status": {"not": "Draft"}}}
         else:
             raise HTTPException(status_code=403, detail="Akses ditolak")
 
-        return {"total": len(soal_list), "data": soal_list}
+        where = filter_where(scope, quiz_id=quiz_id)
+        return await paginate(db.soal_quiz, page, where=where, include={"quiz": True})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal mengambil soal: {str(e)}")
 
@@ -113,7 +121,7 @@ async def update_soal(id: int, data: SoalQuizCreate, user=Depends(authorize_acce
 
     #  Hanya Admin atau Guru pemilik quiz yang boleh ubah
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or existing.quiz.guru_id != guru.id:
             raise HTTPException(status_code=403, detail="❌ Tidak boleh mengubah soal milik guru lain")
 
@@ -122,6 +130,8 @@ async def update_soal(id: int, data: SoalQuizCreate, user=Depends(authorize_acce
 
     try:
         updated = await db.soal_quiz.update(where={"id": id}, data=data.dict())
+        invalidate_answer_key(existing.quiz_id, data.quiz_id)
+        invalidate_soal_payload(existing.quiz_id, data.quiz_id)
         return {"message": "✅ Soal quiz berhasil diperbarui", "data": updated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal memperbarui soal: {str(e)}")
@@ -141,7 +151,7 @@ async def delete_soal(id: int, user=Depends(authorize_access)):
 
     # 🔒 Hanya Admin atau Guru pemilik quiz
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or existing.quiz.guru_id != guru.id:
             raise HTTPException(status_code=403, detail="❌ Tidak boleh menghapus soal milik guru lain")
 
@@ -150,6 +160,8 @@ async def delete_soal(id: int, user=Depends(authorize_access)):
 
     try:
         await db.soal_quiz.delete(where={"id": id})
+        invalidate_answer_key(existing.quiz_id)
+        invalidate_soal_payload(existing.quiz_id)
         return {"message": "🗑️ Soal quiz berhasil dihapus"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal menghapus soal: {str(e)}")
\ No newline at end of file
@@ -2,15 +2,22 @@
 # 📘 routes/tugas_routes.py — Manajemen Tugas (RBAC Protected)
 # ===============================================================
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
 from core.permissions import authorize_access
+from plugin.cluster.feature_store import refresh_feature_store_kelas
 from main import db
+from core.cache import touch
+from core.principal import get_guru, get_murid
+from core.pagination import PageParams, filter_where, paginate
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Tugas"],
-    dependencies=[Depends(authorize_access)]  # ✅ Semua endpoint butuh JWT
+    dependencies=[Depends(authorize_access)],  # ✅ Semua endpoint butuh JWT
+    route_class=ORJSONRoute,
 )
 
 # ===============================================================
@@ -31,7 +38,7 @@ class TugasCreate(BaseModel):
 # 🧩 CREATE — Tambah Tugas (Hanya Guru)
 # ===============================================================
 @router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_tugas(data: TugasCreate, user=Depends(authorize_access)):
+async def create_tugas(data: TugasCreate, background_tasks: BackgroundTasks, user=Depends(authorize_access)):
     role = user.get("role")
 
     # ❌ Hanya Guru yang boleh membuat tugas
@@ -39,7 +46,7 @@ async def create_tugas(data: TugasCreate, user=Depends(authorize_access)):
         raise HTTPException(status_code=403, detail="❌ Hanya Guru yang dapat membuat tugas")
 
     # ✅ Isi guru_id otomatis berdasarkan akun login
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
     if not guru:
         raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
 
@@ -47,6 +54,8 @@ async def create_tugas(data: TugasCreate, user=Depends(authorize_access)):
 
     try:
         created = await db.tugas.create(data=data.dict())
+        touch("tugas")
+        background_tasks.add_task(refresh_feature_store_kelas, db, created.kelas_id)
         return {"message": "✅ Tugas berhasil dibuat", "data": created}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal membuat tugas: {str(e)}")
@@ -55,40 +64,46 @@ async def create_tugas(data: TugasCreate, user=Depends(authorize_access)):
 # 📜 READ — Ambil Semua Tugas (Admin, Guru, Murid)
 # ===============================================================
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_tugas(user=Depends(authorize_access)):
+async def get_all_tugas(
+    page: PageParams = Depends(),
+    kelas_id: Optional[int] = None,
+    mata_pelajaran_id: Optional[int] = None,
+    dari: Optional[date] = None,
+    sampai: Optional[date] = None,
+    user=Depends(authorize_access),
+):
     role = user.get("role")
 
     try:
         if role == "Guru":
             # Guru -> hanya tugas yang dia buat
-            guru = await db.guru.find_unique(where={"email": user["sub"]})
+            guru = await get_guru(db, user["sub"])
             if not guru:
                 raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
-            tugas_list = await db.tugas.find_many(
-                where={"guru_id": guru.id},
-                include={"kelas": True, "mata_pelajaran": True}
-            )
+            scope = {"guru_id": guru.id}
+            include = {"kelas": True, "mata_pelajaran": True}
 
         elif role == "Murid":
             # Murid -> hanya tugas untuk kelasnya
-            murid = await db.murid.find_unique(where={"email": user["sub"]}, include={"kelas": True})
+            murid = await get_murid(db, user["sub"])
             if not murid:
                 raise HTTPException(status_code=404, detail="Murid tidak ditemukan")
-            tugas_list = await db.tugas.find_many(
-                where={"kelas_id": murid.kelas_id},
-                include={"guru": True, "mata_pelajaran": True}
-            )
+            scope = {"kelas_id": murid.kelas_id}
+            include = {"guru": True, "mata_pelajaran": True}
 
         elif role == "Admin":
             # Admin -> hanya read semua tugas
-            tugas_list = await db.tugas.find_many(
-                include={"guru": True, "kelas": True, "mata_pelajaran": True}
-            )
+            scope = {}
+            include = {"guru": True, "kelas": True, "mata_pelajaran": True}
 
         else:
             raise HTTPException(status_code=403, detail="❌ Akses ditolak")
 
-        return {"total": len(tugas_list), "data": tugas_list}
+        where = filter_where(
+            scope, dari=dari, sampai=sampai,
+            kelas_id=kelas_id, mata_pelajaran_id=mata_pelajaran_id,
+        )
+        return await paginate(db.tugas, page, where=where, include=include)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal mengambil data tugas: {str(e)}")
@@ -108,7 +123,7 @@ async def get_tugas(id: int, user=Depends(authorize_access)):
 
     # Murid hanya boleh melihat tugas dari kelasnya
     if user.get("role") == "Murid":
-        murid = await db.murid.find_unique(where={"email": user["sub"]}, include={"kelas": True})
+        murid = await get_murid(db, user["sub"])
         if not murid or tugas.kelas_id != murid.kelas_id:
             raise HTTPException(status_code=403, detail="❌ Tidak boleh melihat tugas dari kelas lain")
 
@@ -116,7 +131,7 @@ async def get_tugas(id: int, user=Depends(authorize_access)):
 
 # UPDATE — Ubah Tugas (Hanya Guru Pemilik)
 @router.put("/{id}", status_code=status.HTTP_200_OK)
-async def update_tugas(id: int, data: TugasCreate, user=Depends(authorize_access)):
+async def update_tugas(id: int, data: TugasCreate, background_tasks: BackgroundTasks, user=Depends(authorize_access)):
     role = user.get("role")
 
     if role != "Guru":
@@ -126,19 +141,23 @@ async def update_tugas(id: int, data: TugasCreate, user=Depends(authorize_access
     if not existing:
         raise HTTPException(status_code=404, detail="❌ Tugas tidak ditemukan")
 
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
     if not guru or existing.guru_id != guru.id:
         raise HTTPException(status_code=403, detail="❌ Tidak boleh memperbarui tugas milik guru lain")
 
     try:
         updated = await db.tugas.update(where={"id": id}, data=data.dict())
+        touch("tugas")
+        if existing.kelas_id != updated.kelas_id:
+            background_tasks.add_task(refresh_feature_store_kelas, db, existing.kelas_id)
+            background_tasks.add_task(refresh_feature_store_kelas, db, updated.kelas_id)
         return {"message": "✅ Tugas berhasil diperbarui", "data": updated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal memperbarui tugas: {str(e)}")
 
 # DELETE — Hapus Tugas (Hanya Guru Pemilik)
 @router.delete("/{id}", status_code=status.HTTP_200_OK)
-async def delete_tugas(id: int, user=Depends(authorize_access)):
+async def delete_tugas(id: int, background_tasks: BackgroundTasks, user=Depends(authorize_access)):
     role = user.get("role")
 
     if role != "Guru":
@@ -148,12 +167,14 @@ async def delete_tugas(id: int, user=Depends(authorize_access)):
     if not existing:
         raise HTTPException(status_code=404, detail="❌ Tugas tidak ditemukan")
 
-    guru = await db.guru.find_unique(where={"email": user["sub"]})
+    guru = await get_guru(db, user["sub"])
     if not guru or existing.guru_id != guru.id:
         raise HTTPException(status_code=403, detail="❌ Tidak boleh menghapus tugas milik guru lain")
 
     try:
         await db.tugas.delete(where={"id": id})
+        touch("tugas")
+        background_tasks.add_task(refresh_feature_store_kelas, db, existing.kelas_id)
         return {"message": "🗑️ Tugas berhasil dihapus"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gagal menghapus tugas: {str(e)}")
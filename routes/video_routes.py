@@ -1,12 +1,16 @@
 # routes/video_routes.py — Manajemen Video Kegiatan (RBAC Protected)
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
 from pydantic import BaseModel, Field
 from core.permissions import authorize_access
 from main import db
+from core.principal import get_guru
+from core.etag import conditional_get
+from core.responses import ORJSONRoute
 
 router = APIRouter(
     tags=["Video Kegiatan"],
-    dependencies=[Depends(authorize_access)]  # ✅ Semua endpoint butuh JWT
+    dependencies=[Depends(authorize_access)],  # ✅ Semua endpoint butuh JWT
+    route_class=ORJSONRoute,
 )
 
 # SCHEMA: Data Video Kegiatan
@@ -33,7 +37,7 @@ async def create_video(data: VideoCreate, user=Depends(authorize_access)):
 
     # Auto isi uploaded_by jika Guru login
     if role == "Guru" and not data.uploaded_by:
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru:
             raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
         data.uploaded_by = guru.id
@@ -47,23 +51,33 @@ async def create_video(data: VideoCreate, user=Depends(authorize_access)):
 
 # READ — Ambil Semua Video (Semua Role)
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_video(user=Depends(authorize_access)):
+async def get_all_video(request: Request, response: Response, user=Depends(authorize_access)):
     role = user.get("role")
+    tables = ("video_kegiatan", "jurusan", "admin")
 
     try:
         if role == "Admin":
+            not_modified = await conditional_get(request, response, db, tables, role)
+            if not_modified:
+                return not_modified
             video_list = await db.video_kegiatan.find_many(include={"jurusan": True, "admin": True})
 
         elif role == "Guru":
-            guru = await db.guru.find_unique(where={"email": user["sub"]})
+            guru = await get_guru(db, user["sub"])
             if not guru:
                 raise HTTPException(status_code=404, detail="Guru tidak ditemukan")
+            not_modified = await conditional_get(request, response, db, tables, role, guru.id)
+            if not_modified:
+                return not_modified
             video_list = await db.video_kegiatan.find_many(
                 where={"uploaded_by": guru.id},
                 include={"jurusan": True}
             )
 
         elif role == "Murid":
+            not_modified = await conditional_get(request, response, db, tables, role)
+            if not_modified:
+                return not_modified
             video_list = await db.video_kegiatan.find_many(
                 where={"status": "Active"},
                 include={"jurusan": True}
@@ -105,7 +119,7 @@ async def update_video(id: int, data: VideoCreate, user=Depends(authorize_access
 
     # Guru hanya boleh ubah video miliknya
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or existing.uploaded_by != guru.id:
             raise HTTPException(status_code=403, detail="❌ Tidak boleh mengubah video milik guru lain")
 
@@ -130,7 +144,7 @@ async def delete_video(id: int, user=Depends(authorize_access)):
 
     # Guru hanya boleh hapus video miliknya
     if role == "Guru":
-        guru = await db.guru.find_unique(where={"email": user["sub"]})
+        guru = await get_guru(db, user["sub"])
         if not guru or existing.uploaded_by != guru.id:
             raise HTTPException(status_code=403, detail="❌ Tidak boleh menghapus video milik guru lain")
 
@@ -0,0 +1,42 @@
+# scripts/bench_cluster_inference.py — Paritas & latensi jalur cepat NumPy vs sklearn
+# Jalankan dari root repo: python scripts/bench_cluster_inference.py
+import os
+import sys
+import timeit
+import warnings
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.filterwarnings("ignore")
+
+from plugin.cluster.model_loader import get_active_model
+
+N_ROWS = 5000
+REPEAT = 2000
+
+
+def main():
+    mv = get_active_model()
+    rng = np.random.default_rng(42)
+    rows = mv.mean + rng.normal(size=(N_ROWS, len(mv.mean))) * mv.scale * 2
+
+    # Paritas: label harus identik
+    fast = mv.predict_fast(rows)
+    slow = mv.predict_sklearn(rows)
+    mismatch = int((fast != slow).sum())
+    print(f"Paritas {N_ROWS} baris: {'OK' if mismatch == 0 else f'{mismatch} berbeda'}")
+
+    # Latensi per panggilan (1 murid)
+    one = rows[:1]
+    t_fast = min(timeit.repeat(lambda: mv.predict_fast(one), number=REPEAT, repeat=3)) / REPEAT
+    t_slow = min(timeit.repeat(lambda: mv.predict_sklearn(one), number=REPEAT, repeat=3)) / REPEAT
+    print(f"1 baris     : numpy {t_fast * 1e6:8.1f} µs | sklearn {t_slow * 1e6:8.1f} µs | {t_slow / t_fast:5.1f}x")
+
+    # Latensi batch
+    t_fast = min(timeit.repeat(lambda: mv.predict_fast(rows), number=20, repeat=3)) / 20
+    t_slow = min(timeit.repeat(lambda: mv.predict_sklearn(rows), number=20, repeat=3)) / 20
+    print(f"{N_ROWS} baris  : numpy {t_fast * 1e3:8.2f} ms | sklearn {t_slow * 1e3:8.2f} ms | {t_slow / t_fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
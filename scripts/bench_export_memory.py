@@ -0,0 +1,79 @@
+# scripts/bench_export_memory.py — Export 1 juta baris sintetis, memori harus tetap di bawah batas
+# Jalankan dari root repo: python scripts/bench_export_memory.py [ndjson|csv]
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.export import export_response
+
+N_ROWS = 1_000_000
+MEMORY_CEILING_MB = 32
+
+QUERY = "SELECT * FROM absensi a WHERE a.id > $1{filters} ORDER BY a.id LIMIT {batch_size}"
+COLUMNS = ["id", "tanggal", "status", "keterangan", "murid_id", "murid", "kelas_id", "kelas"]
+
+
+class FakeDB:
+    """Meniru db.query_raw untuk keyset scan: baris dibuat on the fly, tidak disimpan."""
+
+    def __init__(self, n_rows: int, batch_size: int):
+        self.n_rows = n_rows
+        self.batch_size = batch_size
+        self.queries = 0
+
+    async def query_raw(self, sql, cursor, *args):
+        self.queries += 1
+        start = cursor + 1
+        end = min(cursor + self.batch_size, self.n_rows)
+        return [
+            {
+                "id": i,
+                "tanggal": "2025-01-01T07:00:00",
+                "status": "Hadir",
+                "keterangan": None,
+                "murid_id": i % 900 + 1,
+                "murid": f"Murid {i % 900 + 1}",
+                "kelas_id": i % 30 + 1,
+                "kelas": f"X RPL {i % 30 + 1}",
+            }
+            for i in range(start, end + 1)
+        ]
+
+
+async def main(fmt: str):
+    from core.export import EXPORT_BATCH_SIZE
+
+    db = FakeDB(N_ROWS, EXPORT_BATCH_SIZE)
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    response = export_response(db, QUERY, "", [], COLUMNS, fmt, "absensi")
+    total_bytes = 0
+    lines = 0
+    async for chunk in response.body_iterator:
+        total_bytes += len(chunk)
+        lines += chunk.count("\n")
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    expected_lines = N_ROWS + (1 if fmt == "csv" else 0)
+    peak_mb = peak / 1024 / 1024
+    print(
+        f"{fmt}: {lines:,} baris | {total_bytes / 1024 / 1024:.1f} MB output | {db.queries} query | "
+        f"{elapsed:.1f} s | puncak memori {peak_mb:.1f} MB (batas {MEMORY_CEILING_MB} MB)"
+    )
+
+    ok = lines == expected_lines and peak_mb < MEMORY_CEILING_MB
+    print("OK" if ok else "GAGAL")
+    return ok
+
+
+if __name__ == "__main__":
+    fmt = sys.argv[1] if len(sys.argv) > 1 else "ndjson"
+    sys.exit(0 if asyncio.run(main(fmt)) else 1)
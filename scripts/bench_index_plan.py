@@ -0,0 +1,149 @@
+# scripts/bench_index_plan.py — Rencana query (EXPLAIN) sebelum vs sesudah migrasi indeks
+# Khusus database LOKAL/throwaway (indeks di-drop lalu dibuat ulang, data sintetis ditambahkan):
+#   DATABASE_URL=postgresql://.../sekolah_bench python scripts/bench_index_plan.py --seed
+import asyncio
+import json
+import os
+import re
+import sys
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "models", "db", "migrations",
+)
+
+N_MURID = 5_000
+N_BESAR = 200_000   # absensi, hasil_quiz, pengumpulan_tugas
+N_SEDANG = 20_000   # quiz, soal_quiz, materi, tugas, rapor
+
+# Seed tanpa tabel master: FK dimatikan sementara (session_replication_role = replica),
+# id relasi dibuat dengan modulo agar selektivitas predikat realistis.
+SEED_QUERIES = [
+    f"""INSERT INTO murid (nama, email, password, kelas_id, jurusan_id)
+        SELECT 'Bench ' || g, 'bench' || g || '@bench.local', 'x', 1 + g % 60, 1 + g % 5
+        FROM generate_series(1, {N_MURID}) g ON CONFLICT DO NOTHING""",
+    f"""INSERT INTO quiz (judul, mata_pelajaran_id, kelas_id, guru_id, status)
+        SELECT 'Quiz ' || g, 1 + g % 20, 1 + (g / 20) % 60, 1 + g % 80,
+               (ARRAY['Draft', 'Active', 'Closed'])[1 + g % 3]
+        FROM generate_series(1, {N_SEDANG}) g""",
+    f"""INSERT INTO soal_quiz (quiz_id, pertanyaan, pilihan_a, pilihan_b, pilihan_c, pilihan_d, jawaban_benar)
+        SELECT 1 + g % {N_SEDANG}, 'Soal ' || g, 'a', 'b', 'c', 'd', 'A'
+        FROM generate_series(1, {N_SEDANG * 5}) g""",
+    f"""INSERT INTO hasil_quiz (quiz_id, murid_id, mata_pelajaran_id, score)
+        SELECT 1 + g % {N_SEDANG}, 1 + (g / {N_SEDANG}) % {N_MURID}, 1 + g % 20, g % 101
+        FROM generate_series(1, {N_BESAR}) g""",
+    f"""INSERT INTO materi (judul, konten, mata_pelajaran_id, kelas_id, guru_id)
+        SELECT 'Materi ' || g, 'isi', 1 + g % 20, 1 + (g / 20) % 60, 1 + g % 80
+        FROM generate_series(1, {N_SEDANG}) g""",
+    f"""INSERT INTO absensi (murid_id, mata_pelajaran_id, kelas_id, guru_id, tanggal, status)
+        SELECT 1 + g % {N_MURID}, 1 + (g / {N_MURID}) % 20, 1 + g % 60, 1 + g % 80,
+               DATE '2025-07-01' + (g / 100000), (ARRAY['Hadir', 'Izin', 'Sakit', 'Alpha'])[1 + g % 4]
+        FROM generate_series(1, {N_BESAR}) g""",
+    f"""INSERT INTO tugas (judul, mata_pelajaran_id, kelas_id, guru_id)
+        SELECT 'Tugas ' || g, 1 + g % 20, 1 + (g / 20) % 60, 1 + g % 80
+        FROM generate_series(1, {N_SEDANG}) g""",
+    f"""INSERT INTO pengumpulan_tugas (tugas_id, murid_id, nilai)
+        SELECT 1 + g % {N_SEDANG}, 1 + (g / {N_SEDANG}) % {N_MURID}, g % 101
+        FROM generate_series(1, {N_BESAR}) g""",
+    f"""INSERT INTO rapor (murid_id, mata_pelajaran_id, guru_id, semester, tahun_ajaran, nilai_akhir)
+        SELECT 1 + g % {N_MURID}, 1 + (g / {N_MURID}) % 20, 1 + g % 80, 'Ganjil',
+               (2000 + g / 100000) || '/' || (2001 + g / 100000), g % 101
+        FROM generate_series(1, {N_SEDANG}) g""",
+]
+
+# Predikat panas dari routes/ dan plugin/
+HOT_QUERIES = {
+    "hasil_quiz (quiz_id, murid_id)": "SELECT id FROM hasil_quiz WHERE quiz_id = 7 AND murid_id = 42",
+    "hasil_quiz (murid_id)": "SELECT * FROM hasil_quiz WHERE murid_id = 42",
+    "quiz (mapel, kelas, status)": "SELECT * FROM quiz WHERE mata_pelajaran_id = 3 AND kelas_id = 5 AND status = 'Active'",
+    "soal_quiz (quiz_id)": "SELECT * FROM soal_quiz WHERE quiz_id = 7",
+    "materi (mapel, kelas)": "SELECT * FROM materi WHERE mata_pelajaran_id = 3 AND kelas_id = 5",
+    "absensi (guru_id, status)": "SELECT COUNT(*) FROM absensi WHERE guru_id = 9 AND status = 'Hadir'",
+    "tugas (kelas_id)": "SELECT * FROM tugas WHERE kelas_id = 5",
+    "rapor (guru_id)": "SELECT AVG(nilai_akhir) FROM rapor WHERE guru_id = 9",
+    "murid (kelas_id)": "SELECT id FROM murid WHERE kelas_id = 5",
+}
+
+
+def migration_statements() -> list:
+    """Semua CREATE INDEX dari file migrasi, urut nama file (indeks yang kemudian di-drop dilewati)."""
+    statements, dropped = [], set()
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        with open(os.path.join(MIGRATIONS_DIR, name)) as f:
+            sql = re.sub(r"--.*", "", f.read())
+        for statement in (s.strip() for s in sql.split(";")):
+            if re.match(r"CREATE (UNIQUE )?INDEX", statement):
+                statements.append(statement)
+            elif statement.startswith("DROP INDEX"):
+                dropped.add(statement.split()[-1])
+    return [s for s in statements if index_names([s])[0] not in dropped]
+
+
+def index_names(statements: list) -> list:
+    return [re.search(r"IF NOT EXISTS (\w+)", s).group(1) for s in statements]
+
+
+def scan_nodes(plan: dict) -> list:
+    """Ringkas plan JSON: daftar 'Node Type [index]' untuk setiap scan."""
+    nodes = []
+    if "Scan" in plan["Node Type"]:
+        label = plan["Node Type"]
+        if plan.get("Index Name"):
+            label += f" [{plan['Index Name']}]"
+        nodes.append(label)
+    for child in plan.get("Plans", []):
+        nodes += scan_nodes(child)
+    return nodes
+
+
+async def explain(db) -> dict:
+    result = {}
+    for label, sql in HOT_QUERIES.items():
+        rows = await db.query_raw(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = rows[0]["QUERY PLAN"]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        top = plan[0]
+        result[label] = (", ".join(scan_nodes(top["Plan"])), top["Plan"]["Total Cost"])
+    return result
+
+
+async def main(seed: bool):
+    from generated.prisma import Prisma
+
+    db = Prisma()
+    await db.connect()
+    try:
+        if seed:
+            print("🌱 Seeding data sintetis...")
+            async with db.tx(timeout=timedelta(minutes=10)) as tx:
+                await tx.execute_raw("SET LOCAL session_replication_role = replica")
+                for sql in SEED_QUERIES:
+                    await tx.execute_raw(sql)
+
+        statements = migration_statements()
+
+        for name in index_names(statements):
+            await db.execute_raw(f"DROP INDEX IF EXISTS {name}")
+        await db.execute_raw("ANALYZE")
+        before = await explain(db)
+
+        for sql in statements:
+            await db.execute_raw(sql)
+        await db.execute_raw("ANALYZE")
+        after = await explain(db)
+    finally:
+        await db.disconnect()
+
+    for label in HOT_QUERIES:
+        (plan_a, cost_a), (plan_b, cost_b) = before[label], after[label]
+        print(f"\n{label}")
+        print(f"  sebelum: {plan_a:<60} cost {cost_a:>10.1f}")
+        print(f"  sesudah: {plan_b:<60} cost {cost_b:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(seed="--seed" in sys.argv))
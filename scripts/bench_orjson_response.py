@@ -0,0 +1,209 @@
+# scripts/bench_orjson_response.py — Serialisasi 5.000 baris get_all_absensi (include murid, kelas, mapel, guru)
+# jsonable_encoder + JSONResponse (default FastAPI) vs ORJSONRoute (core/responses.py).
+# Model di bawah meniru bentuk model Prisma hasil generate (pydantic v2: kolom + relasi opsional;
+# nama kelas dikapitalisasi agar tidak bentrok dengan nama field relasi),
+# agar benchmark bisa jalan tanpa database / prisma generate.
+# Jalankan dari root repo: python scripts/bench_orjson_response.py
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import APIRouter, FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from core.responses import ORJSONResponse, ORJSONRoute
+
+N_ROWS = 5000
+REPEAT = 5
+
+
+class Guru(BaseModel):
+    id: int
+    nip: Optional[str] = None
+    nama: str
+    email: str
+    password: str
+    role: str
+    mata_pelajaran_text: Optional[str] = None
+    foto_profil: Optional[str] = None
+    no_telepon: Optional[str] = None
+    alamat: Optional[str] = None
+    status: str
+    created_at: datetime
+    kelas: Optional[List["Kelas"]] = None
+    mata_pelajaran: Optional[List["MataPelajaran"]] = None
+    absensi: Optional[List["Absensi"]] = None
+
+
+class Kelas(BaseModel):
+    id: int
+    nama_kelas: str
+    tingkat: str
+    jurusan_id: Optional[int] = None
+    wali_kelas_id: Optional[int] = None
+    tahun_ajaran: str
+    kapasitas: Optional[int] = None
+    created_at: datetime
+    wali_kelas: Optional[Guru] = None
+    murid: Optional[List["Murid"]] = None
+    absensi: Optional[List["Absensi"]] = None
+
+
+class MataPelajaran(BaseModel):
+    id: int
+    kode_mapel: Optional[str] = None
+    nama_mapel: str
+    deskripsi: Optional[str] = None
+    kelas_id: Optional[int] = None
+    jurusan_id: Optional[int] = None
+    guru_id: Optional[int] = None
+    created_at: datetime
+    guru: Optional[Guru] = None
+    absensi: Optional[List["Absensi"]] = None
+
+
+class Murid(BaseModel):
+    id: int
+    nis: Optional[str] = None
+    nisn: Optional[str] = None
+    nama: str
+    email: str
+    password: str
+    role: str
+    kelas_id: Optional[int] = None
+    jurusan_id: Optional[int] = None
+    foto_profil: Optional[str] = None
+    tanggal_lahir: Optional[datetime] = None
+    jenis_kelamin: Optional[str] = None
+    no_telepon: Optional[str] = None
+    alamat: Optional[str] = None
+    nama_ortu: Optional[str] = None
+    no_telepon_ortu: Optional[str] = None
+    is_verified: bool
+    verified_by: Optional[int] = None
+    status: str
+    created_at: datetime
+    kelas: Optional[Kelas] = None
+    absensi: Optional[List["Absensi"]] = None
+    hasil_quiz: Optional[List[dict]] = None
+
+
+class Absensi(BaseModel):
+    id: int
+    murid_id: Optional[int] = None
+    kelas_id: Optional[int] = None
+    mata_pelajaran_id: Optional[int] = None
+    tanggal: datetime
+    status: str
+    keterangan: Optional[str] = None
+    guru_id: Optional[int] = None
+    created_at: datetime
+    murid: Optional[Murid] = None
+    kelas: Optional[Kelas] = None
+    mata_pelajaran: Optional[MataPelajaran] = None
+    guru: Optional[Guru] = None
+
+
+for model in (Guru, Kelas, MataPelajaran, Murid, Absensi):
+    model.model_rebuild()
+
+
+def build_rows() -> list:
+    now = datetime(2025, 9, 1, 7, 0)
+    gurus = [Guru(id=i, nama=f"Guru {i}", email=f"guru{i}@sekolah.sch.id", password="$argon2id$...",
+                  role="Guru", status="Aktif", created_at=now) for i in range(1, 81)]
+    kelass = [Kelas(id=i, nama_kelas=f"X RPL {i}", tingkat="X", jurusan_id=1 + i % 5, tahun_ajaran="2025/2026",
+                    kapasitas=36, created_at=now) for i in range(1, 61)]
+    mapels = [MataPelajaran(id=i, kode_mapel=f"MP{i}", nama_mapel=f"Mapel {i}", kelas_id=1 + i % 60,
+                             guru_id=1 + i % 80, created_at=now) for i in range(1, 21)]
+    murids = [Murid(id=i, nis=str(10000 + i), nama=f"Murid {i}", email=f"murid{i}@sekolah.sch.id",
+                    password="$argon2id$...", role="Murid", kelas_id=1 + i % 60, is_verified=True,
+                    status="Aktif", created_at=now, tanggal_lahir=now - timedelta(days=5800 + i))
+              for i in range(1, 1001)]
+
+    return [
+        Absensi(
+            id=i, murid_id=murids[i % 1000].id, kelas_id=kelass[i % 60].id,
+            mata_pelajaran_id=mapels[i % 20].id, guru_id=gurus[i % 80].id,
+            tanggal=now + timedelta(days=i // 200), status=("Hadir", "Izin", "Sakit", "Alpha")[i % 4],
+            keterangan=None if i % 7 else "Surat dokter", created_at=now,
+            murid=murids[i % 1000], kelas=kelass[i % 60], mata_pelajaran=mapels[i % 20], guru=gurus[i % 80],
+        )
+        for i in range(N_ROWS, 0, -1)
+    ]
+
+
+def payload(rows: list) -> dict:
+    # bentuk yang dikembalikan paginate()
+    return {"total": len(rows), "limit": len(rows), "next_cursor": None, "data": rows}
+
+
+def measure(label: str, serialize, content) -> bytes:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        body = serialize(content)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    serialize(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<36} {best * 1e3:>8.1f} ms   peak {peak / 2**20:>7.1f} MiB   body {len(body) / 2**20:.1f} MiB")
+    return body
+
+
+def http_roundtrip(content):
+    """End-to-end lewat FastAPI: route default vs ORJSONRoute dengan handler yang sama."""
+    results = {}
+    for label, route_class, response_class in (
+        ("APIRoute + JSONResponse", APIRoute, JSONResponse),
+        ("ORJSONRoute + ORJSONResponse", ORJSONRoute, ORJSONResponse),
+    ):
+        router = APIRouter(route_class=route_class)
+
+        @router.get("/absensi/")
+        async def get_all_absensi():
+            return content
+
+        app = FastAPI(default_response_class=response_class)
+        app.include_router(router)
+        client = TestClient(app)
+
+        best = float("inf")
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            response = client.get("/absensi/")
+            best = min(best, time.perf_counter() - start)
+        assert response.status_code == 200
+        results[label] = response.json()
+        print(f"HTTP {label:<31} {best * 1e3:>8.1f} ms")
+    return results
+
+
+def main():
+    content = payload(build_rows())
+    print(f"{N_ROWS} baris absensi + include murid/kelas/mata_pelajaran/guru, terbaik dari {REPEAT}\n")
+
+    default_body = measure("jsonable_encoder + JSONResponse", lambda c: JSONResponse(jsonable_encoder(c)).body, content)
+    orjson_body = measure("ORJSONResponse (tanpa encoder)", lambda c: ORJSONResponse(c).body, content)
+    assert json.loads(default_body) == json.loads(orjson_body), "Isi JSON berbeda"
+    print()
+
+    results = http_roundtrip(content)
+    assert len({json.dumps(body, sort_keys=True) for body in results.values()}) == 1
+    print("\nIsi JSON identik untuk kedua jalur ✅")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# scripts/bench_password_pool.py — Throughput login bersamaan: argon2 di event loop vs pool thread
+# Jalankan dari root repo: python scripts/bench_password_pool.py
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import auth
+from core.auth import hash_password, verify_password, verify_password_async, password_pool_stats
+
+CONCURRENT_LOGINS = 64
+TICK_SECONDS = 0.005
+
+
+async def _ticker(stop: asyncio.Event, lags: list):
+    """Ukur keterlambatan event loop: selisih jadwal tidur vs kenyataan."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def _run(label: str, login):
+    hashed = hash_password("rahasia123")
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[login("rahasia123", hashed) for _ in range(CONCURRENT_LOGINS)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    assert all(results)
+
+    worst_lag = max(lags) * 1e3 if lags else elapsed * 1e3
+    print(
+        f"{label:<12}: {CONCURRENT_LOGINS / elapsed:7.1f} login/s | "
+        f"total {elapsed * 1e3:7.1f} ms | lag event loop maks {worst_lag:7.1f} ms"
+    )
+
+
+async def _blocking_login(password, hashed):
+    # perilaku lama: argon2 langsung di handler async
+    return verify_password(password, hashed)
+
+
+async def main():
+    # benchmark mengukur throughput, bukan backpressure
+    auth.PASSWORD_QUEUE_LIMIT = CONCURRENT_LOGINS
+
+    print(f"{CONCURRENT_LOGINS} login bersamaan, pool {auth.PASSWORD_POOL_SIZE} thread")
+    await _run("event loop", _blocking_login)
+    await _run("pool thread", verify_password_async)
+    print("Statistik pool:", password_pool_stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+# scripts/bench_sideload_payload.py — Ukuran payload get_all_quiz (Admin):
+# include guru/kelas/mata_pelajaran per baris vs relasi sekali di "included" (core/sideload.py).
+# Baris relasi berbentuk hasil find_many (semua kolom, termasuk password) vs proyeksi INCLUDED_COLUMNS.
+# Jalankan dari root repo: python scripts/bench_sideload_payload.py
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.responses import dumps
+from core.sideload import INCLUDED_COLUMNS, side_load
+
+N_QUIZ = 800
+NOW = datetime(2025, 9, 1, 7, 0)
+
+TABLES = {
+    "guru": {
+        i: {"id": i, "nip": f"1987{i:04d}", "nama": f"Guru {i}", "email": f"guru{i}@sekolah.sch.id",
+            "password": "$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 66, "role": "Guru",
+            "mata_pelajaran_text": "Pemrograman", "foto_profil": f"/uploads/guru/{i}.jpg",
+            "no_telepon": "08123456789", "alamat": "Jl. Merdeka No. 1", "status": "Aktif", "created_at": NOW}
+        for i in range(1, 41)
+    },
+    "kelas": {
+        i: {"id": i, "nama_kelas": f"X RPL {i}", "tingkat": "X", "jurusan_id": 1 + i % 5,
+            "tahun_ajaran": "2025/2026", "wali_kelas_id": i, "kapasitas": 36, "created_at": NOW}
+        for i in range(1, 31)
+    },
+    "mata_pelajaran": {
+        i: {"id": i, "kode_mapel": f"MP{i}", "nama_mapel": f"Mapel {i}", "deskripsi": "Deskripsi " * 20,
+            "kategori": "Produktif", "tingkat_kesulitan": "Menengah", "jurusan_id": 1, "guru_id": i,
+            "kelas_id": i, "created_at": NOW}
+        for i in range(1, 21)
+    },
+}
+
+
+class FakeDB:
+    """query_raw untuk SELECT <kolom> FROM <tabel> WHERE id = ANY($1)."""
+
+    def __init__(self):
+        self.queries = 0
+
+    async def query_raw(self, sql, ids):
+        self.queries += 1
+        table = sql.split(" FROM ")[1].split()[0]
+        columns = INCLUDED_COLUMNS[table]
+        return [{c: TABLES[table][i][c] for c in columns} for i in ids]
+
+
+def quiz_rows() -> list:
+    return [
+        {"id": i, "judul": f"Quiz {i}", "deskripsi": None, "mata_pelajaran_id": 1 + i % 20,
+         "kelas_id": 1 + i % 30, "guru_id": 1 + i % 40, "durasi": 60, "tanggal_mulai": NOW,
+         "tanggal_selesai": None, "status": "Active", "created_at": NOW}
+        for i in range(N_QUIZ, 0, -1)
+    ]
+
+
+async def main():
+    rows = quiz_rows()
+    relations = ("mata_pelajaran", "kelas", "guru")
+
+    nested = [{**row, **{rel: TABLES[rel][row[f"{rel}_id"]] for rel in relations}} for row in rows]
+    before = dumps({"total": len(nested), "data": nested})
+
+    db = FakeDB()
+    included = await side_load(db, rows, relations)
+    after = dumps({"total": len(rows), "data": rows, "included": included})
+
+    assert b"password" in before and b"password" not in after
+    for row in rows:
+        for rel in relations:
+            assert row[f"{rel}_id"] in included[rel]
+
+    print(f"{N_QUIZ} quiz, relasi guru/kelas/mata_pelajaran")
+    print(f"include per baris      {len(before) / 1024:>8.1f} KiB")
+    print(f"included (side-load)   {len(after) / 1024:>8.1f} KiB   ({len(after) / len(before):.0%}, "
+          f"{db.queries} query relasi)")
+    print(f"entitas relasi dikirim  {sum(len(v) for v in included.values())} (sebelumnya {N_QUIZ * len(relations)})")
+    json.loads(after)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
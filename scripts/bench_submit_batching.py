@@ -0,0 +1,129 @@
+# scripts/bench_submit_batching.py — 1.000 submitter serentak: insert per baris vs SubmitBuffer
+# DB disimulasikan dengan latensi round trip tetap (default 5 ms, seperti Postgres remote),
+# sehingga yang diukur adalah jumlah round trip & waktu tunggu submitter, bukan Postgres.
+# Jalankan dari root repo: python scripts/bench_submit_batching.py [latensi_ms]
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.submit_buffer import SubmitBuffer, read_wal
+
+N_SUBMITTERS = 1000
+# koneksi Prisma terbatas → round trip ke DB antre
+DB_CONNECTIONS = 10
+
+
+class SimulatedHasilQuiz:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.rows = {}
+        self.round_trips = 0
+        self._slots = asyncio.Semaphore(DB_CONNECTIONS)
+
+    async def _round_trip(self):
+        async with self._slots:
+            self.round_trips += 1
+            await asyncio.sleep(self.latency)
+
+    async def create(self, data: dict):
+        await self._round_trip()
+        self.rows.setdefault((data["quiz_id"], data["murid_id"]), data)
+
+    async def create_many(self, data: list, skip_duplicates: bool = False):
+        await self._round_trip()
+        for row in data:
+            self.rows.setdefault((row["quiz_id"], row["murid_id"]), row)
+        return len(data)
+
+
+class SimulatedDB:
+    def __init__(self, latency: float):
+        self.hasil_quiz = SimulatedHasilQuiz(latency)
+
+
+def row(murid_id: int) -> dict:
+    return {"murid_id": murid_id, "quiz_id": 1, "mata_pelajaran_id": 1,
+            "score": 80, "total_soal": 10, "jawaban_benar": 8}
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[int(p * (len(values) - 1))] * 1e3
+
+
+async def submitters(handler) -> tuple:
+    latencies = []
+
+    async def one(murid_id):
+        start = time.perf_counter()
+        await handler(murid_id)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(1, N_SUBMITTERS + 1)])
+    return time.perf_counter() - start, latencies
+
+
+async def per_row(latency: float):
+    db = SimulatedDB(latency)
+    elapsed, latencies = await submitters(lambda murid_id: db.hasil_quiz.create(row(murid_id)))
+    return db, elapsed, latencies
+
+
+async def batched(latency: float, wal_dir: str):
+    db = SimulatedDB(latency)
+    buffer = SubmitBuffer(wal_dir=wal_dir, interval_ms=50, max_rows=250)
+    await buffer.start(db)
+
+    async def handler(murid_id):
+        buffer.add(row(murid_id), {"message": "Quiz berhasil disubmit"})
+
+    elapsed, latencies = await submitters(handler)
+    await buffer.stop()
+    return db, elapsed, latencies
+
+
+async def crash_replay(latency: float, wal_dir: str) -> int:
+    """Proses 'mati' sebelum flush: buffer tidak di-stop, lalu proses baru me-replay WAL."""
+    crashed = SubmitBuffer(wal_dir=wal_dir, interval_ms=60_000, max_rows=10_000)
+    await crashed.start(SimulatedDB(latency))
+    for murid_id in range(1, N_SUBMITTERS + 1):
+        crashed.add(row(murid_id), {})
+    crashed._task.cancel()
+    crashed._wal.close()
+    crashed._release_slot()  # proses mati → OS melepas lock slot
+    await asyncio.sleep(0)
+
+    wal_rows = len(read_wal(crashed.wal_path))
+    db = SimulatedDB(latency)
+    restarted = SubmitBuffer(wal_dir=wal_dir)
+    replayed = await restarted.start(db)
+    await restarted.stop()
+    assert wal_rows == replayed == len(db.hasil_quiz.rows) == N_SUBMITTERS
+    return replayed
+
+
+async def main(latency_ms: float):
+    latency = latency_ms / 1000
+    print(f"{N_SUBMITTERS} submitter serentak, round trip DB {latency_ms:.0f} ms, {DB_CONNECTIONS} koneksi\n")
+
+    results = {"insert per baris": await per_row(latency)}
+    with tempfile.TemporaryDirectory() as wal_dir:
+        results["SubmitBuffer (WAL + batch)"] = await batched(latency, wal_dir)
+
+    for label, (db, elapsed, latencies) in results.items():
+        assert len(db.hasil_quiz.rows) == N_SUBMITTERS
+        print(f"{label:<28} total {elapsed * 1e3:>7.0f} ms  round trip {db.hasil_quiz.round_trips:>5}  "
+              f"p50 {percentile(latencies, 0.5):>7.2f} ms  p99 {percentile(latencies, 0.99):>7.2f} ms")
+
+    with tempfile.TemporaryDirectory() as wal_dir:
+        replayed = await crash_replay(latency, wal_dir)
+    print(f"\nCrash sebelum flush → replay WAL saat startup: {replayed}/{N_SUBMITTERS} baris tersimpan")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else 5))
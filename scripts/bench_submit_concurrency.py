@@ -0,0 +1,62 @@
+# scripts/bench_submit_concurrency.py — 50 submit paralel untuk murid & quiz yang sama
+# Jalankan terhadap server lokal (uvicorn main:app) dengan akun murid terverifikasi:
+#   python scripts/bench_submit_concurrency.py http://127.0.0.1:8000 murid@example.com rahasia 7
+# Hasil yang diharapkan: tepat satu "Quiz berhasil disubmit", sisanya respons idempoten,
+# dan hanya satu baris hasil_quiz untuk quiz tersebut.
+import asyncio
+import sys
+import time
+import uuid
+import httpx
+
+N_PARALLEL = 50
+
+
+async def main(base_url: str, email: str, password: str, quiz_id: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        login = await client.post("/auth/login", json={"email": email, "password": password})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        body = {"jawaban": {}}
+
+        async def submit(key):
+            h = dict(headers)
+            if key:
+                h["Idempotency-Key"] = key
+            return await client.post(f"/murid/quiz/{quiz_id}/submit", json=body, headers=h)
+
+        # separuh memakai Idempotency-Key yang sama (klik ganda), separuh tanpa key (retry klien)
+        key = str(uuid.uuid4())
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            submit(key if i % 2 == 0 else None) for i in range(N_PARALLEL)
+        ])
+        elapsed = time.perf_counter() - start
+
+        statuses = {}
+        messages = {}
+        for r in responses:
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+            msg = r.json().get("message") if r.status_code == 200 else r.text[:80]
+            messages[msg] = messages.get(msg, 0) + 1
+
+        hasil = await client.get("/hasil-quiz/", params={"quiz_id": quiz_id}, headers=headers)
+        rows = hasil.json().get("data", []) if hasil.status_code == 200 else []
+
+    print(f"{N_PARALLEL} submit paralel dalam {elapsed * 1e3:.0f} ms")
+    print("Status HTTP :", statuses)
+    print("Pesan       :", messages)
+    print("Baris hasil_quiz untuk quiz ini:", len(rows))
+
+    ok = messages.get("Quiz berhasil disubmit", 0) <= 1 and len(rows) == 1 and set(statuses) == {200}
+    print("OK" if ok else "GAGAL")
+    return ok
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5:
+        print(__doc__ or "usage: bench_submit_concurrency.py BASE_URL EMAIL PASSWORD QUIZ_ID")
+        sys.exit(2)
+    url, email, password, quiz_id = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])
+    sys.exit(0 if asyncio.run(main(url, email, password, quiz_id)) else 1)
@@ -0,0 +1,67 @@
+# scripts/bench_token_cache.py — Request/detik route terproteksi: dengan vs tanpa cache token
+# Jalankan dari root repo: python scripts/bench_token_cache.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from core import security
+from core.auth import create_access_token
+from core.permissions import authorize_access
+
+N_REQUESTS = 3000
+
+
+def build_app() -> FastAPI:
+    # pola yang sama dengan router di repo: dependency di router + di parameter handler
+    router = APIRouter(dependencies=[Depends(authorize_access)])
+
+    @router.get("/ping")
+    async def ping(user=Depends(authorize_access)):
+        return {"sub": user["sub"]}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def run(client: TestClient, headers: dict) -> float:
+    start = time.perf_counter()
+    for _ in range(N_REQUESTS):
+        assert client.get("/ping", headers=headers).status_code == 200
+    return N_REQUESTS / (time.perf_counter() - start)
+
+
+def main():
+    token = create_access_token({"sub": "bench@example.com", "role": "Guru"})
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(build_app())
+
+    # hitung decode JWT per request
+    calls = {"n": 0}
+    original = security.verify_access_token
+
+    def counting_verify(t):
+        calls["n"] += 1
+        return original(t)
+
+    security.verify_access_token = counting_verify
+
+    security._token_cache.max_size = 0  # nonaktifkan cache
+    security._token_cache.clear()
+    calls["n"] = 0
+    rps_off = run(client, headers)
+    print(f"tanpa cache : {rps_off:8.1f} req/s | decode JWT per request {calls['n'] / N_REQUESTS:.2f}")
+
+    security._token_cache.max_size = security.TOKEN_CACHE_SIZE
+    calls["n"] = 0
+    rps_on = run(client, headers)
+    print(f"dengan cache: {rps_on:8.1f} req/s | decode JWT total {calls['n']} | {rps_on / rps_off:5.2f}x")
+    print("Statistik cache:", security.token_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# tests/test_recommendation_service.py — get_recommendation dengan client LLM palsu (tanpa Gemini)
+# Jalankan dari root repo: python -m pytest -q tests
+import asyncio
+import threading
+import time
+
+from plugin.recommendation import recommendation_service
+
+
+class StubClient:
+    """Pengganti client Gemini: models.generate_content(model=..., contents=...)."""
+
+    def __init__(self, delay: float = 0.05, error: Exception | None = None):
+        self.models = self
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, model, contents):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return type("Response", (), {"text": "- poin 1\n- poin 2\n- poin 3"})()
+
+
+DATA = {"nilai_akhir": 72.5, "tingkat_kehadiran": 90}
+EXPECTED = ["poin 1", "poin 2", "poin 3"]
+
+
+def setup_function():
+    recommendation_service.clear_cache()
+
+
+def test_single_caller_returns_result():
+    client = StubClient()
+    result = asyncio.run(recommendation_service.get_recommendation("Murid", 1, DATA, llm_client=client))
+    assert result == EXPECTED
+    assert recommendation_service._inflight == {}
+
+
+def test_concurrent_callers_share_inflight_result():
+    client = StubClient()
+
+    async def run():
+        return await asyncio.gather(*[
+            recommendation_service.get_recommendation(name, 1, DATA, llm_client=client, raise_errors=True)
+            for name in ("Murid A", "Murid B")
+        ])
+
+    assert asyncio.run(run()) == [EXPECTED, EXPECTED]
+    assert client.calls == 1
+
+
+def test_failure_reaches_concurrent_callers():
+    client = StubClient(error=RuntimeError("LLM down"))
+
+    async def run():
+        return await asyncio.gather(*[
+            recommendation_service.get_recommendation(name, 1, DATA, llm_client=client, raise_errors=True)
+            for name in ("Murid A", "Murid B")
+        ], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert recommendation_service._cache_get(recommendation_service.recommendation_key(1, DATA)) is None